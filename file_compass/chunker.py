@@ -5,12 +5,19 @@ Supports AST-aware chunking via tree-sitter for multiple languages.
 """
 
 import ast
+import bisect
+import json
 import logging
+import math
+import mmap
 import re
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from .config import get_config
 
 # Tree-sitter imports (optional - falls back to Python AST if unavailable)
@@ -26,15 +33,256 @@ try:
 except ImportError:
     TREE_SITTER_AVAILABLE = False
 
+# Numba (optional - JIT-compiles the sliding-window accounting loop)
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Markdown ATX heading; [^\S\n] keeps the whitespace run on the heading line
+_HEADING_PATTERN = re.compile(r"^(#{1,6})[^\S\n]+(.+)$", re.MULTILINE)
+
+# Insignificant whitespace between JSON tokens
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def compute_windows(line_lens, max_chars: int, overlap_chars: int, starts, ends) -> int:
+    """
+    Compute sliding-window chunk boundaries from line lengths.
+
+    Each window holds as many whole lines as fit in max_chars (counting one
+    newline per line); the next window starts with the trailing lines of the
+    previous one that fit in overlap_chars.
+
+    Args:
+        line_lens: Length of each line, excluding the newline
+        max_chars: Maximum characters per window
+        overlap_chars: Characters of trailing context carried into the next window
+        starts: Output buffer (len >= number of lines) for 0-based start lines
+        ends: Output buffer (len >= number of lines) for exclusive end lines
+
+    Returns:
+        Number of windows written to starts/ends
+    """
+    n = len(line_lens)
+    count = 0
+    start = 0
+    current_chars = 0
+
+    for i in range(n):
+        line_chars = line_lens[i] + 1  # +1 for newline
+
+        if current_chars + line_chars > max_chars and i > start:
+            starts[count] = start
+            ends[count] = i
+            count += 1
+
+            # Walk back over the finished window to find the overlap start
+            overlap_size = 0
+            j = i - 1
+            while j >= start:
+                if overlap_size + line_lens[j] > overlap_chars:
+                    break
+                overlap_size += line_lens[j] + 1
+                j -= 1
+
+            start = j + 1
+            current_chars = overlap_size
+
+        current_chars += line_chars
+
+    if n > start:
+        starts[count] = start
+        ends[count] = n
+        count += 1
+
+    return count
+
+
+if NUMBA_AVAILABLE:
+    _compute_windows_jit = numba.njit(cache=True)(compute_windows)
+
+
+# Nodes that can contain function/class definitions in their child lists
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def iter_definitions(tree: ast.AST):
+    """
+    Yield function and class definitions in the same order as ast.walk.
+
+    Only statement-level nodes are visited; expressions can't contain a
+    def or class, so skipping them avoids touching most of the tree.
+
+    Args:
+        tree: Parsed module
+
+    Yields:
+        FunctionDef, AsyncFunctionDef and ClassDef nodes
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield node
+        for _, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                todo.extend(child for child in value if isinstance(child, _STATEMENT_NODES))
+
+
+# Code points for which str.isspace() is true (the separators str.split() uses)
+_WHITESPACE_CODEPOINTS = [
+    *range(0x09, 0x0E),
+    *range(0x1C, 0x21),
+    0x85,
+    0xA0,
+    0x1680,
+    *range(0x2000, 0x200B),
+    0x2028,
+    0x2029,
+    0x202F,
+    0x205F,
+    0x3000,
+]
+_WHITESPACE_TABLE = np.zeros(max(_WHITESPACE_CODEPOINTS) + 1, dtype=bool)
+_WHITESPACE_TABLE[_WHITESPACE_CODEPOINTS] = True
+
+
+class WordCounter:
+    """
+    Constant-time word counts for substrings of one text.
+
+    count(start, end) equals len(text[start:end].split()); the per-character
+    work is done once, vectorized, instead of once per candidate chunk.
+    """
+
+    def __init__(self, text: str):
+        codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        self._space = np.zeros(len(codes), dtype=bool)
+        in_table = codes < len(_WHITESPACE_TABLE)
+        self._space[in_table] = _WHITESPACE_TABLE[codes[in_table]]
+
+        # A word starts at a non-space character that follows a space (or the start)
+        word_start = ~self._space
+        word_start[1:] &= self._space[:-1]
+        self._starts = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(word_start, out=self._starts[1:])
+
+    def count(self, start: int, end: int) -> int:
+        """Number of whitespace-separated words in text[start:end]."""
+        if start >= end:
+            return 0
+        words = int(self._starts[end] - self._starts[start])
+        # A slice beginning mid-word still counts that word
+        if start > 0 and not self._space[start] and not self._space[start - 1]:
+            words += 1
+        return words
+
+    def estimate_tokens(self, start: int, end: int) -> int:
+        """Token estimate for text[start:end], matching FileChunker._estimate_tokens."""
+        return int(self.count(start, end) * 1.3)
+
+
+def line_offsets(lines: List[str]) -> np.ndarray:
+    """
+    Compute the character offset at which each line starts.
+
+    For lines = content.split("\\n") and a < b, content[offsets[a]:offsets[b] - 1]
+    equals "\\n".join(lines[a:b]), so chunks can be cut from the original
+    string without rejoining lines.
+
+    Args:
+        lines: Lines of the content, split on "\\n"
+
+    Returns:
+        Array of len(lines) + 1 offsets (the last is len(content) + 1)
+    """
+    offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, lines), dtype=np.int64, count=len(lines)) + 1, out=offsets[1:])
+    return offsets
+
+
+def yaml_top_level_key(line: str) -> Optional[str]:
+    """
+    Return the key if line opens a top-level YAML mapping entry, else None.
+
+    Uses plain string checks rather than a YAML parser: the key must start in
+    column 0 and be followed by ':' and whitespace (or end of line).
+
+    Args:
+        line: A single line of YAML
+
+    Returns:
+        The key with surrounding quotes removed, or None
+    """
+    if not line or line[0].isspace() or line.startswith(("#", "-", "...", "%")):
+        return None
+    key, sep, rest = line.partition(":")
+    if not sep or (rest and not rest[0].isspace()):
+        return None
+    return key.strip().strip("\"'") or None
+
+
+def json_top_level_entries(content: str) -> Optional[List[Tuple[int, str]]]:
+    """
+    Locate the entries of a JSON document's top-level object in one pass.
+
+    Each key and value is consumed with JSONDecoder.raw_decode, so entry
+    positions come straight from the original text.
+
+    Args:
+        content: JSON text
+
+    Returns:
+        (offset of the key's opening quote, key) per entry, or None if the
+        root is not an object or the document is malformed
+    """
+
+    def skip(pos: int) -> int:
+        return _JSON_WHITESPACE.match(content, pos).end()
+
+    pos = skip(1 if content.startswith("\ufeff") else 0)
+    if content[pos : pos + 1] != "{":
+        return None
+
+    entries = []
+    pos = skip(pos + 1)
+    if content[pos : pos + 1] == "}":
+        return entries
+
+    try:
+        while True:
+            key_start = pos
+            key, pos = _JSON_DECODER.raw_decode(content, pos)
+            pos = skip(pos)
+            if not isinstance(key, str) or content[pos : pos + 1] != ":":
+                return None
+            _, pos = _JSON_DECODER.raw_decode(content, skip(pos + 1))
+            entries.append((key_start, key))
+
+            pos = skip(pos)
+            delimiter = content[pos : pos + 1]
+            if delimiter == "}":
+                return entries
+            if delimiter != ",":
+                return None
+            pos = skip(pos + 1)
+    except ValueError:
+        return None
+
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
-    """Represents a chunk of file content for embedding."""
+    """Represents a chunk of file content for embedding (slotted: no per-instance __dict__)."""
 
     content: str
-    chunk_type: str  # 'whole_file', 'function', 'class', 'method', 'section', 'window'
+    # 'whole_file', 'function', 'method', 'class', 'module', 'section', 'key', 'window'
+    chunk_type: str
     name: Optional[str]  # Function/class name if applicable
     line_start: int
     line_end: int
@@ -124,6 +372,23 @@ class FileChunker:
         """Estimate token count from text."""
         return int(len(text.split()) * 1.3)
 
+    def _has_min_tokens(self, text: str) -> bool:
+        """
+        Check _estimate_tokens(text) >= min_tokens without splitting the whole text.
+
+        Only the first words needed to reach the threshold are split off; the
+        rest of the text stays in one unscanned remainder.
+        """
+        # Fewest words whose estimate reaches min_tokens
+        needed = max(math.ceil(self.min_tokens / 1.3), 0)
+        while int(needed * 1.3) < self.min_tokens:
+            needed += 1
+        while needed > 0 and int((needed - 1) * 1.3) >= self.min_tokens:
+            needed -= 1
+        if needed == 0:
+            return True
+        return len(text.split(None, needed - 1)) >= needed
+
     def _make_preview(self, content: str, max_len: int = 200) -> str:
         """Create preview string from content."""
         preview = content[:max_len].strip()
@@ -134,6 +399,13 @@ class FileChunker:
     # Maximum file size (10MB) - matches scanner limit
     MAX_FILE_SIZE = 10 * 1024 * 1024
 
+    # Leading bytes checked for NUL before a file is decoded; text in the
+    # encodings chunked here never contains one (same heuristic as git)
+    BINARY_SNIFF_BYTES = 8000
+
+    # Files at least this large are decoded from a memory map instead of read()
+    MMAP_READ_THRESHOLD = 64 * 1024
+
     def chunk_file(self, path: Path, content: Optional[str] = None) -> List[Chunk]:
         """
         Chunk a file based on its type.
@@ -148,16 +420,25 @@ class FileChunker:
         if content is None:
             try:
                 # Security: Check file size before reading
-                if path.exists():
-                    file_size = path.stat().st_size
-                    if file_size > self.MAX_FILE_SIZE:
-                        logger.warning(f"Skipping large file ({file_size} bytes): {path}")
-                        return []
-
-                content = path.read_text(encoding="utf-8", errors="replace")
+                file_size = path.stat().st_size
+                if file_size > self.MAX_FILE_SIZE:
+                    logger.warning(f"Skipping large file ({file_size} bytes): {path}")
+                    return []
+
+                with path.open("rb") as f:
+                    if file_size >= self.MMAP_READ_THRESHOLD:
+                        # Decoded straight from the page cache, with no bytes
+                        # copy of the whole file; a binary file only pages in its head
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                            content = self._decode_text(data)
+                    else:
+                        content = self._decode_text(f.read())
             except Exception as e:
                 logger.error(f"Failed to read {path}: {e}")
                 return []
+            if content is None:
+                logger.debug(f"Skipping binary file: {path}")
+                return []
 
         # Choose chunking strategy based on file type
         suffix = path.suffix.lower()
@@ -184,6 +465,24 @@ class FileChunker:
 
         return self._finalize_chunks(chunks, content)
 
+    def _decode_text(self, data) -> Optional[str]:
+        """
+        Decode file bytes the way read_text() would (UTF-8, replacing errors,
+        universal newlines).
+
+        Args:
+            data: bytes or a memory map of the file
+
+        Returns:
+            The text, or None if the first BINARY_SNIFF_BYTES contain a NUL
+        """
+        if data.find(b"\x00", 0, self.BINARY_SNIFF_BYTES) != -1:
+            return None
+        content = str(data, "utf-8", "replace")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
+
     def _finalize_chunks(self, chunks: List[Chunk], content: str) -> List[Chunk]:
         """
         Finalize chunks by filtering tiny ones and splitting oversized ones.
@@ -196,7 +495,7 @@ class FileChunker:
             Finalized list of chunks
         """
         # Filter out empty/tiny chunks
-        chunks = [c for c in chunks if self._estimate_tokens(c.content) >= self.min_tokens]
+        chunks = [c for c in chunks if self._has_min_tokens(c.content)]
 
         # If no chunks or all filtered, return whole file as single chunk (or sliding window if too large)
         if not chunks:
@@ -255,7 +554,8 @@ class FileChunker:
             return []
 
         chunks = []
-        lines = content.split("\n")
+        offsets = line_offsets(content.split("\n")).tolist()
+        words = WordCounter(content)
 
         # Define node types to extract for each language
         # Maps: lang_name -> (function_types, class_types, method_parent_type)
@@ -297,7 +597,7 @@ class FileChunker:
             """Get text for a node."""
             start_line = node.start_point[0]
             end_line = node.end_point[0]
-            return "\n".join(lines[start_line : end_line + 1])
+            return content[offsets[start_line] : offsets[end_line + 1] - 1]
 
         def get_node_name(node) -> Optional[str]:
             """Extract name from node (language-specific)."""
@@ -331,13 +631,14 @@ class FileChunker:
                 return
             extracted_ranges.add(range_key)
 
-            text = get_node_text(node)
-            name = get_node_name(node)
-
             # Skip tiny nodes
-            if self._estimate_tokens(text) < self.min_tokens:
+            tokens = words.estimate_tokens(offsets[start_line], offsets[end_line + 1] - 1)
+            if tokens < self.min_tokens:
                 return
 
+            text = get_node_text(node)
+            name = get_node_name(node)
+
             chunks.append(
                 Chunk(
                     content=text,
@@ -381,6 +682,7 @@ class FileChunker:
         """
         chunks = []
         lines = content.split("\n")
+        offsets = line_offsets(lines).tolist()
 
         try:
             tree = ast.parse(content)
@@ -388,23 +690,24 @@ class FileChunker:
             # Fall back to sliding window for invalid Python
             return self._chunk_sliding_window(content)
 
-        # Track what lines are covered by functions/classes
-        covered_lines = set()
+        words = WordCounter(content)
 
-        for node in ast.walk(tree):
+        # Track what lines are covered by functions/classes (index = 1-based line number)
+        covered = np.zeros(len(lines) + 1, dtype=bool)
+
+        for node in iter_definitions(tree):
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 start = node.lineno
                 end = node.end_lineno or start
 
                 # Include decorators
                 if node.decorator_list:
-                    start = min(d.lineno for d in node.decorator_list)
-
-                chunk_lines = lines[start - 1 : end]
-                chunk_content = "\n".join(chunk_lines)
+                    start = node.decorator_list[0].lineno
 
                 # Skip if too large (will be handled by sliding window)
-                if self._estimate_tokens(chunk_content) <= self.max_tokens * 2:
+                tokens = words.estimate_tokens(offsets[start - 1], offsets[end] - 1)
+                if tokens <= self.max_tokens * 2:
+                    chunk_content = content[offsets[start - 1] : offsets[end] - 1]
                     chunks.append(
                         Chunk(
                             content=chunk_content,
@@ -415,7 +718,7 @@ class FileChunker:
                             preview=self._make_preview(chunk_content),
                         )
                     )
-                    covered_lines.update(range(start, end + 1))
+                    covered[start : end + 1] = True
 
             elif isinstance(node, ast.ClassDef):
                 start = node.lineno
@@ -423,16 +726,18 @@ class FileChunker:
 
                 # Include decorators
                 if node.decorator_list:
-                    start = min(d.lineno for d in node.decorator_list)
+                    start = node.decorator_list[0].lineno
 
-                chunk_lines = lines[start - 1 : end]
-                chunk_content = "\n".join(chunk_lines)
+                chunk_content = content[offsets[start - 1] : offsets[end] - 1]
 
                 # For large classes, just take the signature and docstring
-                if self._estimate_tokens(chunk_content) > self.max_tokens * 2:
+                if (
+                    words.estimate_tokens(offsets[start - 1], offsets[end] - 1)
+                    > self.max_tokens * 2
+                ):
                     # Get class definition + first method or docstring
                     preview_end = min(start + 30, end)
-                    chunk_content = "\n".join(lines[start - 1 : preview_end])
+                    chunk_content = content[offsets[start - 1] : offsets[preview_end] - 1]
                     chunk_content += "\n    # ... (class continues)"
                     end = preview_end
 
@@ -446,40 +751,31 @@ class FileChunker:
                         preview=self._make_preview(chunk_content),
                     )
                 )
-                covered_lines.update(range(start, end + 1))
+                covered[start : end + 1] = True
 
         # Get module-level code (imports, constants, etc.) if significant
-        module_lines = []
-        for i, line in enumerate(lines, 1):
-            if i not in covered_lines:
-                module_lines.append((i, line))
-
-        if module_lines:
-            # Group consecutive uncovered lines
-            groups = []
-            current_group = []
-
-            for i, line in module_lines:
-                if current_group and i > current_group[-1][0] + 1:
-                    groups.append(current_group)
-                    current_group = []
-                current_group.append((i, line))
+        module_lines = np.flatnonzero(~covered[1:]) + 1
 
-            if current_group:
-                groups.append(current_group)
+        if module_lines.size:
+            # Group consecutive uncovered lines into [first, last] runs
+            breaks = np.flatnonzero(np.diff(module_lines) != 1)
+            firsts = module_lines[np.concatenate(([0], breaks + 1))].tolist()
+            lasts = module_lines[np.concatenate((breaks, [-1]))].tolist()
 
             # Create chunks for significant groups
-            for group in groups:
-                content = "\n".join(line for _, line in group)
-                if self._estimate_tokens(content) >= self.min_tokens:
+            for first, last in zip(firsts, lasts):
+                group_start = offsets[first - 1]
+                group_end = offsets[last] - 1
+                if words.estimate_tokens(group_start, group_end) >= self.min_tokens:
+                    group_content = content[group_start:group_end]
                     chunks.append(
                         Chunk(
-                            content=content,
+                            content=group_content,
                             chunk_type="module",
                             name=None,
-                            line_start=group[0][0],
-                            line_end=group[-1][0],
-                            preview=self._make_preview(content),
+                            line_start=first,
+                            line_end=last,
+                            preview=self._make_preview(group_content),
                         )
                     )
 
@@ -495,17 +791,17 @@ class FileChunker:
         """
         chunks = []
         lines = content.split("\n")
+        offsets = line_offsets(lines).tolist()
 
         # Find heading positions
-        heading_pattern = re.compile(r"^(#{1,6})\s+(.+)$")
         headings = []
+        line_idx = 0
+        pos = 0
 
-        for i, line in enumerate(lines):
-            match = heading_pattern.match(line)
-            if match:
-                level = len(match.group(1))
-                title = match.group(2)
-                headings.append((i, level, title))
+        for match in _HEADING_PATTERN.finditer(content):
+            line_idx += content.count("\n", pos, match.start())
+            pos = match.start()
+            headings.append((line_idx, len(match.group(1)), match.group(2)))
 
         if not headings:
             # No headings, return whole file
@@ -520,8 +816,7 @@ class FileChunker:
                     end_idx = next_line_idx
                     break
 
-            chunk_lines = lines[line_idx:end_idx]
-            chunk_content = "\n".join(chunk_lines).strip()
+            chunk_content = content[offsets[line_idx] : offsets[end_idx] - 1].strip()
 
             if chunk_content:
                 chunks.append(
@@ -542,9 +837,72 @@ class FileChunker:
         Chunk JSON/YAML by top-level keys.
         Falls back to sliding window if too complex.
         """
-        # For now, use sliding window
-        # TODO: Parse and chunk by top-level keys
-        return self._chunk_sliding_window(content)
+        lines = content.split("\n")
+        offsets = line_offsets(lines).tolist()
+
+        if suffix == ".json":
+            entries = json_top_level_entries(content)
+        else:
+            entries = [
+                (offsets[i], key)
+                for i, line in enumerate(lines)
+                if (key := yaml_top_level_key(line))
+            ]
+
+        if not entries:
+            # Top-level list/scalar document, or JSON that doesn't parse
+            return self._chunk_sliding_window(content)
+
+        return self._chunk_entries(content, offsets, entries)
+
+    def _chunk_entries(
+        self, content: str, offsets: List[int], entries: List[Tuple[int, str]]
+    ) -> List[Chunk]:
+        """
+        Chunk content at top-level key entries.
+        Runs of small entries are merged until they reach min_tokens.
+
+        Args:
+            content: File content
+            offsets: line_offsets of the content's lines
+            entries: (character offset, key) where each top-level entry starts
+        """
+        words = WordCounter(content)
+
+        # Entry boundaries; anything before the first key belongs to it
+        bounds = [0] + [start for start, _ in entries[1:]] + [len(content)]
+
+        # Group consecutive entries until each group is big enough to keep
+        groups = []  # [first_entry_idx, end_entry_idx)
+        first = 0
+        for idx in range(len(entries)):
+            tokens = words.estimate_tokens(bounds[first], bounds[idx + 1])
+            if tokens >= self.min_tokens or idx == len(entries) - 1:
+                groups.append([first, idx + 1])
+                first = idx + 1
+
+        # A small trailing group joins the one before it
+        last_start = bounds[groups[-1][0]]
+        if len(groups) > 1 and words.estimate_tokens(last_start, len(content)) < self.min_tokens:
+            last_group = groups.pop()
+            groups[-1][1] = last_group[1]
+
+        chunks = []
+        for first, end in groups:
+            start = bounds[first]
+            chunk_content = content[start : bounds[end]].rstrip()
+            chunks.append(
+                Chunk(
+                    content=chunk_content,
+                    chunk_type="key",
+                    name=entries[first][1],
+                    line_start=bisect.bisect_right(offsets, start),
+                    line_end=bisect.bisect_right(offsets, start + max(len(chunk_content) - 1, 0)),
+                    preview=self._make_preview(chunk_content),
+                )
+            )
+
+        return chunks
 
     def _chunk_sliding_window(self, content: str) -> List[Chunk]:
         """
@@ -563,54 +921,27 @@ class FileChunker:
         max_chars = int(self.max_tokens * chars_per_token)
         overlap_chars = int(self.overlap_tokens * chars_per_token)
 
-        # Build chunks
-        current_chunk = []
-        current_chars = 0
-        chunk_start_line = 1
-
-        for i, line in enumerate(lines, 1):
-            line_chars = len(line) + 1  # +1 for newline
-
-            if current_chars + line_chars > max_chars and current_chunk:
-                # Save current chunk
-                chunk_content = "\n".join(current_chunk)
-                chunks.append(
-                    Chunk(
-                        content=chunk_content,
-                        chunk_type="window",
-                        name=None,
-                        line_start=chunk_start_line,
-                        line_end=i - 1,
-                        preview=self._make_preview(chunk_content),
-                    )
-                )
+        # Compute window boundaries over line lengths, then slice the lines
+        starts = np.empty(len(lines), dtype=np.int64)
+        ends = np.empty(len(lines), dtype=np.int64)
+        offsets = line_offsets(lines)
+        if NUMBA_AVAILABLE:
+            line_lens = np.diff(offsets) - 1
+            count = _compute_windows_jit(line_lens, max_chars, overlap_chars, starts, ends)
+        else:
+            line_lens = [len(line) for line in lines]
+            count = compute_windows(line_lens, max_chars, overlap_chars, starts, ends)
 
-                # Start new chunk with overlap
-                overlap_lines = []
-                overlap_size = 0
-                for prev_line in reversed(current_chunk):
-                    if overlap_size + len(prev_line) > overlap_chars:
-                        break
-                    overlap_lines.insert(0, prev_line)
-                    overlap_size += len(prev_line) + 1
-
-                current_chunk = overlap_lines
-                current_chars = overlap_size
-                chunk_start_line = i - len(overlap_lines)
-
-            current_chunk.append(line)
-            current_chars += line_chars
-
-        # Save final chunk
-        if current_chunk:
-            chunk_content = "\n".join(current_chunk)
+        offsets = offsets.tolist()
+        for start, end in zip(starts[:count].tolist(), ends[:count].tolist()):
+            chunk_content = content[offsets[start] : offsets[end] - 1]
             chunks.append(
                 Chunk(
                     content=chunk_content,
                     chunk_type="window",
                     name=None,
-                    line_start=chunk_start_line,
-                    line_end=len(lines),
+                    line_start=start + 1,
+                    line_end=end,
                     preview=self._make_preview(chunk_content),
                 )
             )
@@ -5,6 +5,7 @@ Command-line tool for indexing and searching files.
 
 import argparse
 import asyncio
+import functools
 import sys
 
 from .indexer import FileIndex, get_index
@@ -23,7 +24,9 @@ def cmd_index(args):
         print("File Compass - Building Index")
         print("=" * 50)
 
-        stats = await index.build_index(directories=directories, show_progress=True)
+        stats = await index.build_index(
+            directories=directories, show_progress=True, force_rebuild=args.force
+        )
 
         await index.close()
         return stats
@@ -113,7 +116,9 @@ def cmd_scan(args):
         print(f"  {t}: {c}")
 
 
-def main():
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once; parse_args() leaves it unchanged."""
     parser = argparse.ArgumentParser(
         description="File Compass - Semantic file search for AI workstations",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -140,7 +145,9 @@ Examples:
     index_parser.add_argument(
         "-d", "--directories", nargs="+", help="Directories to index (default: F:/AI)"
     )
-    index_parser.set_defaults(func=cmd_index)
+    index_parser.add_argument(
+        "--force", action="store_true", help="Rebuild from scratch instead of updating"
+    )
 
     # search command
     search_parser = subparsers.add_parser("search", help="Search the index")
@@ -161,25 +168,34 @@ Examples:
         default=0.3,
         help="Minimum relevance score (0-1, default: 0.3)",
     )
-    search_parser.set_defaults(func=cmd_search)
 
     # status command
-    status_parser = subparsers.add_parser("status", help="Show index status")
-    status_parser.set_defaults(func=cmd_status)
+    subparsers.add_parser("status", help="Show index status")
 
     # scan command
     scan_parser = subparsers.add_parser("scan", help="Scan directories (dry run)")
     scan_parser.add_argument("-d", "--directories", nargs="+", help="Directories to scan")
     scan_parser.add_argument("-v", "--verbose", action="store_true", help="Show individual files")
-    scan_parser.set_defaults(func=cmd_scan)
 
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    args.func(args)
+    # Resolved per call rather than bound into the cached parser
+    commands = {
+        "index": cmd_index,
+        "search": cmd_search,
+        "status": cmd_status,
+        "scan": cmd_scan,
+    }
+    commands[args.command](args)
 
 
 if __name__ == "__main__":
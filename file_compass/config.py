@@ -17,6 +17,10 @@ class FileCompassConfig:
     ollama_url: str = "http://localhost:11434"
     embedding_model: str = "nomic-embed-text"
     embedding_dim: int = 768
+    # Texts per /api/embed request (32 suits CPU; raise to ~128 on CUDA hosts)
+    ollama_embed_batch_size: int = 32
+    # Embed identical chunk content once and reuse the vector for every copy
+    dedupe_chunk_embeddings: bool = True
 
     # HNSW settings (tuned for ~100K chunks)
     hnsw_m: int = 32
@@ -24,6 +28,19 @@ class FileCompassConfig:
     hnsw_ef_search: int = 100
     hnsw_max_elements: int = 500_000
     hnsw_space: str = "cosine"
+    # Rebuilds add only new/changed files to the existing graph; a full rebuild
+    # happens once tombstoned entries exceed this fraction of the graph
+    incremental_hnsw_building: bool = True
+    hnsw_compaction_threshold: float = 0.2
+
+    # In-memory cache: below this many chunks, search does a flat cosine scan
+    # over a numpy matrix instead of querying HNSW
+    use_inmem_cache: bool = True
+    inmem_cache_max_chunks: int = 50_000
+    # Store cached vectors as int8 with a per-vector scale (4x less memory to scan)
+    inmem_cache_int8: bool = True
+    # Scan the in-memory cache on the GPU in float16 (requires CuPy)
+    use_gpu_search: bool = False
 
     # File scanning
     include_extensions: List[str] = field(
@@ -69,15 +86,24 @@ class FileCompassConfig:
             "**/models/**/*.pt",
         ]
     )
+    # Threads listing directories ahead of the scan walk
+    # (0 = four per CPU up to 32, 1 = walk inline)
+    scan_workers: int = 0
 
     # Chunking
     max_chunk_tokens: int = 500
     chunk_overlap_tokens: int = 100
     min_chunk_tokens: int = 50
+    # Processes parsing files (chunking, quick index symbols) during large builds
+    # (0 = one per CPU, 1 = threads only)
+    chunk_workers: int = 0
 
     # Database paths
     db_path: Optional[Path] = None
 
+    # SQLite tuning (bytes of the index database to memory-map; 0 disables)
+    sqlite_mmap_size: int = 30_000_000_000
+
     # Search defaults
     default_top_k: int = 10
     min_relevance: float = 0.3
@@ -97,9 +123,39 @@ class FileCompassConfig:
         if url := os.environ.get("OLLAMA_URL"):
             config.ollama_url = url
 
+        if batch_size := os.environ.get("OLLAMA_EMBED_BATCH_SIZE"):
+            config.ollama_embed_batch_size = int(batch_size)
+
+        if os.environ.get("FILE_COMPASS_DEDUPE_CHUNKS", "").lower() == "false":
+            config.dedupe_chunk_embeddings = False
+
+        if os.environ.get("FILE_COMPASS_INCREMENTAL_HNSW", "").lower() == "false":
+            config.incremental_hnsw_building = False
+
+        if os.environ.get("FILE_COMPASS_INMEM_CACHE", "").lower() == "false":
+            config.use_inmem_cache = False
+
+        if max_chunks := os.environ.get("FILE_COMPASS_INMEM_CACHE_MAX_CHUNKS"):
+            config.inmem_cache_max_chunks = int(max_chunks)
+
+        if os.environ.get("FILE_COMPASS_INMEM_CACHE_INT8", "").lower() == "false":
+            config.inmem_cache_int8 = False
+
+        if os.environ.get("FILE_COMPASS_GPU_SEARCH", "").lower() == "true":
+            config.use_gpu_search = True
+
+        if workers := os.environ.get("FILE_COMPASS_CHUNK_WORKERS"):
+            config.chunk_workers = int(workers)
+
+        if workers := os.environ.get("FILE_COMPASS_SCAN_WORKERS"):
+            config.scan_workers = int(workers)
+
         if db := os.environ.get("FILE_COMPASS_DB_PATH"):
             config.db_path = Path(db)
 
+        if mmap_size := os.environ.get("FILE_COMPASS_SQLITE_MMAP_SIZE"):
+            config.sqlite_mmap_size = int(mmap_size)
+
         if exclude := os.environ.get("FILE_COMPASS_EXCLUDE_PATTERNS"):
             config.exclude_patterns.extend(exclude.split(";"))
 
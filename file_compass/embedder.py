@@ -13,8 +13,24 @@ import numpy as np
 
 from .config import get_config
 
+# HTTP/2 needs the optional h2 package; Ollama over plain http stays on HTTP/1.1
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Pooled connections to Ollama, reused for every request of an Embedder
+CLIENT_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+CONNECT_TIMEOUT = 5.0  # Fail fast when Ollama isn't running
+
+
+class _RetryableEmbedError(RuntimeError):
+    """Transient Ollama failure (5xx) that may succeed with a smaller batch."""
+
 
 class Embedder:
     """
@@ -22,6 +38,10 @@ class Embedder:
     Optimized for file content embedding with batching support.
     """
 
+    # Ollama's actual limit is ~2048 tokens, not 8192
+    # Conservative char limit: ~1500 chars ≈ 400-500 tokens (safe margin)
+    MAX_CHARS = 1500
+
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -32,13 +52,19 @@ class Embedder:
         self.base_url = base_url or config.ollama_url
         self.model = model or config.embedding_model
         self.dim = config.embedding_dim
+        self.batch_size = config.ollama_embed_batch_size
         self.timeout = timeout
         self._client: Optional[httpx.AsyncClient] = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create async HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=CONNECT_TIMEOUT),
+                limits=CLIENT_LIMITS,
+                http2=HTTP2_AVAILABLE and self.base_url.startswith("https://"),
+            )
         return self._client
 
     async def close(self):
@@ -75,15 +101,11 @@ class Embedder:
         Returns:
             numpy array of shape (dim,)
         """
-        # Ollama's actual limit is ~2048 tokens, not 8192
-        # Conservative char limit: ~1500 chars ≈ 400-500 tokens (safe margin)
-        MAX_CHARS = 1500
-
-        if len(text) <= MAX_CHARS:
+        if len(text) <= self.MAX_CHARS:
             return await self._embed_single(text)
 
         # Chunk averaging for long texts (OpenAI Cookbook best practice)
-        chunks = self._split_into_chunks(text, MAX_CHARS, overlap=100)
+        chunks = self._split_into_chunks(text, self.MAX_CHARS, overlap=100)
         embeddings = []
         weights = []
 
@@ -214,39 +236,105 @@ class Embedder:
 
         return embedding
 
+    async def _embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed several short texts with a single /api/embed request.
+
+        Raises:
+            httpx.TimeoutException: On timeout (caller may retry smaller)
+            _RetryableEmbedError: On 5xx responses (caller may retry smaller)
+            RuntimeError: On client errors or malformed responses
+        """
+        client = await self._get_client()
+
+        response = await client.post(
+            "/api/embed",
+            json={"model": self.model, "input": [f"search_document: {t}" for t in texts]},
+        )
+
+        if response.status_code >= 500:
+            raise _RetryableEmbedError(f"Server error {response.status_code}: {response.text}")
+        if response.status_code != 200:
+            raise RuntimeError(f"Embedding failed: {response.text}")
+
+        data = response.json()
+        embeddings = np.array(data["embeddings"], dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(texts):
+            raise RuntimeError(
+                f"Embedding failed: expected {len(texts)} vectors, got {len(data['embeddings'])}"
+            )
+
+        # Normalize rows for cosine similarity
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
     async def embed_batch(
-        self, texts: List[str], batch_size: int = 1, show_progress: bool = False
+        self, texts: List[str], batch_size: Optional[int] = None, show_progress: bool = False
     ) -> np.ndarray:
         """
-        Generate embeddings for multiple texts sequentially.
-        Processes one at a time for reliability with Ollama.
+        Generate embeddings for multiple texts.
+
+        Short texts are sent to /api/embed in batches (one HTTP round-trip per
+        batch). The batch size is halved whenever Ollama times out or returns a
+        5xx, down to single-text requests with the usual retry logic. Texts
+        longer than MAX_CHARS go through embed() for chunk averaging.
 
         Args:
             texts: List of texts to embed
-            batch_size: Ignored (always processes one at a time)
+            batch_size: Texts per request (default: config.ollama_embed_batch_size)
             show_progress: Print progress updates
 
         Returns:
-            numpy array of shape (len(texts), dim)
+            numpy array of shape (len(texts), dim), in input order
         """
-        embeddings = []
         total = len(texts)
+        if total == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        # Rows are written straight into one contiguous float32 block
+        embeddings = np.empty((total, self.dim), dtype=np.float32)
+        short_indices = []
+        done = 0
 
         for i, text in enumerate(texts):
             # Truncate very long texts to avoid timeout
             if len(text) > 8000:
                 text = text[:8000] + "..."
 
-            embedding = await self.embed(text)
-            embeddings.append(embedding)
+            if len(text) <= self.MAX_CHARS:
+                short_indices.append(i)
+                continue
+
+            embeddings[i] = await self.embed(text)
+            done += 1
+
+        size = max(1, batch_size or self.batch_size)
+        pos = 0
+        while pos < len(short_indices):
+            batch = short_indices[pos : pos + size]
+
+            if size == 1:
+                embeddings[batch[0]] = await self._embed_single(texts[batch[0]])
+            else:
+                try:
+                    vectors = await self._embed_many([texts[i] for i in batch])
+                except (httpx.TimeoutException, _RetryableEmbedError) as e:
+                    size = max(1, size // 2)
+                    logger.warning(f"Embedding batch failed ({e}), retrying with batch size {size}")
+                    continue
+                embeddings[batch] = vectors
+
+            pos += len(batch)
+            done += len(batch)
 
-            if show_progress and (i + 1) % 5 == 0:
-                print(f"  Embedded {i + 1}/{total} chunks ({(i + 1) * 100 // total}%)")
+            if show_progress:
+                print(f"  Embedded {done}/{total} chunks ({done * 100 // total}%)")
 
-        if show_progress:
+        if show_progress and not short_indices:
             print(f"  Embedded {total}/{total} chunks (100%)")
 
-        return np.stack(embeddings)
+        return embeddings
 
 
 class SyncEmbedder:
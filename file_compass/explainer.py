@@ -5,13 +5,60 @@ Provides explanations for why search results matched and visual code previews.
 
 import logging
 import re
+from collections import deque
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def read_line_window(path: Path, ranges: List[Tuple[int, int]]) -> Tuple[Dict[int, str], int]:
+    """
+    Stream a file, keeping only the lines inside the given ranges.
+
+    Lines are numbered as in content.split("\\n") of the fully decoded file,
+    so a trailing newline counts as a final empty line.
+
+    Args:
+        path: File to read (decoded as UTF-8 with replacement)
+        ranges: Inclusive 1-indexed (start, end) line ranges to keep
+
+    Returns:
+        (line number -> line text without newline, total line count)
+    """
+    kept: Dict[int, str] = {}
+    line_num = 0
+    line = "\n"  # An empty file is one empty line
+    first = min((start for start, _ in ranges), default=1)
+    last = max((end for _, end in ranges), default=0)
+
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        # Lines before the first range are only counted; a maxlen=1 deque
+        # drains the iterator in C and keeps the last (line_num, line)
+        skipped = deque(enumerate(islice(f, max(first - 1, 0)), start=1), maxlen=1)
+        if skipped:
+            line_num, line = skipped[0]
+
+        for line_num, line in enumerate(islice(f, max(last - line_num, 0)), start=line_num + 1):
+            if any(start <= line_num <= end for start, end in ranges):
+                kept[line_num] = line.rstrip("\n")
+
+        # Lines after the last range are only counted
+        rest = deque(enumerate(f, start=line_num + 1), maxlen=1)
+        if rest:
+            line_num, line = rest[0]
+
+    total_lines = line_num
+    if line.endswith("\n"):
+        total_lines += 1
+        if any(start <= total_lines <= end for start, end in ranges):
+            kept[total_lines] = ""
+
+    return kept, total_lines
+
+
 @dataclass
 class MatchReason:
     """A single reason why a result matched."""
@@ -121,8 +168,8 @@ class ResultExplainer:
             ExplainedResult with reasons and summary
         """
         reasons = []
-        query.lower()
-        query_words = set(self._tokenize(query))
+        # Deduplicated in query order, so reasons with equal confidence keep that order
+        query_words = list(dict.fromkeys(self._tokenize(query)))
 
         # Check for exact matches in preview
         exact_matches = self._find_exact_matches(query_words, result_preview)
@@ -195,19 +242,25 @@ class ResultExplainer:
         tokens = re.findall(r"[a-zA-Z_][a-zA-Z0-9_]*", text.lower())
         return [t for t in tokens if len(t) >= 2]
 
-    def _find_exact_matches(self, query_words: set, text: str) -> List[Tuple[str, int]]:
+    def _find_exact_matches(self, query_words: Iterable[str], text: str) -> List[Tuple[str, int]]:
         """Find query words that appear in text."""
         matches = []
         text_lower = text.lower()
+        # Offsets in text_lower line up with text unless lowercasing changed its length
+        aligned = len(text_lower) == len(text)
 
         for word in query_words:
-            # Count occurrences (case-insensitive)
-            pattern = re.compile(re.escape(word), re.IGNORECASE)
-            count = len(pattern.findall(text_lower))
+            word = word.lower()
+            # Count occurrences (case-insensitive) with a plain substring scan
+            count = text_lower.count(word)
             if count > 0:
                 # Find original case version
-                match = pattern.search(text)
-                original = match.group(0) if match else word
+                if aligned:
+                    start = text_lower.find(word)
+                    original = text[start : start + len(word)]
+                else:
+                    match = re.search(re.escape(word), text, re.IGNORECASE)
+                    original = match.group(0) if match else word
                 matches.append((original, count))
 
         return matches
@@ -303,27 +356,33 @@ class VisualPreviewGenerator:
             if not path.exists():
                 return None
 
-            content = path.read_text(encoding="utf-8", errors="replace")
-            lines = content.split("\n")
-            total_lines = len(lines)
+            # Both candidate windows (context around the match, or centered on
+            # it) are bounded by max_preview_lines; keep only those while streaming
+            context_start = max(1, line_start - self.context_lines)
+            center = (line_start + line_end) // 2
+            centered_start = max(1, center - self.max_preview_lines // 2)
+            kept, total_lines = read_line_window(
+                path,
+                [
+                    (context_start, context_start + self.max_preview_lines - 1),
+                    (centered_start, centered_start + self.max_preview_lines - 1),
+                ],
+            )
 
             # Determine language
             language = self.EXT_TO_LANG.get(path.suffix.lower(), "text")
 
             # Calculate preview range with context
-            preview_start = max(1, line_start - self.context_lines)
+            preview_start = context_start
             preview_end = min(total_lines, line_end + self.context_lines)
 
             # Limit total lines
             if preview_end - preview_start + 1 > self.max_preview_lines:
                 # Center on the match
-                center = (line_start + line_end) // 2
-                half = self.max_preview_lines // 2
-                preview_start = max(1, center - half)
+                preview_start = centered_start
                 preview_end = min(total_lines, preview_start + self.max_preview_lines - 1)
 
-            # Extract lines (convert to 0-indexed)
-            preview_lines = lines[preview_start - 1 : preview_end]
+            preview_lines = [kept[i] for i in range(preview_start, preview_end + 1)]
 
             # Find lines to highlight (the actual match, not context)
             highlight_lines = list(range(line_start, line_end + 1))
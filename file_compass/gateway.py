@@ -12,6 +12,7 @@ Usage:
 
 import argparse
 import asyncio
+import functools
 import logging
 import re
 import subprocess
@@ -30,7 +31,7 @@ except ImportError:
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from file_compass.config import get_config
-from file_compass.explainer import ResultExplainer, VisualPreviewGenerator
+from file_compass.explainer import ResultExplainer, VisualPreviewGenerator, read_line_window
 from file_compass.indexer import FileIndex
 from file_compass.quick_index import get_quick_index
 
@@ -65,12 +66,17 @@ async def get_index_instance() -> FileIndex:
         if _index is not None:
             return _index
 
-        _index = FileIndex()
+        index = FileIndex()
         # Load existing index if available
-        if _index.index_path.exists():
-            _index._get_index()  # Load HNSW
-            _index._get_conn()  # Load SQLite
-
+        if index.index_path.exists():
+            index._get_conn()  # Load SQLite
+            if not index._load_cache():  # Small corpora skip HNSW entirely
+                index._get_index()  # Load HNSW
+            index.ensure_cache_warm()  # Preload search metadata off the query path
+
+        # Publish only once fully loaded, so the lock-free fast path never sees a
+        # half-initialized index (and a failed load is retried on the next call)
+        _index = index
         return _index
 
 
@@ -112,8 +118,8 @@ async def file_search(
         Matching files and chunks with paths, line numbers, previews,
         and explanations of why each result matched
     """
-    # Input validation
-    if not query or not isinstance(query, str):
+    # Input validation, before the index is loaded
+    if not isinstance(query, str) or not query.strip():
         return {"error": "Query must be a non-empty string"}
     if len(query) > 1000:
         return {"error": "Query too long (max 1000 characters)"}
@@ -193,12 +199,25 @@ async def file_search(
     }
 
 
+@functools.lru_cache(maxsize=64)
+def _resolve_allowed_dirs(directories: tuple) -> tuple:
+    """Resolve the allowed directories once per distinct directory list."""
+    resolved = []
+    for directory in directories:
+        try:
+            resolved.append(Path(directory).resolve())
+        except (OSError, ValueError):
+            continue
+    return tuple(resolved)
+
+
 def _is_path_safe(path: Path, config) -> bool:
     """Check if path is within allowed indexed directories."""
     try:
+        # The requested path is resolved on every call so a symlink swapped
+        # after an earlier check can't be let through from a cache
         resolved = path.resolve()
-        for directory in config.directories:
-            dir_resolved = Path(directory).resolve()
+        for dir_resolved in _resolve_allowed_dirs(tuple(config.directories)):
             # Check if path is under an allowed directory
             try:
                 resolved.relative_to(dir_resolved)
@@ -284,36 +303,31 @@ async def file_preview(
                     "truncated": preview.truncated,
                 }
 
-        # Fallback: Read full file (limited)
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-        lines = content.split("\n")
-        total_lines = len(lines)
+        # Fallback: Stream the file, keeping at most 100 lines of the range
+        start_idx = max(0, line_start - 1) if line_start is not None else 0
+        line_offset = start_idx + 1
+        kept, total_lines = read_line_window(file_path, [(line_offset, line_offset + 99)])
 
         # Detect language
         ext_to_lang = _preview_generator.EXT_TO_LANG
         language = ext_to_lang.get(file_path.suffix.lower(), "text")
 
         # Apply line range
-        if line_start is not None:
-            start_idx = max(0, line_start - 1)
-            end_idx = line_end if line_end else total_lines
-            lines = lines[start_idx:end_idx]
-            line_offset = start_idx + 1
-        else:
-            line_offset = 1
+        end_idx = line_end if line_start is not None and line_end else total_lines
+        range_lines = max(0, min(end_idx, total_lines) - start_idx)
 
         # Format with line numbers and markers
         numbered_lines = []
-        max_line_width = len(str(line_offset + min(100, len(lines)) - 1))
+        max_line_width = len(str(line_offset + min(100, range_lines) - 1))
 
-        for i, line in enumerate(lines[:100]):  # Limit to 100 lines
+        for i in range(min(100, range_lines)):  # Limit to 100 lines
             line_num = str(line_offset + i).rjust(max_line_width)
-            numbered_lines.append(f"{line_num} │ {line}")
+            numbered_lines.append(f"{line_num} │ {kept[line_offset + i]}")
 
         preview_content = "\n".join(numbered_lines)
-        truncated = len(lines) > 100
+        truncated = range_lines > 100
         if truncated:
-            preview_content += f"\n... ({len(lines) - 100} more lines)"
+            preview_content += f"\n... ({range_lines - 100} more lines)"
 
         return {
             "path": path,
@@ -400,6 +414,7 @@ async def file_index_scan(
         stats = await index.build_index(
             directories=dir_list,
             show_progress=False,  # Can't show progress over MCP
+            force_rebuild=force_rebuild,
         )
 
         return {
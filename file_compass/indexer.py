@@ -4,28 +4,103 @@ HNSW index management with SQLite metadata storage.
 """
 
 import asyncio
+import contextlib
 import logging
+import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 import hnswlib
 import numpy as np
 
 from . import DEFAULT_DB_PATH, DEFAULT_INDEX_PATH, DEFAULT_SQLITE_PATH
-from .chunker import FileChunker
+from .chunker import Chunk, FileChunker
 from .config import get_config
 from .embedder import Embedder
 from .merkle import MerkleTree, compute_chunk_hash
-from .scanner import FileScanner
+from .scanner import FileScanner, ScannedFile
+
+# Optional GPU scan of the in-memory cache
+try:
+    import cupy as cp
+
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 # Default path for Merkle tree state
 DEFAULT_MERKLE_PATH = DEFAULT_DB_PATH / "merkle_state.json"
 
+# Rows dequantized per matmul when scanning an int8 cache
+CACHE_SCAN_BLOCK = 8192
+
+# Files read and chunked concurrently in worker threads during indexing
+CHUNK_CONCURRENCY = 32
+
+# Chunks embedded per step of a full build; later files keep chunking meanwhile
+EMBED_PIPELINE_CHUNKS = 1024
+
+# Below this many files, process start-up costs more than parallel parsing saves
+PROCESS_POOL_MIN_FILES = 256
+
+# File rows are upserted on their UNIQUE path, so a changed file keeps its row and id
+_UPSERT_FILE_SQL = """
+    INSERT INTO files (path, relative_path, file_type, size_bytes, modified_at,
+                       content_hash, git_repo, is_git_tracked, total_chunks)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(path) DO UPDATE SET
+        relative_path = excluded.relative_path,
+        file_type = excluded.file_type,
+        size_bytes = excluded.size_bytes,
+        modified_at = excluded.modified_at,
+        indexed_at = CURRENT_TIMESTAMP,
+        content_hash = excluded.content_hash,
+        git_repo = excluded.git_repo,
+        is_git_tracked = excluded.is_git_tracked,
+        total_chunks = excluded.total_chunks
+"""
+
+# RETURNING (SQLite 3.35+) hands back the upserted row's id in the same statement
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Per-process chunker for ProcessPoolExecutor workers (set by _init_chunk_worker)
+_worker_chunker: Optional[FileChunker] = None
+
+
+def _init_chunk_worker(chunker_kwargs: Dict[str, Any]):
+    """Create the chunker once per worker process."""
+    global _worker_chunker
+    _worker_chunker = FileChunker(**chunker_kwargs)
+
+
+def _chunk_in_worker(path: Path) -> List[Chunk]:
+    """Chunk a file inside a worker process."""
+    return _worker_chunker.chunk_file(path)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize row vectors to int8 with a per-row scale.
+
+    Args:
+        vectors: (N, dim) float array
+
+    Returns:
+        (int8 array of shape (N, dim), float32 scales of shape (N,))
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.empty(0)
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
 
 @dataclass
 class SearchResult:
@@ -70,6 +145,20 @@ class FileIndex:
         self.ef_search = config.hnsw_ef_search
         self.max_elements = config.hnsw_max_elements
         self.space = config.hnsw_space
+        self.incremental_hnsw_building = config.incremental_hnsw_building
+        self.hnsw_compaction_threshold = config.hnsw_compaction_threshold
+        self.sqlite_mmap_size = config.sqlite_mmap_size
+        self.dedupe_chunk_embeddings = config.dedupe_chunk_embeddings
+        self.chunk_workers = config.chunk_workers or os.cpu_count() or 1
+
+        # In-memory cache config (flat cosine scan for small corpora)
+        self.use_inmem_cache = config.use_inmem_cache
+        self.inmem_cache_max_chunks = config.inmem_cache_max_chunks
+        self.vectors_path = self.index_path.with_suffix(".vectors.npy")
+        self.vector_ids_path = self.index_path.with_suffix(".ids.npy")
+        self.vector_scales_path = self.index_path.with_suffix(".scales.npy")
+        self.inmem_cache_int8 = config.inmem_cache_int8
+        self.use_gpu_search = config.use_gpu_search and CUPY_AVAILABLE
 
         # Components
         self.embedder = Embedder()
@@ -80,16 +169,35 @@ class FileIndex:
         self._index: Optional[hnswlib.Index] = None
         self._conn: Optional[sqlite3.Connection] = None
         self._id_to_chunk: Dict[int, Tuple[int, int]] = {}  # embedding_id -> (file_id, chunk_idx)
+        self._hnsw_deleted = 0  # Entries tombstoned with mark_deleted since the last full build
         self._merkle: Optional[MerkleTree] = None  # For incremental updates
+        self._cache_vectors: Optional[np.ndarray] = None  # (N, dim) float32 or int8 embeddings
+        self._cache_scales: Optional[np.ndarray] = None  # (N,) int8 scales, None for float32
+        self._cache_ids: Optional[np.ndarray] = None  # (N,) embedding ids, parallel to vectors
+        self._chunk_meta: Optional[Dict[int, sqlite3.Row]] = None  # embedding_id -> search row
+        self._gpu_vectors = None  # float16 copy of the cache on the GPU (CuPy array)
+        self._gpu_source: Optional[np.ndarray] = None  # Cache array _gpu_vectors was built from
 
     def _get_conn(self) -> sqlite3.Connection:
         """Get or create SQLite connection."""
         if self._conn is None:
             self._conn = sqlite3.connect(str(self.sqlite_path))
             self._conn.row_factory = sqlite3.Row
+            self._configure_conn()
             self._init_schema()
         return self._conn
 
+    def _configure_conn(self):
+        """Apply performance PRAGMAs (WAL, mmap, larger page cache)."""
+        conn = self._conn
+        # page_size only takes effect on a new database, before WAL is enabled
+        conn.execute("PRAGMA page_size = 8192")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA mmap_size = {int(self.sqlite_mmap_size)}")
+        conn.execute("PRAGMA cache_size = -262144")  # 256 MB
+        conn.execute("PRAGMA temp_store = MEMORY")
+
     def _init_schema(self):
         """Initialize SQLite schema."""
         conn = self._conn
@@ -119,6 +227,7 @@ class FileIndex:
                 content_preview TEXT,
                 token_count INTEGER,
                 embedding_id INTEGER,
+                chunk_hash TEXT,
                 FOREIGN KEY (file_id) REFERENCES files(id) ON DELETE CASCADE
             );
 
@@ -133,6 +242,12 @@ class FileIndex:
             CREATE INDEX IF NOT EXISTS idx_chunks_file ON chunks(file_id);
             CREATE INDEX IF NOT EXISTS idx_chunks_embedding ON chunks(embedding_id);
         """)
+
+        # Databases created before chunk hashes were stored lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(chunks)")}
+        if "chunk_hash" not in columns:
+            conn.execute("ALTER TABLE chunks ADD COLUMN chunk_hash TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_hash ON chunks(chunk_hash)")
         conn.commit()
 
     def _get_index(self) -> hnswlib.Index:
@@ -145,6 +260,12 @@ class FileIndex:
                 self._index.load_index(str(self.index_path), max_elements=self.max_elements)
                 self._index.set_ef(self.ef_search)
                 self._load_id_mapping()
+                row = (
+                    self._get_conn()
+                    .execute("SELECT value FROM index_meta WHERE key = 'hnsw_deleted'")
+                    .fetchone()
+                )
+                self._hnsw_deleted = int(row[0]) if row else 0
             else:
                 logger.info("Creating new HNSW index")
                 self._index.init_index(
@@ -167,21 +288,413 @@ class FileIndex:
         }
         logger.info(f"Loaded {len(self._id_to_chunk)} chunk mappings")
 
+    def _reserve_index(self, index: hnswlib.Index, count: int):
+        """
+        Make room in the HNSW index for count more vectors before a bulk add.
+
+        The index grows at least twofold, so a build adding one batch after
+        another resizes (and copies the graph) only a logarithmic number of times.
+        """
+        needed = index.get_current_count() + count
+        if needed > index.get_max_elements():
+            index.resize_index(max(needed, 2 * index.get_max_elements()))
+
     def _save_index(self):
         """Persist HNSW index to disk."""
         if self._index is not None:
             self._index.save_index(str(self.index_path))
             logger.info(f"Saved index to {self.index_path}")
 
+    def _load_cache(self) -> bool:
+        """
+        Load the in-memory embedding cache if enabled and small enough.
+
+        The vectors are memory-mapped, so cold start costs one mmap rather
+        than an HNSW graph load.
+
+        Returns:
+            True if the cache is loaded and should be used for search
+        """
+        if not self.use_inmem_cache:
+            return False
+        if self._cache_vectors is not None:
+            return True
+        if not (self.vectors_path.exists() and self.vector_ids_path.exists()):
+            return False
+
+        try:
+            vectors = np.load(self.vectors_path, mmap_mode="r")
+            ids = np.load(self.vector_ids_path)
+            scales = None
+            if vectors.dtype == np.int8:
+                scales = np.load(self.vector_scales_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load embedding cache: {e}")
+            return False
+
+        if len(vectors) != len(ids) or len(ids) > self.inmem_cache_max_chunks:
+            return False
+        if scales is not None and len(scales) != len(ids):
+            return False
+
+        self._cache_vectors = vectors
+        self._cache_scales = scales
+        self._cache_ids = ids
+        if not self._id_to_chunk:
+            self._load_id_mapping()
+        logger.info(f"Loaded embedding cache with {len(ids)} vectors")
+        return True
+
+    def _save_cache(self, vectors: np.ndarray, ids: np.ndarray):
+        """Persist the embedding cache and keep it in memory for search."""
+        self._cache_vectors = None
+        self._cache_scales = None
+        self._cache_ids = None
+        if not self.use_inmem_cache:
+            return
+
+        # Drop stale files so a too-large corpus falls back to HNSW
+        self.vector_scales_path.unlink(missing_ok=True)
+        if len(ids) > self.inmem_cache_max_chunks:
+            self.vectors_path.unlink(missing_ok=True)
+            self.vector_ids_path.unlink(missing_ok=True)
+            return
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        scales = None
+        if self.inmem_cache_int8:
+            vectors, scales = quantize_int8(vectors)
+            np.save(self.vector_scales_path, scales)
+        np.save(self.vectors_path, vectors)
+        np.save(self.vector_ids_path, ids)
+        self._cache_vectors = vectors
+        self._cache_scales = scales
+        self._cache_ids = ids
+
+    def ensure_cache_warm(self) -> bool:
+        """
+        Preload the embedding cache and per-chunk search metadata.
+
+        Once warm, search resolves candidates from memory instead of issuing a
+        SQLite join per candidate. Index writes mark the metadata dirty and the
+        next call reloads it. Only applies to corpora within the in-memory
+        cache threshold.
+
+        Returns:
+            True if chunk metadata is loaded
+        """
+        if self._chunk_meta is not None:
+            return True
+        if not self.use_inmem_cache:
+            return False
+
+        self._load_cache()
+        conn = self._get_conn()
+        count = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        if count == 0 or count > self.inmem_cache_max_chunks:
+            return False
+
+        cursor = conn.execute("""
+            SELECT c.embedding_id, f.*, c.chunk_type, c.name as chunk_name,
+                   c.line_start, c.line_end, c.content_preview
+            FROM chunks c
+            JOIN files f ON c.file_id = f.id
+            WHERE c.embedding_id IS NOT NULL
+        """)
+        self._chunk_meta = {row["embedding_id"]: row for row in cursor}
+        logger.info(f"Warmed search metadata for {len(self._chunk_meta)} chunks")
+        return True
+
+    def _cache_float_vectors(self, rows: Any = slice(None)) -> np.ndarray:
+        """Return cached vectors for the given rows as float32, dequantizing if needed."""
+        vectors = np.asarray(self._cache_vectors[rows], dtype=np.float32)
+        if self._cache_scales is not None:
+            vectors *= self._cache_scales[rows][:, None]
+        return vectors
+
+    def _upsert_file(
+        self, conn: sqlite3.Connection, scanned_file: ScannedFile, total_chunks: int
+    ) -> int:
+        """
+        Insert or update a file record in one statement and return its id.
+
+        A file already recorded under the same path keeps its row id; its old
+        chunk rows must be deleted by the caller.
+        """
+        path = str(scanned_file.path)
+        params = (
+            path,
+            scanned_file.relative_path,
+            scanned_file.file_type,
+            scanned_file.size_bytes,
+            scanned_file.modified_at.isoformat(),
+            scanned_file.content_hash,
+            scanned_file.git_repo,
+            1 if scanned_file.is_git_tracked else 0,
+            total_chunks,
+        )
+        if _SQLITE_HAS_RETURNING:
+            return conn.execute(_UPSERT_FILE_SQL + " RETURNING id", params).fetchone()[0]
+        # lastrowid is not updated when the upsert takes the UPDATE branch
+        conn.execute(_UPSERT_FILE_SQL, params)
+        return conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0]
+
+    def _insert_chunk(
+        self,
+        conn: sqlite3.Connection,
+        file_id: int,
+        chunk_idx: int,
+        chunk: Chunk,
+        embedding_id: int,
+        chunk_hash: Optional[str] = None,
+    ):
+        """Insert a chunk record."""
+        conn.execute(
+            """
+            INSERT INTO chunks (file_id, chunk_index, chunk_type, name,
+                               line_start, line_end, content_preview,
+                               token_count, embedding_id, chunk_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                file_id,
+                chunk_idx,
+                chunk.chunk_type,
+                chunk.name,
+                chunk.line_start,
+                chunk.line_end,
+                chunk.preview,
+                chunk.token_estimate,
+                embedding_id,
+                chunk_hash,
+            ),
+        )
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Any):
+        """Write an index_meta entry."""
+        conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _update_cache(self, conn: sqlite3.Connection, embeddings: np.ndarray, new_ids: np.ndarray):
+        """Write through to the embedding cache: drop deleted chunks, append new ones."""
+        if not (self.use_inmem_cache and self._load_cache()):
+            return
+
+        live_ids = np.array(
+            [row[0] for row in conn.execute("SELECT embedding_id FROM chunks")],
+            dtype=np.int64,
+        )
+        keep = np.isin(self._cache_ids, live_ids)
+        vectors = self._cache_float_vectors(keep)
+        ids = self._cache_ids[keep]
+        if len(new_ids):
+            vectors = np.concatenate([vectors, embeddings[: len(new_ids)]])
+            ids = np.concatenate([ids, new_ids])
+        self._save_cache(vectors, ids)
+
+    async def _chunk_files(
+        self, files: List[ScannedFile], show_progress: bool = False
+    ) -> List[List[Chunk]]:
+        """
+        Read and chunk files off the event loop.
+
+        Args:
+            files: Files to chunk
+            show_progress: Print progress updates
+
+        Returns:
+            Chunks for each file, in the same order as files (empty on failure)
+        """
+        return [chunks async for chunks in self._iter_chunks(files, show_progress)]
+
+    async def _iter_chunks(
+        self, files: List[ScannedFile], show_progress: bool = False
+    ) -> AsyncIterator[List[Chunk]]:
+        """
+        Chunk files concurrently, yielding each file's chunks in file order.
+
+        Large batches are parsed in a process pool (chunk_workers processes) so
+        AST parsing isn't serialized by the GIL; small ones use worker threads.
+        Chunking keeps running ahead while the caller awaits other work (such
+        as embedding) between items.
+
+        Args:
+            files: Files to chunk
+            show_progress: Print progress updates
+
+        Yields:
+            Chunks for each file, in the same order as files (empty on failure)
+        """
+        if self.chunk_workers > 1 and len(files) >= PROCESS_POOL_MIN_FILES:
+            chunker_kwargs = {
+                "max_chunk_tokens": self.chunker.max_tokens,
+                "chunk_overlap_tokens": self.chunker.overlap_tokens,
+                "min_chunk_tokens": self.chunker.min_tokens,
+                "use_tree_sitter": self.chunker.use_tree_sitter,
+            }
+            loop = asyncio.get_running_loop()
+            done = 0
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=self.chunk_workers,
+                    initializer=_init_chunk_worker,
+                    initargs=(chunker_kwargs,),
+                ) as pool:
+                    async for chunks in self._ordered_chunks(
+                        files,
+                        lambda path: loop.run_in_executor(pool, _chunk_in_worker, path),
+                        show_progress,
+                    ):
+                        yield chunks
+                        done += 1
+                return
+            except BrokenProcessPool as e:
+                logger.warning(f"Chunking process pool failed, using threads: {e}")
+                files = files[done:]
+
+        async for chunks in self._ordered_chunks(
+            files, lambda path: asyncio.to_thread(self.chunker.chunk_file, path), show_progress
+        ):
+            yield chunks
+
+    async def _ordered_chunks(
+        self, files: List[ScannedFile], run, show_progress: bool
+    ) -> AsyncIterator[List[Chunk]]:
+        """
+        Chunk files concurrently with at most CHUNK_CONCURRENCY in flight.
+
+        Args:
+            files: Files to chunk
+            run: Callable taking a path and returning an awaitable of its chunks
+            show_progress: Print progress updates
+
+        Yields:
+            Chunks for each file, in the same order as files (empty on failure)
+        """
+        semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+        done = 0
+
+        async def chunk_one(scanned_file: ScannedFile) -> List[Chunk]:
+            nonlocal done
+            async with semaphore:
+                try:
+                    chunks = await run(scanned_file.path)
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Failed to chunk {scanned_file.path}: {e}")
+                    chunks = []
+            done += 1
+            if show_progress and done % 100 == 0:
+                print(f"  Scanned {done}/{len(files)} files...")
+            return chunks
+
+        tasks = [asyncio.ensure_future(chunk_one(sf)) for sf in files]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # Early exit or a broken pool: stop the rest and collect their errors
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _embed_chunks(
+        self,
+        conn: sqlite3.Connection,
+        texts: List[str],
+        chunk_hashes: List[str],
+        show_progress: bool = False,
+    ) -> np.ndarray:
+        """
+        Embed chunk texts, embedding each distinct chunk content only once.
+
+        Copies of the same content within the batch share one Ollama call, and content
+        already stored in the chunks table reuses its vector from the HNSW index.
+
+        Args:
+            conn: SQLite connection (chunks of this batch must not be inserted yet)
+            texts: Texts to embed
+            chunk_hashes: compute_chunk_hash of each text's chunk content
+            show_progress: Print progress updates
+
+        Returns:
+            (len(texts), dim) embeddings, one row per text
+        """
+        if not self.dedupe_chunk_embeddings:
+            if show_progress:
+                print(f"Generating embeddings for {len(texts)} chunks...")
+            return await self.embedder.embed_batch(texts, show_progress=show_progress)
+
+        # Map every text onto the first text with the same content
+        slots: Dict[str, int] = {}
+        first_text: List[int] = []
+        inverse = np.empty(len(texts), dtype=np.int64)
+        for i, chunk_hash in enumerate(chunk_hashes):
+            slot = slots.get(chunk_hash)
+            if slot is None:
+                slot = slots[chunk_hash] = len(first_text)
+                first_text.append(i)
+            inverse[i] = slot
+
+        # Content indexed by an earlier build keeps its vector
+        known: Dict[str, int] = {}
+        unique_hashes = list(slots)
+        for start in range(0, len(unique_hashes), 500):
+            batch = unique_hashes[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for row in conn.execute(
+                f"SELECT chunk_hash, embedding_id FROM chunks WHERE chunk_hash IN ({placeholders})",
+                batch,
+            ):
+                known.setdefault(row[0], row[1])
+
+        vectors = np.empty((len(first_text), self.dim), dtype=np.float32)
+        if known:
+            reused = [slots[h] for h in known]
+            try:
+                vectors[reused] = self._get_index().get_items(list(known.values()))
+            except RuntimeError as e:
+                logger.warning(f"Could not reuse stored embeddings, re-embedding: {e}")
+                known = {}
+        missing = [slot for h, slot in slots.items() if h not in known]
+
+        if show_progress:
+            print(
+                f"Generating embeddings for {len(missing)} chunks "
+                f"({len(texts) - len(missing)} duplicates reused)..."
+            )
+
+        if missing:
+            embeddings = await self.embedder.embed_batch(
+                [texts[first_text[slot]] for slot in missing], show_progress=show_progress
+            )
+            vectors[missing] = embeddings[: len(missing)]
+
+        return vectors[inverse]
+
     async def build_index(
-        self, directories: Optional[List[str]] = None, show_progress: bool = True
+        self,
+        directories: Optional[List[str]] = None,
+        show_progress: bool = True,
+        force_rebuild: bool = False,
+        files: Optional[Iterable[ScannedFile]] = None,
     ) -> Dict[str, Any]:
         """
         Build or rebuild the complete index.
 
+        With incremental_hnsw_building enabled and an existing index on disk,
+        only new and changed files are embedded and inserted into the current
+        HNSW graph (see _append_build). A full rebuild happens on the first
+        build, when force_rebuild is set, or when deleted entries pile up.
+
         Args:
             directories: Directories to index (uses config if not specified)
             show_progress: Print progress updates
+            force_rebuild: Rebuild from scratch even if an index exists
+            files: Already scanned files to index instead of running the scanner
 
         Returns:
             Statistics about the indexing process
@@ -191,8 +704,18 @@ class FileIndex:
         if directories:
             self.scanner = FileScanner(directories=directories)
 
+        all_files = list(self.scanner.scan_all() if files is None else files)
+
+        if self.incremental_hnsw_building and not force_rebuild and self.index_path.exists():
+            stats = await self._append_build(all_files, show_progress)
+            if stats is not None:
+                return stats
+            if show_progress:
+                print("Too many deleted entries in the index, rebuilding from scratch...")
+
         # Clear existing data
         conn = self._get_conn()
+        self._chunk_meta = None  # Search metadata is stale from here on
         conn.execute("DELETE FROM chunks")
         conn.execute("DELETE FROM files")
         conn.commit()
@@ -204,124 +727,92 @@ class FileIndex:
         )
         self._index.set_ef(self.ef_search)
         self._id_to_chunk = {}
+        self._hnsw_deleted = 0
 
         # Scan and process files
         files_indexed = 0
         chunks_indexed = 0
         embedding_id = 0
 
-        all_files = list(self.scanner.scan_all())
         total_files = len(all_files)
 
         if show_progress:
             print(f"Found {total_files} files to index")
 
-        # Process in batches for embedding efficiency
-        batch_size = 50
         all_texts = []
+        all_hashes = []
         all_metadata = []  # (file_id, chunk_idx, chunk)
+        embedded = []  # Embedding blocks, in embedding_id order
 
-        # Build Merkle tree for incremental updates
-        merkle = MerkleTree()
-
-        for i, scanned_file in enumerate(all_files):
-            # Insert file record
-            cursor = conn.execute(
-                """
-                INSERT INTO files (path, relative_path, file_type, size_bytes,
-                                   modified_at, content_hash, git_repo, is_git_tracked)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    str(scanned_file.path),
-                    scanned_file.relative_path,
-                    scanned_file.file_type,
-                    scanned_file.size_bytes,
-                    scanned_file.modified_at.isoformat(),
-                    scanned_file.content_hash,
-                    scanned_file.git_repo,
-                    1 if scanned_file.is_git_tracked else 0,
-                ),
-            )
-            file_id = cursor.lastrowid
-
-            # Chunk the file
-            try:
-                chunks = self.chunker.chunk_file(scanned_file.path)
-            except Exception as e:
-                logger.warning(f"Failed to chunk {scanned_file.path}: {e}")
-                chunks = []
-
-            # Update total_chunks
-            conn.execute("UPDATE files SET total_chunks = ? WHERE id = ?", (len(chunks), file_id))
+        async def embed_pending():
+            """Embed the collected chunks and add them to SQLite and HNSW."""
+            nonlocal embedding_id, chunks_indexed, all_texts, all_hashes, all_metadata
+            conn.commit()
+            embeddings = await self._embed_chunks(conn, all_texts, all_hashes, show_progress)
+            embeddings = embeddings[: len(all_texts)]
 
-            # Collect chunks for batch embedding
-            chunk_hashes = []
-            for chunk_idx, chunk in enumerate(chunks):
-                # Create embedding text: filename + chunk content
-                embed_text = f"File: {scanned_file.relative_path}\n{chunk.content}"
-                all_texts.append(embed_text)
-                all_metadata.append((file_id, chunk_idx, chunk))
-                chunk_hashes.append(compute_chunk_hash(chunk.content))
+            # Insert chunk records
+            first_id = embedding_id
+            for idx, (file_id, chunk_idx, chunk) in enumerate(all_metadata):
+                self._insert_chunk(conn, file_id, chunk_idx, chunk, embedding_id, all_hashes[idx])
+                self._id_to_chunk[embedding_id] = (file_id, chunk_idx)
 
-            # Add to Merkle tree
-            merkle.add_file(
-                scanned_file.relative_path,
-                scanned_file.content_hash,
-                chunk_hashes,
-                scanned_file.modified_at.timestamp(),
-            )
+                embedding_id += 1
+                chunks_indexed += 1
 
-            files_indexed += 1
+            # One bulk HNSW insert from the contiguous embedding block (hnswlib
+            # spreads it over its worker threads) rather than one call per row
+            self._reserve_index(self._index, len(embeddings))
+            self._index.add_items(embeddings, np.arange(first_id, embedding_id))
+            conn.commit()
 
-            if show_progress and (i + 1) % 100 == 0:
-                print(f"  Scanned {i + 1}/{total_files} files...")
+            embedded.append(embeddings)
+            all_texts, all_hashes, all_metadata = [], [], []
 
-        conn.commit()
+        # Build Merkle tree for incremental updates
+        merkle = MerkleTree()
 
-        if show_progress:
-            print(f"Generating embeddings for {len(all_texts)} chunks...")
+        # Files are chunked in the background while earlier chunks are embedded
+        async with contextlib.aclosing(self._iter_chunks(all_files, show_progress)) as file_chunks:
+            for scanned_file in all_files:
+                chunks = await anext(file_chunks)
 
-        # Generate embeddings in batches
-        if all_texts:
-            embeddings = await self.embedder.embed_batch(
-                all_texts, batch_size=batch_size, show_progress=show_progress
-            )
+                # Insert file record
+                file_id = self._upsert_file(conn, scanned_file, len(chunks))
 
-            # Add to HNSW and SQLite
-            for idx, (file_id, chunk_idx, chunk) in enumerate(all_metadata):
-                # Insert chunk record
-                conn.execute(
-                    """
-                    INSERT INTO chunks (file_id, chunk_index, chunk_type, name,
-                                       line_start, line_end, content_preview,
-                                       token_count, embedding_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        file_id,
-                        chunk_idx,
-                        chunk.chunk_type,
-                        chunk.name,
-                        chunk.line_start,
-                        chunk.line_end,
-                        chunk.preview,
-                        chunk.token_estimate,
-                        embedding_id,
-                    ),
+                # Collect chunks for batch embedding
+                chunk_hashes = []
+                for chunk_idx, chunk in enumerate(chunks):
+                    # Create embedding text: filename + chunk content
+                    embed_text = f"File: {scanned_file.relative_path}\n{chunk.content}"
+                    all_texts.append(embed_text)
+                    all_metadata.append((file_id, chunk_idx, chunk))
+                    chunk_hashes.append(compute_chunk_hash(chunk.content))
+                all_hashes.extend(chunk_hashes)
+
+                # Add to Merkle tree
+                merkle.add_file(
+                    scanned_file.relative_path,
+                    scanned_file.content_hash,
+                    chunk_hashes,
+                    scanned_file.modified_at.timestamp(),
                 )
 
-                # Add to HNSW
-                self._index.add_items(embeddings[idx : idx + 1], np.array([embedding_id]))
-                self._id_to_chunk[embedding_id] = (file_id, chunk_idx)
+                files_indexed += 1
 
-                embedding_id += 1
-                chunks_indexed += 1
+                if len(all_texts) >= EMBED_PIPELINE_CHUNKS:
+                    await embed_pending()
 
-            conn.commit()
+            if all_texts:
+                await embed_pending()
+        conn.commit()
 
-        # Save index and Merkle tree
+        # Save index, embedding cache and Merkle tree
         self._save_index()
+        if embedded:
+            self._save_cache(np.concatenate(embedded), np.arange(chunks_indexed))
+        else:
+            self._save_cache(np.empty((0, self.dim), dtype=np.float32), np.empty(0))
         merkle.save(self.merkle_path)
 
         # Update metadata
@@ -338,6 +829,7 @@ class FileIndex:
             "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
             ("chunks_count", str(chunks_indexed)),
         )
+        self._set_meta(conn, "hnsw_deleted", 0)
         conn.commit()
 
         stats = {
@@ -355,8 +847,222 @@ class FileIndex:
 
         return stats
 
+    async def _append_build(
+        self, all_files: List[ScannedFile], show_progress: bool
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update the existing index in place, embedding only new or changed files.
+
+        Files are matched to their SQLite rows by path, mtime and size. Unchanged
+        files keep their HNSW nodes; chunks of removed or changed files are
+        tombstoned with mark_deleted and new chunks are inserted into the
+        existing graph.
+
+        Args:
+            all_files: Files found by the scanner
+            show_progress: Print progress updates
+
+        Returns:
+            Statistics about the build, or None if tombstones would exceed
+            hnsw_compaction_threshold and a full rebuild is needed instead
+        """
+        start_time = datetime.now()
+        conn = self._get_conn()
+        index = self._get_index()
+
+        existing = {
+            row["path"]: row
+            for row in conn.execute("SELECT id, path, modified_at, size_bytes FROM files")
+        }
+
+        total_files = len(all_files)
+
+        if show_progress:
+            print(f"Found {total_files} files to index")
+
+        unchanged_files = []
+        changed_files = []
+        stale_file_ids = []
+        seen_paths = set()
+        for scanned_file in all_files:
+            path = str(scanned_file.path)
+            seen_paths.add(path)
+            row = existing.get(path)
+            if (
+                row is not None
+                and row["modified_at"] == scanned_file.modified_at.isoformat()
+                and row["size_bytes"] == scanned_file.size_bytes
+            ):
+                unchanged_files.append(scanned_file)
+            else:
+                changed_files.append(scanned_file)
+                if row is not None:
+                    stale_file_ids.append(row["id"])
+        removed_file_ids = [row["id"] for path, row in existing.items() if path not in seen_paths]
+        stale_file_ids.extend(removed_file_ids)
+
+        # Embedding ids that will become tombstones
+        stale_embedding_ids: Dict[int, List[int]] = {file_id: [] for file_id in stale_file_ids}
+        for row in conn.execute("SELECT file_id, embedding_id FROM chunks"):
+            if row["file_id"] in stale_embedding_ids and row["embedding_id"] is not None:
+                stale_embedding_ids[row["file_id"]].append(row["embedding_id"])
+        stale_count = sum(len(ids) for ids in stale_embedding_ids.values())
+
+        total_nodes = index.get_current_count()
+        if total_nodes and (
+            (self._hnsw_deleted + stale_count) / total_nodes > self.hnsw_compaction_threshold
+        ):
+            return None
+
+        files_added = sum(1 for sf in changed_files if str(sf.path) not in existing)
+        files_modified = len(changed_files) - files_added
+        files_removed = len(removed_file_ids)
+
+        if not changed_files and not removed_file_ids:
+            duration = (datetime.now() - start_time).total_seconds()
+            if show_progress:
+                print(f"No changes detected ({duration:.1f}s)")
+            return {
+                "files_indexed": total_files,
+                "chunks_indexed": conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0],
+                "files_added": 0,
+                "files_removed": 0,
+                "files_modified": 0,
+                "chunks_added": 0,
+                "duration_seconds": duration,
+                "index_path": str(self.index_path),
+            }
+
+        if show_progress:
+            print(
+                f"Updating index: {files_added} added, {files_removed} removed, "
+                f"{files_modified} modified"
+            )
+
+        self._chunk_meta = None  # Search metadata is stale from here on
+
+        # Tombstone chunks of removed and changed files
+        for file_id, embedding_ids in stale_embedding_ids.items():
+            for embedding_id in embedding_ids:
+                try:
+                    index.mark_deleted(embedding_id)
+                except RuntimeError:
+                    continue  # Already deleted or never inserted
+                self._hnsw_deleted += 1
+                self._id_to_chunk.pop(embedding_id, None)
+        conn.executemany(
+            "DELETE FROM chunks WHERE file_id = ?", ((file_id,) for file_id in stale_embedding_ids)
+        )
+        # Changed files keep their rows (upserted below); only removed files lose theirs
+        conn.executemany(
+            "DELETE FROM files WHERE id = ?", ((file_id,) for file_id in removed_file_ids)
+        )
+
+        # Labels of tombstoned nodes stay reserved, so continue after the highest ever used
+        labels = index.get_ids_list()
+        next_embedding_id = max(labels) + 1 if labels else 0
+
+        old_merkle = MerkleTree.load(self.merkle_path)
+        merkle = MerkleTree()
+
+        old_nodes = [
+            old_merkle.get_file(sf.relative_path) if old_merkle else None for sf in unchanged_files
+        ]
+        rechunked = iter(
+            await self._chunk_files(
+                [sf for sf, node in zip(unchanged_files, old_nodes) if node is None]
+            )
+        )
+
+        for scanned_file, old_node in zip(unchanged_files, old_nodes):
+            if old_node is not None:
+                chunk_hashes = old_node.chunk_hashes
+            else:
+                chunk_hashes = [compute_chunk_hash(c.content) for c in next(rechunked)]
+            merkle.add_file(
+                scanned_file.relative_path,
+                scanned_file.content_hash,
+                chunk_hashes,
+                scanned_file.modified_at.timestamp(),
+            )
+
+        all_texts = []
+        all_hashes = []
+        all_metadata = []  # (file_id, chunk_idx, chunk)
+
+        changed_chunks = await self._chunk_files(changed_files, show_progress)
+
+        for scanned_file, chunks in zip(changed_files, changed_chunks):
+            file_id = self._upsert_file(conn, scanned_file, len(chunks))
+
+            chunk_hashes = []
+            for chunk_idx, chunk in enumerate(chunks):
+                all_texts.append(f"File: {scanned_file.relative_path}\n{chunk.content}")
+                all_metadata.append((file_id, chunk_idx, chunk))
+                chunk_hashes.append(compute_chunk_hash(chunk.content))
+            all_hashes.extend(chunk_hashes)
+
+            merkle.add_file(
+                scanned_file.relative_path,
+                scanned_file.content_hash,
+                chunk_hashes,
+                scanned_file.modified_at.timestamp(),
+            )
+
+        conn.commit()
+
+        new_ids = np.arange(next_embedding_id, next_embedding_id + len(all_texts))
+        embeddings = np.empty((0, self.dim), dtype=np.float32)
+        if all_texts:
+            embeddings = await self._embed_chunks(conn, all_texts, all_hashes, show_progress)
+
+            self._reserve_index(index, len(all_texts))
+
+            for idx, (file_id, chunk_idx, chunk) in enumerate(all_metadata):
+                embedding_id = int(new_ids[idx])
+                self._insert_chunk(conn, file_id, chunk_idx, chunk, embedding_id, all_hashes[idx])
+                self._id_to_chunk[embedding_id] = (file_id, chunk_idx)
+
+            index.add_items(embeddings[: len(all_texts)], new_ids)
+            conn.commit()
+
+        # Save index, embedding cache and Merkle tree
+        self._save_index()
+        self._update_cache(conn, embeddings, new_ids)
+        merkle.save(self.merkle_path)
+
+        chunks_indexed = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        duration = (datetime.now() - start_time).total_seconds()
+        self._set_meta(conn, "last_build", datetime.now().isoformat())
+        self._set_meta(conn, "files_count", total_files)
+        self._set_meta(conn, "chunks_count", chunks_indexed)
+        self._set_meta(conn, "hnsw_deleted", self._hnsw_deleted)
+        conn.commit()
+
+        stats = {
+            "files_indexed": total_files,
+            "chunks_indexed": chunks_indexed,
+            "files_added": files_added,
+            "files_removed": files_removed,
+            "files_modified": files_modified,
+            "chunks_added": len(all_texts),
+            "duration_seconds": duration,
+            "index_path": str(self.index_path),
+        }
+
+        if show_progress:
+            print("\nIndex update complete!")
+            print(f"  Files: {total_files} ({files_added} added, {files_removed} removed)")
+            print(f"  New chunks: {len(all_texts)}")
+            print(f"  Duration: {duration:.1f}s")
+
+        return stats
+
     async def incremental_update(
-        self, directories: Optional[List[str]] = None, show_progress: bool = True
+        self,
+        directories: Optional[List[str]] = None,
+        show_progress: bool = True,
+        files: Optional[Iterable[ScannedFile]] = None,
     ) -> Dict[str, Any]:
         """
         Incrementally update the index, only processing changed files.
@@ -365,6 +1071,7 @@ class FileIndex:
         Args:
             directories: Directories to scan (uses config if not specified)
             show_progress: Print progress updates
+            files: Already scanned files to compare instead of running the scanner
 
         Returns:
             Statistics about the update process
@@ -374,34 +1081,59 @@ class FileIndex:
         if directories:
             self.scanner = FileScanner(directories=directories)
 
-        # Load existing Merkle tree state
-        old_merkle = MerkleTree.load(self.merkle_path)
-        if old_merkle is None:
+        # Load existing Merkle tree state; it is updated in place below, so
+        # only the leaves that changed (and their ancestors) are touched
+        merkle = MerkleTree.load(self.merkle_path)
+        if merkle is None:
             if show_progress:
                 print("No existing index state found, doing full rebuild...")
-            return await self.build_index(directories, show_progress)
+            return await self.build_index(
+                directories, show_progress, force_rebuild=True, files=files
+            )
 
-        # Build new Merkle tree from current files
-        new_merkle = MerkleTree()
-        all_files = list(self.scanner.scan_all())
+        all_files = list(self.scanner.scan_all() if files is None else files)
+
+        # Files whose content hash is unchanged keep their chunk hashes without re-parsing
+        old_nodes = [merkle.get_file(sf.relative_path) for sf in all_files]
+        to_chunk = [
+            sf
+            for sf, node in zip(all_files, old_nodes)
+            if not (node and sf.content_hash and node.content_hash == sf.content_hash)
+        ]
+        chunks_map = dict(
+            zip(
+                (sf.relative_path for sf in to_chunk),
+                await self._chunk_files(to_chunk, show_progress),
+            )
+        )
 
-        for scanned_file in all_files:
-            # Chunk to get chunk hashes
-            try:
-                chunks = self.chunker.chunk_file(scanned_file.path)
+        added = set()
+        modified = set()
+        for scanned_file, old_node in zip(all_files, old_nodes):
+            # Chunk hashes drive the Merkle diff
+            chunks = chunks_map.get(scanned_file.relative_path)
+            if chunks is not None:
                 chunk_hashes = [compute_chunk_hash(c.content) for c in chunks]
-            except Exception:
-                chunk_hashes = []
+            else:
+                chunk_hashes = old_node.chunk_hashes
 
-            new_merkle.add_file(
+            changed = merkle.update_leaf(
                 scanned_file.relative_path,
                 scanned_file.content_hash,
                 chunk_hashes,
                 scanned_file.modified_at.timestamp(),
             )
+            if not changed:
+                continue
+            if old_node is None:
+                added.add(scanned_file.relative_path)
+            else:
+                modified.add(scanned_file.relative_path)
 
-        # Quick check - if root hashes match, no changes
-        if not new_merkle.diff_quick(old_merkle):
+        removed = merkle.remove_missing({sf.relative_path for sf in all_files})
+
+        # Quick check - no leaf changed
+        if not (added or removed or modified):
             duration = (datetime.now() - start_time).total_seconds()
             if show_progress:
                 print(f"No changes detected ({duration:.1f}s)")
@@ -413,9 +1145,6 @@ class FileIndex:
                 "duration_seconds": duration,
             }
 
-        # Find what changed
-        added, removed, modified = new_merkle.diff(old_merkle)
-
         if show_progress:
             print(
                 f"Incremental update: {len(added)} added, {len(removed)} removed, {len(modified)} modified"
@@ -424,10 +1153,12 @@ class FileIndex:
         # Load existing index
         conn = self._get_conn()
         index = self._get_index()
+        self._chunk_meta = None  # Search metadata is stale from here on
 
-        # Get next embedding ID
+        # Get next embedding ID (labels of tombstoned HNSW nodes stay reserved)
         result = conn.execute("SELECT MAX(embedding_id) FROM chunks").fetchone()
-        next_embedding_id = (result[0] or 0) + 1
+        labels = index.get_ids_list()
+        next_embedding_id = max((result[0] or 0) + 1, max(labels) + 1 if labels else 0)
 
         files_processed = 0
         chunks_added = 0
@@ -450,6 +1181,7 @@ class FileIndex:
         # Process added and modified files
         files_to_embed = list(added | modified)
         all_texts = []
+        all_hashes = []
         all_metadata = []
 
         # Create mapping from relative path to scanned file
@@ -460,48 +1192,27 @@ class FileIndex:
             if not scanned_file:
                 continue
 
-            # If modified, remove old entry first
+            # If modified, drop its old chunks; a row at the same path is upserted below
             if rel_path in modified:
                 row = conn.execute(
-                    "SELECT id FROM files WHERE relative_path = ?", (rel_path,)
+                    "SELECT id, path FROM files WHERE relative_path = ?", (rel_path,)
                 ).fetchone()
                 if row:
                     conn.execute("DELETE FROM chunks WHERE file_id = ?", (row[0],))
-                    conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
-
-            # Insert new file record
-            cursor = conn.execute(
-                """
-                INSERT INTO files (path, relative_path, file_type, size_bytes,
-                                   modified_at, content_hash, git_repo, is_git_tracked)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    str(scanned_file.path),
-                    scanned_file.relative_path,
-                    scanned_file.file_type,
-                    scanned_file.size_bytes,
-                    scanned_file.modified_at.isoformat(),
-                    scanned_file.content_hash,
-                    scanned_file.git_repo,
-                    1 if scanned_file.is_git_tracked else 0,
-                ),
-            )
-            file_id = cursor.lastrowid
-
-            # Chunk the file
-            try:
-                chunks = self.chunker.chunk_file(scanned_file.path)
-            except Exception as e:
-                logger.warning(f"Failed to chunk {scanned_file.path}: {e}")
-                chunks = []
+                    if row[1] != str(scanned_file.path):
+                        conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
 
-            conn.execute("UPDATE files SET total_chunks = ? WHERE id = ?", (len(chunks), file_id))
+            # Upsert the file record (reusing the chunks from the Merkle pass)
+            chunks = chunks_map.get(rel_path)
+            if chunks is None:
+                chunks = (await self._chunk_files([scanned_file]))[0]
+            file_id = self._upsert_file(conn, scanned_file, len(chunks))
 
             # Collect for batch embedding
             for chunk_idx, chunk in enumerate(chunks):
                 embed_text = f"File: {scanned_file.relative_path}\n{chunk.content}"
                 all_texts.append(embed_text)
+                all_hashes.append(compute_chunk_hash(chunk.content))
                 all_metadata.append((file_id, chunk_idx, chunk))
 
             files_processed += 1
@@ -510,46 +1221,32 @@ class FileIndex:
 
         # Generate embeddings for new/modified chunks
         if all_texts:
-            if show_progress:
-                print(f"Generating embeddings for {len(all_texts)} chunks...")
-
-            embeddings = await self.embedder.embed_batch(all_texts, show_progress=show_progress)
+            embeddings = await self._embed_chunks(conn, all_texts, all_hashes, show_progress)
 
-            # Add to HNSW and SQLite
+            # Add to SQLite, then to HNSW in one bulk call
             for idx, (file_id, chunk_idx, chunk) in enumerate(all_metadata):
                 embedding_id = next_embedding_id + idx
 
-                conn.execute(
-                    """
-                    INSERT INTO chunks (file_id, chunk_index, chunk_type, name,
-                                       line_start, line_end, content_preview,
-                                       token_count, embedding_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        file_id,
-                        chunk_idx,
-                        chunk.chunk_type,
-                        chunk.name,
-                        chunk.line_start,
-                        chunk.line_end,
-                        chunk.preview,
-                        chunk.token_estimate,
-                        embedding_id,
-                    ),
-                )
-
-                # Add to HNSW (incremental)
-                index.add_items(embeddings[idx : idx + 1], np.array([embedding_id]))
+                self._insert_chunk(conn, file_id, chunk_idx, chunk, embedding_id, all_hashes[idx])
                 self._id_to_chunk[embedding_id] = (file_id, chunk_idx)
 
                 chunks_added += 1
 
+            self._reserve_index(index, chunks_added)
+            index.add_items(
+                embeddings[:chunks_added],
+                np.arange(next_embedding_id, next_embedding_id + chunks_added),
+            )
             conn.commit()
 
-        # Save index and Merkle state
+        # Save index, embedding cache and Merkle state
         self._save_index()
-        new_merkle.save(self.merkle_path)
+        if all_texts:
+            new_ids = np.arange(next_embedding_id, next_embedding_id + len(all_texts))
+            self._update_cache(conn, embeddings, new_ids)
+        else:
+            self._update_cache(conn, np.empty((0, self.dim)), np.empty(0, dtype=np.int64))
+        merkle.save(self.merkle_path)
 
         # Update metadata
         duration = (datetime.now() - start_time).total_seconds()
@@ -598,46 +1295,61 @@ class FileIndex:
         Returns:
             List of SearchResult objects
         """
-        index = self._get_index()
         conn = self._get_conn()
+        self.ensure_cache_warm()
+
+        if self._load_cache():
+            if len(self._cache_ids) == 0:
+                logger.warning("Index is empty, no results to return")
+                return []
+
+            query_embedding = await self.embedder.embed_query(query)
+            labels, similarities = self._search_cache(query_embedding, top_k * 5)
+        else:
+            index = self._get_index()
 
-        if index.get_current_count() == 0:
-            logger.warning("Index is empty, no results to return")
-            return []
+            live_count = index.get_current_count() - self._hnsw_deleted
+            if live_count <= 0:
+                logger.warning("Index is empty, no results to return")
+                return []
 
-        # Generate query embedding
-        query_embedding = await self.embedder.embed_query(query)
+            # Generate query embedding
+            query_embedding = await self.embedder.embed_query(query)
 
-        # Search HNSW (get more candidates for filtering)
-        k_search = min(top_k * 5, index.get_current_count())
-        labels, distances = index.knn_query(query_embedding.reshape(1, -1), k=k_search)
+            # Search HNSW (get more candidates for filtering)
+            k_search = min(top_k * 5, live_count)
+            knn_labels, distances = index.knn_query(query_embedding.reshape(1, -1), k=k_search)
+            labels = knn_labels[0]
 
-        # Convert distances to similarities (hnswlib returns 1-cosine for cosine space)
-        similarities = 1 - distances[0]
+            # Convert distances to similarities (hnswlib returns 1-cosine for cosine space)
+            similarities = 1 - distances[0]
 
         # Build results with filtering
         results = []
 
-        for embedding_id, similarity in zip(labels[0], similarities):
+        for embedding_id, similarity in zip(labels, similarities):
             if similarity < min_relevance:
                 continue
 
             if embedding_id not in self._id_to_chunk:
                 continue
 
-            file_id, chunk_idx = self._id_to_chunk[embedding_id]
+            if self._chunk_meta is not None:
+                row = self._chunk_meta.get(embedding_id)
+            else:
+                file_id, chunk_idx = self._id_to_chunk[embedding_id]
 
-            # Fetch file and chunk info
-            row = conn.execute(
-                """
-                SELECT f.*, c.chunk_type, c.name as chunk_name,
-                       c.line_start, c.line_end, c.content_preview
-                FROM files f
-                JOIN chunks c ON c.file_id = f.id
-                WHERE f.id = ? AND c.chunk_index = ?
-            """,
-                (file_id, chunk_idx),
-            ).fetchone()
+                # Fetch file and chunk info
+                row = conn.execute(
+                    """
+                    SELECT f.*, c.chunk_type, c.name as chunk_name,
+                           c.line_start, c.line_end, c.content_preview
+                    FROM files f
+                    JOIN chunks c ON c.file_id = f.id
+                    WHERE f.id = ? AND c.chunk_index = ?
+                """,
+                    (file_id, chunk_idx),
+                ).fetchone()
 
             if not row:
                 continue
@@ -673,6 +1385,85 @@ class FileIndex:
 
         return results
 
+    def _search_cache(self, query_embedding: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact cosine top-k over the in-memory embedding cache.
+
+        Args:
+            query_embedding: Normalized query vector
+            k: Number of candidates to return
+
+        Returns:
+            (embedding_ids, similarities) sorted by descending similarity
+        """
+        if self.use_gpu_search:
+            try:
+                return self._search_cache_gpu(query_embedding, k)
+            except Exception as e:  # No device, out of memory, driver errors
+                logger.warning(f"GPU search failed, falling back to CPU: {e}")
+                self.use_gpu_search = False
+                self._gpu_vectors = self._gpu_source = None
+
+        query = query_embedding.astype(np.float32)
+        if self._cache_scales is None:
+            similarities = self._cache_vectors @ query
+        else:
+            # Dequantize a block at a time so the float32 copy stays cache-sized
+            n = len(self._cache_ids)
+            similarities = np.empty(n, dtype=np.float32)
+            for start in range(0, n, CACHE_SCAN_BLOCK):
+                block = slice(start, start + CACHE_SCAN_BLOCK)
+                similarities[block] = self._cache_vectors[block].astype(np.float32) @ query
+            similarities *= self._cache_scales
+        k = min(k, len(similarities))
+        if k < len(similarities):
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(len(similarities))
+        top = top[np.argsort(-similarities[top])]
+        return self._cache_ids[top], similarities[top]
+
+    def _search_cache_gpu(
+        self, query_embedding: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine top-k over the in-memory cache on the GPU.
+
+        The cache is uploaded once per cache version as dequantized float16;
+        only the query goes up and the top-k comes back per search.
+
+        Args:
+            query_embedding: Normalized query vector
+            k: Number of candidates to return
+
+        Returns:
+            (embedding_ids, similarities) sorted by descending similarity
+        """
+        if self._gpu_source is not self._cache_vectors:
+            vectors = self._cache_vectors
+            host = np.empty(vectors.shape, dtype=np.float16)
+            for start in range(0, len(vectors), CACHE_SCAN_BLOCK):
+                block = slice(start, start + CACHE_SCAN_BLOCK)
+                rows = vectors[block].astype(np.float32)
+                if self._cache_scales is not None:
+                    rows *= self._cache_scales[block, None]
+                host[block] = rows
+            self._gpu_vectors = cp.asarray(host)
+            self._gpu_source = vectors
+            logger.info(f"Uploaded {len(host)} cached vectors to the GPU")
+
+        query = cp.asarray(query_embedding, dtype=cp.float16)
+        similarities = self._gpu_vectors @ query
+        k = min(k, len(similarities))
+        if k < len(similarities):
+            top = cp.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = cp.arange(len(similarities))
+        top_similarities = cp.asnumpy(similarities[top]).astype(np.float32)
+        top = cp.asnumpy(top)
+        order = np.argsort(-top_similarities)
+        return self._cache_ids[top[order]], top_similarities[order]
+
     def get_status(self) -> Dict[str, Any]:
         """Get index status and statistics."""
         conn = self._get_conn()
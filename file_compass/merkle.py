@@ -11,8 +11,19 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+# orjson (optional - faster Merkle state save/load)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Read size for compute_file_hash on Pythons without hashlib.file_digest
+FILE_HASH_BLOCK_SIZE = 1024 * 1024
+
 
 @dataclass
 class FileNode:
@@ -22,14 +33,24 @@ class FileNode:
     content_hash: str
     chunk_hashes: List[str] = field(default_factory=list)
     modified_at: float = 0.0  # Unix timestamp
+    _cached_hash: Optional[str] = field(default=None, repr=False, compare=False)
 
     @property
     def combined_hash(self) -> str:
-        """Get combined hash of file and all its chunks."""
+        """
+        Get combined hash of file and all its chunks.
+
+        Cached, since a directory whose hash was invalidated rehashes all its
+        files while only the replaced FileNode actually changed.
+        """
+        if self._cached_hash is not None:
+            return self._cached_hash
         if not self.chunk_hashes:
-            return self.content_hash
-        combined = self.content_hash + "".join(sorted(self.chunk_hashes))
-        return hashlib.sha256(combined.encode()).hexdigest()[:16]
+            self._cached_hash = self.content_hash
+        else:
+            combined = self.content_hash + "".join(sorted(self.chunk_hashes))
+            self._cached_hash = hashlib.sha256(combined.encode()).hexdigest()[:16]
+        return self._cached_hash
 
 
 @dataclass
@@ -126,6 +147,54 @@ class MerkleTree:
         # Invalidate hashes up to root
         self._invalidate_path(parts[:-1])
 
+    def update_leaf(
+        self, path: str, content_hash: str, chunk_hashes: List[str] = None, modified_at: float = 0.0
+    ) -> bool:
+        """
+        Add or update a file, touching the tree only if its hash changed.
+
+        Only the directories on the path from the leaf to the root are
+        invalidated, so after k changes the next root hash recomputes
+        O(k * depth) directory hashes rather than the whole tree.
+
+        Args:
+            path: Relative file path (forward slashes)
+            content_hash: Hash of file content
+            chunk_hashes: Hashes of individual chunks
+            modified_at: File modification timestamp
+
+        Returns:
+            True if the file is new or its hash changed, False otherwise
+        """
+        chunk_hashes = chunk_hashes or []
+        existing = self.get_file(path)
+        if existing is not None and (
+            existing.content_hash + "".join(sorted(existing.chunk_hashes))
+            == content_hash + "".join(sorted(chunk_hashes))
+        ):
+            # Same inputs to combined_hash; the timestamp is not part of any hash
+            existing.modified_at = modified_at
+            return False
+
+        self.add_file(path, content_hash, chunk_hashes, modified_at)
+        return True
+
+    def remove_missing(self, present: Set[str]) -> Set[str]:
+        """
+        Remove every file whose path is not in present.
+
+        Args:
+            present: Relative paths of the files that still exist
+
+        Returns:
+            Set of removed file paths
+        """
+        present = {p.replace("\\", "/").lstrip("/") for p in present}
+        missing = set(self._file_index) - present
+        for path in missing:
+            self.remove_file(path)
+        return missing
+
     def remove_file(self, path: str) -> bool:
         """
         Remove a file from the tree.
@@ -141,10 +210,12 @@ class MerkleTree:
 
         # Navigate to parent directory
         current = self.root
+        ancestors = [current]
         for part in parts[:-1]:
             if part not in current.subdirs:
                 return False
             current = current.subdirs[part]
+            ancestors.append(current)
 
         # Remove file
         filename = parts[-1]
@@ -153,6 +224,13 @@ class MerkleTree:
             current.invalidate_hash()
             self._file_index.pop(path, None)
             self._invalidate_path(parts[:-1])
+
+            # Drop directories left empty, so the tree matches a fresh build
+            for part, parent in zip(reversed(parts[:-1]), reversed(ancestors[:-1])):
+                child = parent.subdirs[part]
+                if child.files or child.subdirs:
+                    break
+                del parent.subdirs[part]
             return True
 
         return False
@@ -300,16 +378,25 @@ class MerkleTree:
         return tree
 
     def save(self, path: Path):
-        """Save tree to JSON file."""
-        with open(path, "w") as f:
+        """Save tree to JSON file (UTF-8, serialized with orjson when installed)."""
+        if ORJSON_AVAILABLE:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+            return
+        with open(path, "w", encoding="utf-8") as f:
             json.dump(self.to_dict(), f, indent=2)
 
     @classmethod
     def load(cls, path: Path) -> Optional["MerkleTree"]:
         """Load tree from JSON file."""
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
+            if ORJSON_AVAILABLE:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                with open(path, "rb") as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             return cls.from_dict(data)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logger.warning(f"Failed to load Merkle tree from {path}: {e}")
@@ -346,10 +433,16 @@ def compute_chunk_hash(content: str) -> str:
 
 
 def compute_file_hash(path: Path) -> Optional[str]:
-    """Compute hash for a file's content."""
+    """Compute hash for a file's content, streaming it rather than reading it whole."""
     try:
-        content = path.read_bytes()
-        return hashlib.sha256(content).hexdigest()[:16]
+        with open(path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+: read loop runs in C
+                digest = hashlib.file_digest(f, "sha256")
+            else:
+                digest = hashlib.sha256()
+                for block in iter(lambda: f.read(FILE_HASH_BLOCK_SIZE), b""):
+                    digest.update(block)
+        return digest.hexdigest()[:16]
     except Exception as e:
         logger.warning(f"Failed to hash {path}: {e}")
         return None
@@ -8,23 +8,198 @@ Phases:
 3. Full index (slow) - Complete semantic search
 """
 
+import itertools
 import logging
+import os
 import re
 import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from . import DEFAULT_DB_PATH
 from .config import get_config
-from .scanner import FileScanner
+from .scanner import FileScanner, ScannedFile
 
 logger = logging.getLogger(__name__)
 
 # Quick index database path
 QUICK_INDEX_PATH = DEFAULT_DB_PATH / "quick_index.db"
 
+# Rows (files + symbols) buffered before each executemany flush
+QUICK_INSERT_BATCH_SIZE = 5000
+
+_INSERT_FILE_SQL = """
+    INSERT INTO files (id, path, relative_path, file_type, size_bytes, modified_at, indexed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SYMBOL_SQL = """
+    INSERT INTO symbols (file_id, name, symbol_type, line_number)
+    VALUES (?, ?, ?, ?)
+"""
+
+_UPSERT_META_SQL = """
+    INSERT OR REPLACE INTO files_meta (path, mtime_us, size, content_hash)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Incremental builds with at least this many file inserts + deletes switch
+# the FTS triggers off and rebuild files_fts once; smaller ones let the
+# triggers keep it in sync row by row
+FTS_REBUILD_MIN_CHANGES = 2000
+
+# Symbols per multi-row INSERT; 4 params each stays under SQLite's
+# historical 999 bound-parameter limit
+SYMBOL_INSERT_ROWS = 200
+_INSERT_SYMBOLS_MULTI_SQL = (
+    "INSERT INTO symbols (file_id, name, symbol_type, line_number) VALUES "
+    + ",".join(["(?, ?, ?, ?)"] * SYMBOL_INSERT_ROWS)
+)
+
+
+# search() results kept per QuickIndex, least recently used evicted first
+SEARCH_CACHE_SIZE = 128
+
+# Seconds a cached search result is served; bounds how far a recent_days
+# cutoff can drift, since writes already invalidate the cache
+SEARCH_CACHE_TTL_SECONDS = 30.0
+
+# Only the head of each file is scanned for symbols
+SYMBOL_SCAN_LINES = 200
+
+# Builds with at least this many files extract symbols in a process pool
+# (chunk_workers processes); below it, pool startup costs more than it saves
+SYMBOL_POOL_MIN_FILES = 500
+
+# Paths handed to each pool worker per round trip
+SYMBOL_POOL_CHUNKSIZE = 64
+
+# Per-language symbol patterns, matched from the start of a line. [^\S\n] is
+# whitespace that cannot cross into the next line.
+_IDENT = r"([a-zA-Z_][a-zA-Z0-9_]*)"
+_WS = r"[^\S\n]"
+_SYMBOL_PATTERNS: Dict[str, List[tuple]] = {
+    "python": [
+        ("function", rf"{_WS}*(?:async{_WS}+)?def{_WS}+{_IDENT}"),
+        ("class", rf"{_WS}*class{_WS}+{_IDENT}"),
+    ],
+    "javascript": [
+        ("function", rf"{_WS}*(?:export{_WS}+)?(?:async{_WS}+)?function{_WS}+{_IDENT}"),
+        ("class", rf"{_WS}*(?:export{_WS}+)?class{_WS}+{_IDENT}"),
+        (
+            "function",
+            rf"{_WS}*(?:export{_WS}+)?const{_WS}+{_IDENT}{_WS}*={_WS}*(?:async{_WS}+)?\(",
+        ),
+    ],
+    "rust": [
+        ("function", rf"{_WS}*(?:pub{_WS}+)?(?:async{_WS}+)?fn{_WS}+{_IDENT}"),
+        ("struct", rf"{_WS}*(?:pub{_WS}+)?struct{_WS}+{_IDENT}"),
+    ],
+    "go": [
+        ("function", rf"{_WS}*func{_WS}+(?:\([^)\n]+\){_WS}+)?{_IDENT}"),
+        ("struct", rf"{_WS}*type{_WS}+{_IDENT}{_WS}+struct"),
+    ],
+}
+
+# One compiled alternation per language; the patterns of a language are
+# mutually exclusive, so at most one alternative matches a line, and
+# match.lastindex (one capture group per alternative) identifies it.
+# Each alternative is anchored on a literal "\n" rather than a MULTILINE
+# "^": a literal prefix lets the regex engine skip ahead to the next line
+# start instead of trying the alternation at every character.
+_SYMBOL_REGEXES: Dict[str, tuple] = {
+    lang: (
+        re.compile("\n(?:" + "|".join(f"(?:{regex})" for _, regex in patterns) + ")"),
+        [kind for kind, _ in patterns],
+    )
+    for lang, patterns in _SYMBOL_PATTERNS.items()
+}
+
+_SYMBOL_LANG_BY_SUFFIX = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "javascript",
+    ".jsx": "javascript",
+    ".tsx": "javascript",
+    ".rs": "rust",
+    ".go": "go",
+}
+
+
+def _insert_symbols(conn: sqlite3.Connection, rows: List[tuple]):
+    """
+    Insert symbol rows, SYMBOL_INSERT_ROWS per statement.
+
+    Full groups go through one fixed-width multi-row INSERT (about half the
+    cost of a per-row executemany); the remainder uses the single-row form.
+    """
+    full = len(rows) - len(rows) % SYMBOL_INSERT_ROWS
+    if full:
+        flat = list(itertools.chain.from_iterable(rows[:full]))
+        width = SYMBOL_INSERT_ROWS * 4
+        conn.executemany(
+            _INSERT_SYMBOLS_MULTI_SQL,
+            (flat[i : i + width] for i in range(0, len(flat), width)),
+        )
+    conn.executemany(_INSERT_SYMBOL_SQL, rows[full:])
+
+
+def _extract_symbols(path: Path) -> List[tuple]:
+    """
+    Fast symbol extraction - only reads the first SYMBOL_SCAN_LINES lines of a file.
+
+    Module-level so process pool workers can run it.
+
+    Returns list of (name, type, line_number) tuples.
+    """
+    symbols = []
+
+    lang = _SYMBOL_LANG_BY_SUFFIX.get(path.suffix.lower())
+    if lang is None:
+        return symbols
+    regex, kinds = _SYMBOL_REGEXES[lang]
+
+    try:
+        # The leading newline anchors a match on the first line too
+        with path.open("r", encoding="utf-8", errors="replace") as f:
+            head = "\n" + "".join(itertools.islice(f, SYMBOL_SCAN_LINES))
+
+        # Matches come in order, so line numbers are counted incrementally;
+        # a match starts on the newline that ends the previous line
+        line_num = 0
+        pos = 0
+        for match in regex.finditer(head):
+            line_num += head.count("\n", pos, match.start() + 1)
+            pos = match.start() + 1
+            symbols.append((match.group(match.lastindex), kinds[match.lastindex - 1], line_num))
+
+    except Exception as e:
+        logger.debug(f"Symbol extraction failed for {path}: {e}")
+
+    return symbols
+
+
+def _manifest_key(scanned_file: ScannedFile) -> tuple:
+    """(mtime in microseconds, size, content hash) stored in files_meta for a scanned file."""
+    return (
+        round(scanned_file.modified_at.timestamp() * 1_000_000),
+        scanned_file.size_bytes,
+        scanned_file.content_hash,
+    )
+
+
+def _iso_to_epoch(value: Optional[str]) -> Optional[int]:
+    """Convert a stored ISO-8601 timestamp to unix seconds (None if unparseable)."""
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
 
 @dataclass
 class QuickResult:
@@ -54,6 +229,14 @@ class QuickIndex:
         self.db_path = db_path or QUICK_INDEX_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn: Optional[sqlite3.Connection] = None
+        self._fts_enabled = False
+        # search() SQL by (symbols, file type count, date filter, FTS); identical
+        # strings also reuse sqlite3's prepared statements
+        self._search_stmts: Dict[Tuple[bool, int, bool, bool], str] = {}
+        # search() arguments -> (database state, expiry, results); see _cache_stamp
+        self._result_cache: "OrderedDict[tuple, Tuple[tuple, float, List[QuickResult]]]" = (
+            OrderedDict()
+        )
         self.scanner = FileScanner()
 
     def _get_conn(self) -> sqlite3.Connection:
@@ -61,12 +244,25 @@ class QuickIndex:
         if self._conn is None:
             self._conn = sqlite3.connect(str(self.db_path))
             self._conn.row_factory = sqlite3.Row
+            self._configure_conn()
             self._init_schema()
         return self._conn
 
+    def _configure_conn(self):
+        """Apply performance PRAGMAs (WAL, mmap, larger page cache)."""
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+        conn.execute("PRAGMA cache_size = -65536")  # 64 MB
+        conn.execute("PRAGMA temp_store = MEMORY")
+
     def _init_schema(self):
         """Initialize quick index schema."""
         conn = self._conn
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(files)")}
+        if columns.get("modified_at", "INTEGER") != "INTEGER":
+            self._migrate_timestamps()
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS files (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -74,8 +270,8 @@ class QuickIndex:
                 relative_path TEXT NOT NULL,
                 file_type TEXT NOT NULL,
                 size_bytes INTEGER,
-                modified_at TEXT,
-                indexed_at TEXT
+                modified_at INTEGER,
+                indexed_at INTEGER
             );
 
             CREATE TABLE IF NOT EXISTS symbols (
@@ -87,95 +283,282 @@ class QuickIndex:
                 FOREIGN KEY (file_id) REFERENCES files(id) ON DELETE CASCADE
             );
 
+            -- What each file looked like when its symbols were extracted;
+            -- only written by builds that extract symbols
+            CREATE TABLE IF NOT EXISTS files_meta (
+                path TEXT PRIMARY KEY,
+                mtime_us INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+
             CREATE INDEX IF NOT EXISTS idx_files_path ON files(path);
             CREATE INDEX IF NOT EXISTS idx_files_relative ON files(relative_path);
             CREATE INDEX IF NOT EXISTS idx_files_modified ON files(modified_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_files_type_mtime ON files(file_type, modified_at DESC);
             CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
             CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols(file_id);
         """)
         conn.commit()
+        self._fts_enabled = self._init_fts()
+
+    def _migrate_timestamps(self):
+        """
+        Convert an older schema's ISO-8601 timestamp columns to unix seconds.
+
+        SQLite cannot change a column's type in place, so files is copied into
+        a table with INTEGER columns (ids, and so the symbols and FTS rowids,
+        are kept) and renamed over the old one. Dropping the old table also
+        drops its indexes and FTS triggers, which the caller recreates.
+        """
+        conn = self._conn
+        conn.create_function("iso_to_epoch", 1, _iso_to_epoch, deterministic=True)
+        conn.executescript("""
+            BEGIN;
+            CREATE TABLE files_migrated (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT UNIQUE NOT NULL,
+                relative_path TEXT NOT NULL,
+                file_type TEXT NOT NULL,
+                size_bytes INTEGER,
+                modified_at INTEGER,
+                indexed_at INTEGER
+            );
+            INSERT INTO files_migrated
+            SELECT id, path, relative_path, file_type, size_bytes,
+                   iso_to_epoch(modified_at), iso_to_epoch(indexed_at)
+            FROM files;
+            DROP TABLE files;
+            ALTER TABLE files_migrated RENAME TO files;
+            COMMIT;
+        """)
+        logger.info("Migrated quick index timestamps to unix seconds")
+
+    def _init_fts(self) -> bool:
+        """
+        Create the trigram FTS5 index over relative paths.
+
+        files_fts is an external-content table over files, so SQLite answers
+        the path search's LIKE '%word%' from the trigram index instead of
+        scanning every row. Triggers keep it in sync with single-row writes;
+        large builds switch them off via fts_sync and reindex once.
+
+        Returns:
+            False (search falls back to plain LIKE) when this SQLite build
+            lacks FTS5 or the trigram tokenizer
+        """
+        conn = self._conn
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'files_fts'"
+            ).fetchone()
+            if exists:
+                # Fails if this SQLite build cannot load the table's module
+                conn.execute("SELECT rowid FROM files_fts LIMIT 0")
+            else:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE files_fts USING fts5("
+                    "relative_path, content='files', content_rowid='id', tokenize='trigram')"
+                )
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS fts_sync (enabled INTEGER NOT NULL);
+                INSERT INTO fts_sync SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM fts_sync);
+
+                CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files
+                WHEN (SELECT enabled FROM fts_sync) BEGIN
+                    INSERT INTO files_fts(rowid, relative_path)
+                    VALUES (new.id, new.relative_path);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files
+                WHEN (SELECT enabled FROM fts_sync) BEGIN
+                    INSERT INTO files_fts(files_fts, rowid, relative_path)
+                    VALUES ('delete', old.id, old.relative_path);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS files_fts_update AFTER UPDATE ON files
+                WHEN (SELECT enabled FROM fts_sync) BEGIN
+                    INSERT INTO files_fts(files_fts, rowid, relative_path)
+                    VALUES ('delete', old.id, old.relative_path);
+                    INSERT INTO files_fts(rowid, relative_path)
+                    VALUES (new.id, new.relative_path);
+                END;
+            """)
+            if not exists:
+                # Index whatever an older schema already holds
+                conn.execute("INSERT INTO files_fts(files_fts) VALUES('rebuild')")
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            logger.debug(f"FTS5 trigram index unavailable, using LIKE scans: {e}")
+            return False
+        return True
 
     async def build_quick_index(
         self,
         directories: Optional[List[str]] = None,
         extract_symbols: bool = True,
         show_progress: bool = False,
+        force_rebuild: bool = False,
     ) -> Dict[str, Any]:
         """
         Build quick index (filename + symbols).
 
         This is FAST - typically completes in 2-10 seconds for large codebases.
 
+        Rebuilds are incremental: files whose mtime, size and content hash
+        match their files_meta row keep their rows and symbols, so only new
+        and changed files are re-read, and removed files are dropped. Builds
+        without symbol extraction, or with force_rebuild, start from scratch.
+
         Args:
             directories: Directories to scan
             extract_symbols: Whether to extract function/class names
             show_progress: Show progress output
+            force_rebuild: Re-extract every file even if unchanged
 
         Returns:
             Statistics about the indexing
         """
-        get_config()
+        config = get_config()
+        workers = config.chunk_workers or os.cpu_count() or 1
 
         start_time = datetime.now()
+        indexed_at = int(start_time.timestamp())
         conn = self._get_conn()
+        incremental = extract_symbols and not force_rebuild
 
-        # Clear existing data
-        conn.execute("DELETE FROM symbols")
-        conn.execute("DELETE FROM files")
-        conn.commit()
-
-        files_indexed = 0
+        files_written = 0
         symbols_extracted = 0
+        file_rows: List[tuple] = []
+        symbol_rows: List[tuple] = []
+        meta_rows: List[tuple] = []
+
+        def flush():
+            conn.executemany(_INSERT_FILE_SQL, file_rows)
+            _insert_symbols(conn, symbol_rows)
+            conn.executemany(_UPSERT_META_SQL, meta_rows)
+            file_rows.clear()
+            symbol_rows.clear()
+            meta_rows.clear()
 
         if show_progress:
             print("Building quick index (filename + symbols)...")
 
-        for scanned_file in self.scanner.scan_all():
-            # Insert file record
-            cursor = conn.execute(
-                """
-                INSERT INTO files (path, relative_path, file_type, size_bytes, modified_at, indexed_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    str(scanned_file.path),
-                    scanned_file.relative_path,
-                    scanned_file.file_type,
-                    scanned_file.size_bytes,
-                    scanned_file.modified_at.isoformat(),
-                    datetime.now().isoformat(),
-                ),
+        # Update in one transaction; readers keep the old index until commit
+        try:
+            scanned_files = list(self.scanner.scan_all())
+
+            existing_ids: Dict[str, int] = {}
+            manifest: Dict[str, tuple] = {}
+            if incremental:
+                existing_ids = dict(conn.execute("SELECT path, id FROM files"))
+                manifest = {
+                    row[0]: tuple(row[1:])
+                    for row in conn.execute(
+                        "SELECT path, mtime_us, size, content_hash FROM files_meta"
+                    )
+                }
+
+            changed_files = []
+            stale_ids = []
+            seen_paths = set()
+            for scanned_file in scanned_files:
+                path = str(scanned_file.path)
+                seen_paths.add(path)
+                file_id = existing_ids.get(path)
+                if (
+                    file_id is not None
+                    and scanned_file.content_hash
+                    and manifest.get(path) == _manifest_key(scanned_file)
+                ):
+                    continue
+                changed_files.append(scanned_file)
+                if file_id is not None:
+                    stale_ids.append(file_id)
+            removed_paths = [path for path in existing_ids if path not in seen_paths]
+            stale_ids.extend(existing_ids[path] for path in removed_paths)
+
+            rebuild_fts = self._fts_enabled and (
+                not incremental or len(changed_files) + len(stale_ids) >= FTS_REBUILD_MIN_CHANGES
             )
-            file_id = cursor.lastrowid
-            files_indexed += 1
+            if rebuild_fts:
+                # Row-by-row FTS upkeep is far slower than one rebuild at the end
+                conn.execute("UPDATE fts_sync SET enabled = 0")
+
+            if incremental:
+                stale_params = [(file_id,) for file_id in stale_ids]
+                conn.executemany("DELETE FROM symbols WHERE file_id = ?", stale_params)
+                conn.executemany("DELETE FROM files WHERE id = ?", stale_params)
+                conn.executemany(
+                    "DELETE FROM files_meta WHERE path = ?", [(path,) for path in removed_paths]
+                )
+                next_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM files").fetchone()[0]
+            else:
+                conn.execute("DELETE FROM symbols")
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM files_meta")
+                next_id = 0
 
-            # Extract symbols if requested
             if extract_symbols:
-                symbols = self._extract_symbols_fast(scanned_file.path)
-                for sym_name, sym_type, line_num in symbols:
-                    conn.execute(
-                        """
-                        INSERT INTO symbols (file_id, name, symbol_type, line_number)
-                        VALUES (?, ?, ?, ?)
-                    """,
-                        (file_id, sym_name, sym_type, line_num),
+                file_symbols = self._iter_symbols([f.path for f in changed_files], workers)
+            else:
+                file_symbols = itertools.repeat([], len(changed_files))
+
+            # strict=True drains file_symbols, so a process pool shuts down here
+            for scanned_file, symbols in zip(changed_files, file_symbols, strict=True):
+                # Ids continue past the highest one left after the deletes,
+                # rather than being read back from lastrowid one INSERT at a time
+                files_written += 1
+                file_id = next_id + files_written
+                file_rows.append(
+                    (
+                        file_id,
+                        str(scanned_file.path),
+                        scanned_file.relative_path,
+                        scanned_file.file_type,
+                        scanned_file.size_bytes,
+                        int(scanned_file.modified_at.timestamp()),
+                        indexed_at,
                     )
-                    symbols_extracted += 1
+                )
+                if extract_symbols:
+                    meta_rows.append((str(scanned_file.path), *_manifest_key(scanned_file)))
 
-            if show_progress and files_indexed % 500 == 0:
-                print(f"  Indexed {files_indexed} files...")
+                symbol_rows.extend(
+                    (file_id, sym_name, sym_type, line_num)
+                    for sym_name, sym_type, line_num in symbols
+                )
+                symbols_extracted += len(symbols)
 
-        conn.commit()
+                if len(file_rows) + len(symbol_rows) >= QUICK_INSERT_BATCH_SIZE:
+                    flush()
+
+                if show_progress and files_written % 500 == 0:
+                    print(f"  Indexed {files_written} files...")
+
+            flush()
+            if rebuild_fts:
+                conn.execute("INSERT INTO files_fts(files_fts) VALUES('rebuild')")
+                conn.execute("UPDATE fts_sync SET enabled = 1")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
 
         duration = (datetime.now() - start_time).total_seconds()
+        files_indexed = len(scanned_files)
+        files_unchanged = files_indexed - files_written
 
         if show_progress:
             print(
-                f"Quick index complete: {files_indexed} files, {symbols_extracted} symbols in {duration:.1f}s"
+                f"Quick index complete: {files_indexed} files ({files_unchanged} unchanged), "
+                f"{symbols_extracted} symbols in {duration:.1f}s"
             )
 
         return {
             "files_indexed": files_indexed,
+            "files_unchanged": files_unchanged,
             "symbols_extracted": symbols_extracted,
             "duration_seconds": duration,
         }
@@ -186,69 +569,88 @@ class QuickIndex:
 
         Returns list of (name, type, line_number) tuples.
         """
-        symbols = []
+        return _extract_symbols(path)
 
-        try:
-            content = path.read_text(encoding="utf-8", errors="replace")
-            lines = content.split("\n")[:200]  # Only first 200 lines
-
-            suffix = path.suffix.lower()
-
-            if suffix == ".py":
-                for i, line in enumerate(lines, 1):
-                    # Function
-                    match = re.match(r"^\s*(?:async\s+)?def\s+([a-zA-Z_][a-zA-Z0-9_]*)", line)
-                    if match:
-                        symbols.append((match.group(1), "function", i))
-                    # Class
-                    match = re.match(r"^\s*class\s+([a-zA-Z_][a-zA-Z0-9_]*)", line)
-                    if match:
-                        symbols.append((match.group(1), "class", i))
-
-            elif suffix in (".js", ".ts", ".jsx", ".tsx"):
-                for i, line in enumerate(lines, 1):
-                    # Function
-                    match = re.match(
-                        r"^\s*(?:export\s+)?(?:async\s+)?function\s+([a-zA-Z_][a-zA-Z0-9_]*)", line
-                    )
-                    if match:
-                        symbols.append((match.group(1), "function", i))
-                    # Class
-                    match = re.match(r"^\s*(?:export\s+)?class\s+([a-zA-Z_][a-zA-Z0-9_]*)", line)
-                    if match:
-                        symbols.append((match.group(1), "class", i))
-                    # Const arrow function
-                    match = re.match(
-                        r"^\s*(?:export\s+)?const\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(?:async\s+)?\(",
-                        line,
-                    )
-                    if match:
-                        symbols.append((match.group(1), "function", i))
+    def _iter_symbols(self, paths: List[Path], workers: int) -> Iterator[List[tuple]]:
+        """
+        Extract symbols from each path, in order.
 
-            elif suffix in (".rs",):
-                for i, line in enumerate(lines, 1):
-                    match = re.match(
-                        r"^\s*(?:pub\s+)?(?:async\s+)?fn\s+([a-zA-Z_][a-zA-Z0-9_]*)", line
-                    )
-                    if match:
-                        symbols.append((match.group(1), "function", i))
-                    match = re.match(r"^\s*(?:pub\s+)?struct\s+([a-zA-Z_][a-zA-Z0-9_]*)", line)
-                    if match:
-                        symbols.append((match.group(1), "struct", i))
-
-            elif suffix == ".go":
-                for i, line in enumerate(lines, 1):
-                    match = re.match(r"^\s*func\s+(?:\([^)]+\)\s+)?([a-zA-Z_][a-zA-Z0-9_]*)", line)
-                    if match:
-                        symbols.append((match.group(1), "function", i))
-                    match = re.match(r"^\s*type\s+([a-zA-Z_][a-zA-Z0-9_]*)\s+struct", line)
-                    if match:
-                        symbols.append((match.group(1), "struct", i))
-
-        except Exception as e:
-            logger.debug(f"Symbol extraction failed for {path}: {e}")
+        Large builds fan out over a process pool, since the regex scan holds
+        the GIL; small ones run in-process.
 
-        return symbols
+        Args:
+            paths: Files to extract symbols from
+            workers: Pool processes (1 = always in-process)
+
+        Yields:
+            (name, type, line_number) tuples for each path
+        """
+        done = 0
+        if workers > 1 and len(paths) >= SYMBOL_POOL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for symbols in pool.map(
+                        _extract_symbols, paths, chunksize=SYMBOL_POOL_CHUNKSIZE
+                    ):
+                        done += 1
+                        yield symbols
+                return
+            except BrokenProcessPool as e:
+                logger.warning(f"Symbol extraction process pool failed, continuing in-process: {e}")
+
+        for path in paths[done:]:
+            yield _extract_symbols(path)
+
+    def _search_sql(self, symbols: bool, type_count: int, date_filter: bool) -> str:
+        """
+        Get the SQL for one search() query shape, building it on first use.
+
+        Args:
+            symbols: Query symbol names instead of file paths
+            type_count: Number of file type placeholders (0 for no type filter)
+            date_filter: Add a modified_at cutoff placeholder
+
+        Returns:
+            SQL taking (pattern, *file_types, [cutoff], limit) parameters
+        """
+        key = (symbols, type_count, date_filter, self._fts_enabled)
+        sql = self._search_stmts.get(key)
+        if sql is not None:
+            return sql
+
+        if symbols:
+            select_sql = """
+                SELECT f.path, f.relative_path, f.file_type, f.modified_at,
+                       s.name, s.symbol_type, s.line_number
+                FROM symbols s
+                JOIN files f ON s.file_id = f.id
+                WHERE s.name LIKE ?
+            """
+        elif self._fts_enabled:
+            # Same LIKE semantics either way; the trigram index just avoids the scan
+            select_sql = """
+                SELECT files.path, files.relative_path, files.file_type, files.modified_at
+                FROM files_fts JOIN files ON files.id = files_fts.rowid
+                WHERE files_fts.relative_path LIKE ?
+            """
+        else:
+            select_sql = """
+                SELECT files.path, files.relative_path, files.file_type, files.modified_at
+                FROM files
+                WHERE files.relative_path LIKE ?
+            """
+
+        table = "f" if symbols else "files"
+        filters = []
+        if type_count:
+            placeholders = ",".join("?" * type_count)
+            filters.append(f"AND {table}.file_type IN ({placeholders})")
+        if date_filter:
+            filters.append(f"AND {table}.modified_at >= ?")
+        sql = select_sql + "\n".join(filters) + "\nLIMIT ?"
+
+        self._search_stmts[key] = sql
+        return sql
 
     def search(
         self,
@@ -278,46 +680,38 @@ class QuickIndex:
             List of QuickResult objects
         """
         conn = self._get_conn()
+        cache_key = (
+            query,
+            top_k,
+            tuple(file_types) if file_types else None,
+            include_symbols,
+            recent_days,
+            self._fts_enabled,
+        )
+        stamp = self._cache_stamp()
+        now = time.monotonic()
+        cached = self._result_cache.get(cache_key)
+        if cached is not None and cached[0] == stamp and cached[1] > now:
+            self._result_cache.move_to_end(cache_key)
+            return list(cached[2])
+
         results = []
         query_lower = query.lower()
         query_words = query_lower.split()
 
-        # Build date filter with parameterized query (security fix)
-        date_filter_sql = ""
+        # Build date filter with parameterized query (security fix); recent_days
+        # must be a positive integer, anything else is ignored
         date_filter_params = []
-        if recent_days:
-            # Validate recent_days is a positive integer
-            if not isinstance(recent_days, int) or recent_days <= 0:
-                recent_days = None
-            else:
-                cutoff = (datetime.now() - timedelta(days=recent_days)).isoformat()
-                date_filter_sql = " AND modified_at >= ?"
-                date_filter_params = [cutoff]
+        if isinstance(recent_days, int) and recent_days > 0:
+            cutoff = int((datetime.now() - timedelta(days=recent_days)).timestamp())
+            date_filter_params = [cutoff]
+        type_params = list(file_types) if file_types else []
+        filter_params = type_params + date_filter_params + [top_k]
 
         # 1. Search filenames (exact match gets highest score)
+        query_sql = self._search_sql(False, len(type_params), bool(date_filter_params))
         for word in query_words:
-            # Build query with optional type filter
-            if file_types:
-                placeholders = ",".join("?" * len(file_types))
-                query_sql = f"""
-                    SELECT path, relative_path, file_type, modified_at
-                    FROM files
-                    WHERE relative_path LIKE ?
-                    AND file_type IN ({placeholders})
-                    {date_filter_sql}
-                    LIMIT ?
-                """
-                params = [f"%{word}%"] + list(file_types) + date_filter_params + [top_k]
-            else:
-                query_sql = f"""
-                    SELECT path, relative_path, file_type, modified_at
-                    FROM files
-                    WHERE relative_path LIKE ?
-                    {date_filter_sql}
-                    LIMIT ?
-                """
-                params = [f"%{word}%"] + date_filter_params + [top_k]
-
+            params = [f"%{word}%"] + filter_params
             rows = conn.execute(query_sql, params).fetchall()
 
             for row in rows:
@@ -338,45 +732,16 @@ class QuickIndex:
                         match_type="filename",
                         match_text=row["relative_path"],
                         line_number=None,
-                        modified_at=datetime.fromisoformat(row["modified_at"]),
+                        modified_at=datetime.fromtimestamp(row["modified_at"]),
                         score=score,
                     )
                 )
 
         # 2. Search symbols
         if include_symbols:
-            # Build symbol date filter (uses f.modified_at alias)
-            sym_date_filter_sql = (
-                date_filter_sql.replace("modified_at", "f.modified_at") if date_filter_sql else ""
-            )
-
+            sym_query = self._search_sql(True, len(type_params), bool(date_filter_params))
             for word in query_words:
-                # Build query with optional type filter
-                if file_types:
-                    placeholders = ",".join("?" * len(file_types))
-                    sym_query = f"""
-                        SELECT f.path, f.relative_path, f.file_type, f.modified_at,
-                               s.name, s.symbol_type, s.line_number
-                        FROM symbols s
-                        JOIN files f ON s.file_id = f.id
-                        WHERE s.name LIKE ?
-                        AND f.file_type IN ({placeholders})
-                        {sym_date_filter_sql}
-                        LIMIT ?
-                    """
-                    sym_params = [f"%{word}%"] + list(file_types) + date_filter_params + [top_k]
-                else:
-                    sym_query = f"""
-                        SELECT f.path, f.relative_path, f.file_type, f.modified_at,
-                               s.name, s.symbol_type, s.line_number
-                        FROM symbols s
-                        JOIN files f ON s.file_id = f.id
-                        WHERE s.name LIKE ?
-                        {sym_date_filter_sql}
-                        LIMIT ?
-                    """
-                    sym_params = [f"%{word}%"] + date_filter_params + [top_k]
-
+                sym_params = [f"%{word}%"] + filter_params
                 rows = conn.execute(sym_query, sym_params).fetchall()
 
                 for row in rows:
@@ -397,7 +762,7 @@ class QuickIndex:
                             match_type="symbol",
                             match_text=f"{row['symbol_type']} {row['name']}",
                             line_number=row["line_number"],
-                            modified_at=datetime.fromisoformat(row["modified_at"]),
+                            modified_at=datetime.fromtimestamp(row["modified_at"]),
                             score=score,
                         )
                     )
@@ -413,8 +778,28 @@ class QuickIndex:
                 if len(unique_results) >= top_k:
                     break
 
+        self._result_cache[cache_key] = (
+            stamp,
+            now + SEARCH_CACHE_TTL_SECONDS,
+            list(unique_results),
+        )
+        self._result_cache.move_to_end(cache_key)
+        if len(self._result_cache) > SEARCH_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
         return unique_results
 
+    def _cache_stamp(self) -> tuple:
+        """
+        Identify the database state search results were computed against.
+
+        total_changes counts rows written through this connection and
+        data_version moves whenever another connection commits, so any write
+        (a build, or direct SQL) makes older cache entries miss.
+        """
+        conn = self._conn
+        return (conn.total_changes, conn.execute("PRAGMA data_version").fetchone()[0])
+
     def get_status(self) -> Dict[str, Any]:
         """Get quick index status."""
         conn = self._get_conn()
@@ -438,6 +823,8 @@ class QuickIndex:
         if self._conn:
             self._conn.close()
             self._conn = None
+        # A new connection restarts the counters in _cache_stamp
+        self._result_cache.clear()
 
 
 # Singleton instance
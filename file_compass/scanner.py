@@ -7,16 +7,80 @@ import fnmatch
 import hashlib
 import logging
 import os
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Set
+from typing import Iterator, List, Optional, Set, Tuple
 
 from .config import get_config
 
+# BLAKE3 (optional - SIMD hashing for content hashes)
+try:
+    import blake3
+
+    BLAKE3_AVAILABLE = True
+    EMPTY_BLAKE3 = blake3.blake3(b"").hexdigest()[:16]
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Content hash of an empty file, returned without opening it
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()[:16]
+
 logger = logging.getLogger(__name__)
 
+# Files at least this large are hashed from a memory map instead of read()
+MMAP_HASH_THRESHOLD = 1024 * 1024
+
+# Files are hashed on a thread pool in batches of this many; read() and the
+# hashers release the GIL, so reads and hashing overlap across cores
+HASH_BATCH_SIZE = 256
+HASH_WORKERS = os.cpu_count() or 1
+
+# Default threads listing directories ahead of the walk; readdir and stat
+# block on I/O latency (network filesystems especially), not on the CPU
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Upcoming directories listed ahead of the walk, per scan worker
+SCAN_READ_AHEAD_PER_WORKER = 2
+
+
+def _compile_exclude_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+    """
+    Compile exclude globs into one regex matched against relative paths.
+
+    Plain patterns use fnmatch semantics. A pattern with a single ``**`` is
+    split into a prefix the path must start with and a suffix glob the path
+    must end with; patterns with several ``**`` never match.
+
+    Returns:
+        Compiled alternation, or None if no pattern can match
+    """
+    alternatives = []
+    for pattern in patterns:
+        if "**" in pattern:
+            pattern_parts = pattern.replace("\\", "/").split("**")
+            if len(pattern_parts) != 2:
+                continue
+            prefix, suffix = pattern_parts
+            prefix = prefix.rstrip("/")
+            suffix = suffix.lstrip("/")
+
+            regex = f"(?={re.escape(prefix.lstrip('/'))})" if prefix else ""
+            if suffix:
+                regex += fnmatch.translate(f"*{suffix}")
+            alternatives.append(regex)
+        else:
+            alternatives.append(fnmatch.translate(pattern))
+
+    if not alternatives:
+        return None
+    # fnmatch.fnmatch is case-insensitive where the OS normalizes case (Windows)
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(f"(?:{a})" for a in alternatives), flags)
+
 
 @dataclass
 class ScannedFile:
@@ -27,7 +91,7 @@ class ScannedFile:
     file_type: str
     size_bytes: int
     modified_at: datetime
-    content_hash: str
+    content_hash: str  # 16 hex chars of BLAKE3 (or SHA-256 without blake3)
     git_repo: Optional[str] = None
     is_git_tracked: bool = False
 
@@ -48,6 +112,8 @@ class FileScanner:
         self.directories = [Path(d) for d in (directories or config.directories)]
         self.include_extensions = set(include_extensions or config.include_extensions)
         self.exclude_patterns = exclude_patterns or config.exclude_patterns
+        self._exclude_re = _compile_exclude_patterns(self.exclude_patterns)
+        self.scan_workers = config.scan_workers or SCAN_WORKERS
 
         # Cache for git repo roots
         self._git_repos: dict[Path, Optional[Path]] = {}
@@ -55,45 +121,46 @@ class FileScanner:
 
     def _matches_exclude_pattern(self, path: Path, base_dir: Path) -> bool:
         """Check if path matches any exclude pattern."""
-        rel_path = str(path.relative_to(base_dir)).replace("\\", "/")
-
-        for pattern in self.exclude_patterns:
-            # Handle ** patterns
-            if "**" in pattern:
-                pattern_parts = pattern.replace("\\", "/").split("**")
-                if len(pattern_parts) == 2:
-                    prefix, suffix = pattern_parts
-                    prefix = prefix.rstrip("/")
-                    suffix = suffix.lstrip("/")
-
-                    if prefix and not rel_path.startswith(prefix.lstrip("/")):
-                        continue
-                    if suffix and not fnmatch.fnmatch(rel_path, f"*{suffix}"):
-                        continue
-                    return True
-            elif fnmatch.fnmatch(rel_path, pattern):
-                return True
-
-        return False
+        return self._is_excluded(str(path.relative_to(base_dir)).replace("\\", "/"))
+
+    def _is_excluded(self, rel_path: str) -> bool:
+        """Check a "/"-separated path relative to the scan root against exclude patterns."""
+        return self._exclude_re is not None and self._exclude_re.match(rel_path) is not None
 
     def _find_git_repo(self, path: Path) -> Optional[Path]:
         """Find the git repository root for a path."""
         # Check cache first
-        for parent in [path] + list(path.parents):
-            if parent in self._git_repos:
-                return self._git_repos[parent]
+        if path in self._git_repos:
+            return self._git_repos[path]
 
-        # Search for .git directory
-        current = path if path.is_dir() else path.parent
+        repo_root = self._git_repo_for_dir(path if path.is_dir() else path.parent)
+        self._git_repos[path] = repo_root
+        return repo_root
+
+    def _git_repo_for_dir(self, directory: Path) -> Optional[Path]:
+        """
+        Find the git repository root containing a directory.
+
+        Walks up one level at a time and caches the answer for every directory
+        it passes, so files under an already visited directory resolve without
+        a stat. Nested repositories (submodules) resolve to the innermost root.
+        """
+        visited = []
+        current = directory
+        repo_root = None
         while current != current.parent:
+            if current in self._git_repos:
+                repo_root = self._git_repos[current]
+                break
+            visited.append(current)
             if (current / ".git").exists():
-                # Cache result for this and all child paths
-                self._git_repos[path] = current
-                return current
+                repo_root = current
+                break
             current = current.parent
 
-        self._git_repos[path] = None
-        return None
+        for visited_dir in visited:
+            self._git_repos[visited_dir] = repo_root
+        return repo_root
 
     def _get_git_tracked_files(self, repo_root: Path) -> Set[str]:
         """Get set of git-tracked files in a repository."""
@@ -115,9 +182,27 @@ class FileScanner:
         self._git_tracked_files[repo_root] = tracked
         return tracked
 
-    def _compute_hash(self, path: Path) -> str:
-        """Compute SHA256 hash of file content."""
+    def _compute_hash(self, path: Path, size: Optional[int] = None) -> str:
+        """
+        Compute a short hash of file content.
+
+        Uses BLAKE3 when installed (memory-mapped for files of
+        MMAP_HASH_THRESHOLD bytes or more), falling back to SHA-256.
+
+        Args:
+            path: File to hash
+            size: File size in bytes, if already known from stat()
+        """
+        if size == 0:
+            return EMPTY_BLAKE3 if BLAKE3_AVAILABLE else EMPTY_SHA256
         try:
+            if BLAKE3_AVAILABLE:
+                hasher = blake3.blake3()
+                if size is not None and size >= MMAP_HASH_THRESHOLD:
+                    hasher.update_mmap(path)
+                else:
+                    hasher.update(path.read_bytes())
+                return hasher.hexdigest()[:16]
             return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
         except Exception:
             return ""
@@ -161,57 +246,140 @@ class FileScanner:
 
         logger.info(f"Scanning {directory}...")
 
-        for root, dirs, files in os.walk(directory):
-            root_path = Path(root)
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+            batch: List[tuple] = []
+            for candidate in self._walk_candidates(directory):
+                batch.append(candidate)
+                if len(batch) >= HASH_BATCH_SIZE:
+                    yield from self._hash_batch(pool, directory, batch)
+                    batch = []
+            if batch:
+                yield from self._hash_batch(pool, directory, batch)
+
+    def _walk_candidates(self, directory: Path) -> Iterator[tuple]:
+        """
+        Walk a directory, yielding (path, stat) for each file that passes the filters.
+
+        Visits entries in the same top-down order as os.walk. With more than one
+        scan worker, the next few directories on the walk stack are listed ahead
+        on a thread pool (see _list_dir), so readdir/stat latency on slow or
+        network filesystems overlaps while results are still consumed
+        depth-first in listing order. Excluded and hidden directories are never
+        opened; symlinked directories are not followed.
+        """
+        if self.scan_workers <= 1:
+            stack = [(str(directory), "")]
+            while stack:
+                files, subdirs = self._list_dir(*stack.pop())
+                # Reversed so subdirectories pop off the stack in listing order
+                stack.extend(reversed(subdirs))
+                yield from files
+            return
+
+        read_ahead = self.scan_workers * SCAN_READ_AHEAD_PER_WORKER
+        pool = ThreadPoolExecutor(max_workers=self.scan_workers)
+        try:
+            # [absolute dir, dir path relative to `directory` using "/", listing future]
+            stack = [[str(directory), "", None]]
+            while stack:
+                # Read ahead the directories that will be visited next
+                for pending in stack[-read_ahead:]:
+                    if pending[2] is None:
+                        pending[2] = pool.submit(self._list_dir, pending[0], pending[1])
+                files, subdirs = stack.pop()[2].result()
+                stack.extend([root, rel_root, None] for root, rel_root in reversed(subdirs))
+                yield from files
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _list_dir(self, root: str, rel_root: str) -> Tuple[List[tuple], List[tuple]]:
+        """
+        List one directory from a single os.scandir pass.
 
-            # Filter directories in-place to skip excluded paths
-            dirs[:] = [
-                d
-                for d in dirs
-                if not self._matches_exclude_pattern(root_path / d, directory)
-                and not d.startswith(".")
-            ]
+        Extensions and exclude patterns are checked on the relative path string
+        before touching the file.
 
-            for filename in files:
-                file_path = root_path / filename
+        Args:
+            root: Absolute directory path
+            rel_root: Directory path relative to the scan root, using "/"
 
-                # Check extension
-                if file_path.suffix.lower() not in self.include_extensions:
+        Returns:
+            (path, stat) for each candidate file and (path, rel_path) for each
+            subdirectory to descend into, both in listing order
+        """
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            return [], []
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                # Skip hidden and excluded directories without opening them
+                if entry.name.startswith(".") or self._is_excluded(rel_path):
                     continue
+                if not entry.is_symlink():
+                    subdirs.append((entry.path, rel_path))
+                continue
 
-                # Check exclude patterns
-                if self._matches_exclude_pattern(file_path, directory):
-                    continue
+            file_path = Path(entry.path)
 
-                # Skip very large files (>10MB)
-                try:
-                    stat = file_path.stat()
-                    if stat.st_size > 10 * 1024 * 1024:
-                        continue
-                except OSError:
-                    continue
+            # Check extension
+            if file_path.suffix.lower() not in self.include_extensions:
+                continue
+
+            # Check exclude patterns
+            if self._is_excluded(rel_path):
+                continue
 
-                # Get git info
-                git_repo = self._find_git_repo(file_path)
-                is_tracked = False
-                git_repo_str = None
-
-                if git_repo:
-                    git_repo_str = str(git_repo)
-                    tracked_files = self._get_git_tracked_files(git_repo)
-                    rel_to_repo = str(file_path.relative_to(git_repo))
-                    is_tracked = rel_to_repo in tracked_files
-
-                yield ScannedFile(
-                    path=file_path,
-                    relative_path=str(file_path.relative_to(directory)),
-                    file_type=self._get_file_type(file_path),
-                    size_bytes=stat.st_size,
-                    modified_at=datetime.fromtimestamp(stat.st_mtime),
-                    content_hash=self._compute_hash(file_path),
-                    git_repo=git_repo_str,
-                    is_git_tracked=is_tracked,
-                )
+            # Skip very large files (>10MB)
+            try:
+                stat = entry.stat()
+                if stat.st_size > 10 * 1024 * 1024:
+                    continue
+            except OSError:
+                continue
+
+            files.append((file_path, stat))
+
+        return files, subdirs
+
+    def _hash_batch(
+        self, pool: ThreadPoolExecutor, directory: Path, batch: List[tuple]
+    ) -> Iterator[ScannedFile]:
+        """Hash a batch of walked files on the pool and yield them in walk order."""
+        hashes = pool.map(lambda c: self._compute_hash(c[0], c[1].st_size), batch)
+
+        for (file_path, stat), content_hash in zip(batch, hashes):
+            # Get git info
+            git_repo = self._git_repo_for_dir(file_path.parent)
+            is_tracked = False
+            git_repo_str = None
+
+            if git_repo:
+                git_repo_str = str(git_repo)
+                tracked_files = self._get_git_tracked_files(git_repo)
+                rel_to_repo = str(file_path.relative_to(git_repo))
+                is_tracked = rel_to_repo in tracked_files
+
+            yield ScannedFile(
+                path=file_path,
+                relative_path=str(file_path.relative_to(directory)),
+                file_type=self._get_file_type(file_path),
+                size_bytes=stat.st_size,
+                modified_at=datetime.fromtimestamp(stat.st_mtime),
+                content_hash=content_hash,
+                git_repo=git_repo_str,
+                is_git_tracked=is_tracked,
+            )
 
     def scan_all(self) -> Iterator[ScannedFile]:
         """
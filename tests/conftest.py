@@ -2,7 +2,9 @@
 Pytest configuration and fixtures for file-compass tests.
 """
 
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -10,6 +12,43 @@ import pytest
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from file_compass.indexer import FileIndex  # noqa: E402
+from file_compass.quick_index import QuickIndex  # noqa: E402
+
+# Put tmp_path/mkdtemp workspaces (including SQLite databases and their WAL)
+# on tmpfs when the host has one, unless TMPDIR was chosen explicitly
+_SHM = Path("/dev/shm")
+if "TMPDIR" not in os.environ and _SHM.is_dir() and os.access(_SHM, os.W_OK):
+    _tmp_root = _SHM / f"pytest-{os.getuid()}"
+    _tmp_root.mkdir(mode=0o700, exist_ok=True)
+    os.environ["TMPDIR"] = str(_tmp_root)
+    tempfile.tempdir = None  # Re-read TMPDIR on the next gettempdir()
+
+# Test databases are throwaway: keep the rollback journal in memory and never fsync
+_TEST_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_sqlite(request, monkeypatch):
+    """Drop SQLite durability for index databases opened by tests.
+
+    Tests marked ``durable_sqlite`` keep the production PRAGMAs.
+    """
+    if request.node.get_closest_marker("durable_sqlite"):
+        return
+
+    for cls in (FileIndex, QuickIndex):
+
+        def configure_conn(self, _configure=cls._configure_conn):
+            _configure(self)
+            for pragma in _TEST_SQLITE_PRAGMAS:
+                self._conn.execute(pragma)
+
+        monkeypatch.setattr(cls, "_configure_conn", configure_conn)
+
 
 @pytest.fixture
 def sample_python_code():
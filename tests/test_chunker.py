@@ -2,12 +2,24 @@
 Tests for file_compass.chunker module.
 """
 
+import ast
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from file_compass.chunker import TREE_SITTER_AVAILABLE, Chunk, FileChunker
+from file_compass.chunker import (
+    TREE_SITTER_AVAILABLE,
+    Chunk,
+    FileChunker,
+    WordCounter,
+    compute_windows,
+    iter_definitions,
+    json_top_level_entries,
+    line_offsets,
+    yaml_top_level_key,
+)
 
 # Marker for tests requiring tree-sitter
 requires_tree_sitter = pytest.mark.skipif(
@@ -18,9 +30,10 @@ requires_tree_sitter = pytest.mark.skipif(
 class TestFileChunker:
     """Tests for FileChunker class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.chunker = FileChunker()
+    @classmethod
+    def setup_class(cls):
+        """Set up one chunker for the class; tests only read its settings."""
+        cls.chunker = FileChunker()
 
     def test_init_defaults(self):
         """Test default initialization."""
@@ -43,6 +56,14 @@ class TestFileChunker:
         assert estimate > 0
         assert isinstance(estimate, int)
 
+    def test_has_min_tokens_matches_estimate(self):
+        """Test the early-exit threshold check agrees with the full estimate."""
+        chunker = FileChunker(min_chunk_tokens=13)
+        for words in range(0, 30):
+            for text in (" ".join(["w"] * words), "\n  " + "\t".join(["w"] * words) + "  "):
+                expected = chunker._estimate_tokens(text) >= chunker.min_tokens
+                assert chunker._has_min_tokens(text) == expected
+
     def test_make_preview(self):
         """Test preview generation."""
         content = "a" * 500
@@ -131,6 +152,90 @@ Even more content.
         assert len(chunks) > 1
         assert all(c.chunk_type == "window" for c in chunks)
 
+    def test_sliding_window_overlap_lines(self):
+        """Test that consecutive windows share trailing lines and cover the file."""
+        chunker = FileChunker(max_chunk_tokens=100, chunk_overlap_tokens=20)
+        lines = ["This is line number " + str(i) for i in range(200)]
+        chunks = chunker._chunk_sliding_window("\n".join(lines))
+
+        assert chunks[0].line_start == 1
+        assert chunks[-1].line_end == 200
+        for prev, nxt in zip(chunks, chunks[1:]):
+            assert prev.line_start < nxt.line_start <= prev.line_end
+        for c in chunks:
+            assert c.content == "\n".join(lines[c.line_start - 1 : c.line_end])
+
+    def test_compute_windows(self):
+        """Test window boundaries computed from line lengths."""
+        starts = np.empty(5, dtype=np.int64)
+        ends = np.empty(5, dtype=np.int64)
+
+        # Each line costs 10 chars with its newline; 2 lines per window, 1 line overlap
+        count = compute_windows([9, 9, 9, 9, 9], 20, 9, starts, ends)
+
+        assert list(starts[:count]) == [0, 1, 2, 3]
+        assert list(ends[:count]) == [2, 3, 4, 5]
+
+    def test_compute_windows_empty(self):
+        """Test that no lines produce no windows."""
+        buf = np.empty(0, dtype=np.int64)
+        assert compute_windows([], 100, 10, buf, buf) == 0
+
+    def test_line_offsets_slices_match_join(self):
+        """Test that offset slices reproduce joined line ranges."""
+        content = "first\n\nthird line\nlast"
+        lines = content.split("\n")
+        offsets = line_offsets(lines)
+
+        for a in range(len(lines)):
+            for b in range(a + 1, len(lines) + 1):
+                assert content[offsets[a] : offsets[b] - 1] == "\n".join(lines[a:b])
+
+    def test_iter_definitions_matches_ast_walk(self):
+        """Test that statement-only traversal finds the same definitions as ast.walk."""
+        source = """
+import sys
+
+if sys.version_info >= (3, 10):
+    def modern():
+        def inner():
+            pass
+else:
+    def legacy():
+        pass
+
+try:
+    import fast
+except ImportError:
+    class Fallback:
+        async def run(self):
+            pass
+finally:
+    def cleanup():
+        pass
+
+match sys.platform:
+    case "linux":
+        def on_linux():
+            pass
+"""
+        tree = ast.parse(source)
+        definition_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        expected = [n.name for n in ast.walk(tree) if isinstance(n, definition_types)]
+
+        assert [n.name for n in iter_definitions(tree)] == expected
+
+    def test_word_counter_matches_str_split(self):
+        """Test that substring word counts match str.split, including Unicode spaces."""
+        text = "def f(x):\n\treturn  x\u00a0+ 1\u3000# done\n\n  tail"
+
+        words = WordCounter(text)
+
+        for a in range(len(text) + 1):
+            for b in range(a, len(text) + 1):
+                assert words.count(a, b) == len(text[a:b].split())
+        assert words.estimate_tokens(0, len(text)) == self.chunker._estimate_tokens(text)
+
     def test_chunk_empty_file(self):
         """Test chunking an empty file."""
         with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
@@ -198,6 +303,7 @@ line6
         assert chunk.chunk_type == "test"
         assert chunk.name == "test_name"
         assert chunk.token_estimate > 0
+        assert not hasattr(chunk, "__dict__")
 
     def test_chunk_file_read_error(self):
         """Test chunking a file that cannot be read."""
@@ -206,8 +312,32 @@ line6
         chunks = self.chunker.chunk_file(path)
         assert chunks == []
 
+    def test_chunk_file_skips_binary_content(self, tmp_path):
+        """Test files with a NUL byte in their head are skipped without decoding."""
+        png = tmp_path / "image.py"
+        png.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + b"x = 1\n" * 100)
+        assert self.chunker.chunk_file(png) == []
+
+        crlf = tmp_path / "crlf.py"
+        crlf.write_bytes(b"def first():\r\n    return 1\r\n")
+        chunks = self.chunker.chunk_file(crlf)
+        assert chunks and all("\r" not in c.content for c in chunks)
+
+    def test_chunk_file_memory_maps_large_files(self, tmp_path):
+        """Test files past MMAP_READ_THRESHOLD chunk the same as pre-read content."""
+        body = "".join(f"def func_{i}():\r\n    return {i}\r\n\r\n" for i in range(3000))
+        large = tmp_path / "large.py"
+        large.write_bytes(body.encode())
+        assert large.stat().st_size >= self.chunker.MMAP_READ_THRESHOLD
+
+        expected = self.chunker.chunk_file(large, content=body.replace("\r\n", "\n"))
+        assert self.chunker.chunk_file(large) == expected
+
+        large.write_bytes(b"\x7fELF\x02\x01\x01\x00" + b"\x00" * 100_000)
+        assert self.chunker.chunk_file(large) == []
+
     def test_chunk_json_file(self):
-        """Test chunking a JSON file uses sliding window."""
+        """Test chunking a small JSON file."""
         json_content = '{"key1": "value1", "key2": "value2"}'
         with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
             f.write(json_content)
@@ -220,7 +350,7 @@ line6
             temp_path.unlink()
 
     def test_chunk_yaml_file(self):
-        """Test chunking a YAML file uses sliding window."""
+        """Test chunking a small YAML file."""
         yaml_content = "key1: value1\nkey2: value2\n"
         with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
             f.write(yaml_content)
@@ -233,7 +363,7 @@ line6
             temp_path.unlink()
 
     def test_chunk_yml_file(self):
-        """Test chunking a YML file uses sliding window."""
+        """Test chunking a small YML file."""
         yml_content = "key1: value1\nkey2: value2\n"
         with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
             f.write(yml_content)
@@ -245,6 +375,88 @@ line6
         finally:
             temp_path.unlink()
 
+    def test_chunk_yaml_top_level_keys(self):
+        """Test that YAML is chunked by top-level keys, merging small entries."""
+        yaml_content = (
+            "# Service config\n"
+            "name: demo\n"
+            "services:\n"
+            "  web:\n"
+            "    image: nginx\n"
+            "    ports:\n"
+            "      - '80:80'\n"
+            "\n"
+            "volumes:\n"
+            "  data: {}\n"
+            "  logs: {}\n"
+            "  cache: {}\n"
+        )
+        chunker = FileChunker(min_chunk_tokens=8, use_tree_sitter=False)
+
+        chunks = chunker._chunk_structured(yaml_content, ".yaml")
+
+        assert [(c.name, c.line_start, c.line_end) for c in chunks] == [
+            ("name", 1, 7),
+            ("volumes", 9, 12),
+        ]
+        assert all(c.chunk_type == "key" for c in chunks)
+        assert chunks[1].content == "volumes:\n  data: {}\n  logs: {}\n  cache: {}"
+
+    def test_chunk_json_top_level_keys(self):
+        """Test that JSON objects are chunked by top-level keys with line spans."""
+        json_content = (
+            "{\n"
+            '  "name": "demo",\n'
+            '  "scripts": {"build": "tsc", "test": "jest --coverage"},\n'
+            '  "dependencies": {\n'
+            '    "react": "^18",\n'
+            '    "lodash": "^4"\n'
+            "  }\n"
+            "}\n"
+        )
+        chunker = FileChunker(min_chunk_tokens=3, use_tree_sitter=False)
+
+        chunks = chunker._chunk_structured(json_content, ".json")
+
+        assert [(c.name, c.line_start, c.line_end) for c in chunks] == [
+            ("name", 1, 2),
+            ("scripts", 3, 3),
+            ("dependencies", 4, 8),
+        ]
+        assert chunks[1].content == '"scripts": {"build": "tsc", "test": "jest --coverage"},'
+
+    def test_chunk_json_merges_small_trailing_key(self):
+        """Test that a small last entry joins the previous chunk."""
+        chunker = FileChunker(min_chunk_tokens=3, use_tree_sitter=False)
+
+        chunks = chunker._chunk_structured(
+            '{"alpha one two": 1, "beta": "x y z w", "gamma": [1,2,3]}', ".json"
+        )
+
+        assert [c.name for c in chunks] == ["alpha one two", "beta"]
+        assert chunks[1].content == '"beta": "x y z w", "gamma": [1,2,3]}'
+
+    def test_json_top_level_entries(self):
+        """Test locating top-level JSON entries."""
+        assert json_top_level_entries('{"a" : [1, {"b": 2}] , "c": null}') == [
+            (1, "a"),
+            (23, "c"),
+        ]
+        assert json_top_level_entries("{}") == []
+        assert json_top_level_entries("[1, 2]") is None
+        assert json_top_level_entries('{"a": 1,}') is None
+
+    def test_yaml_top_level_key(self):
+        """Test detection of top-level YAML keys."""
+        assert yaml_top_level_key("name: demo") == "name"
+        assert yaml_top_level_key("services:") == "services"
+        assert yaml_top_level_key('"quoted key": 1') == "quoted key"
+        assert yaml_top_level_key("  nested: 1") is None
+        assert yaml_top_level_key("- item: 1") is None
+        assert yaml_top_level_key("# comment: x") is None
+        assert yaml_top_level_key("---") is None
+        assert yaml_top_level_key("http://example.com") is None
+
     def test_chunk_invalid_python_syntax(self):
         """Test chunking invalid Python falls back to sliding window."""
         invalid_python = "def broken(\n    this is not valid python!!!"
@@ -333,6 +545,16 @@ class DecoratedClass:
         finally:
             temp_path.unlink()
 
+    def test_chunk_markdown_heading_line_numbers(self):
+        """Test heading detection line numbers and that headings don't span lines."""
+        markdown = "intro\n#\nnot a title\n\n## Real Heading\nbody\n### Child\ntext"
+        chunks = self.chunker._chunk_markdown(markdown)
+
+        assert [(c.name, c.line_start, c.line_end) for c in chunks] == [
+            ("Real Heading", 5, 8),
+            ("Child", 7, 8),
+        ]
+
     def test_chunk_markdown_heading_hierarchy(self):
         """Test markdown chunks break at same/higher level headings."""
         # Need enough content in each section to meet min_tokens threshold
@@ -418,6 +640,22 @@ async def async_func():
         finally:
             temp_path.unlink()
 
+    def test_chunk_python_module_level_groups(self):
+        """Test that uncovered lines between definitions form separate module chunks."""
+        code = (
+            "import os\nimport sys\n\n"
+            "def first():\n    return os.sep\n\n"
+            "CONSTANT = 1\nOTHER = 2\n\n"
+            "def second():\n    return sys.argv"
+        )
+        chunker = FileChunker(min_chunk_tokens=1, use_tree_sitter=False)
+
+        chunks = chunker._chunk_python(code)
+
+        module_chunks = [c for c in chunks if c.chunk_type == "module"]
+        assert [(c.line_start, c.line_end) for c in module_chunks] == [(1, 3), (6, 9)]
+        assert module_chunks[1].content == "\nCONSTANT = 1\nOTHER = 2\n"
+
     def test_chunk_with_preread_content(self):
         """Test chunking with pre-read content."""
         content = "def test():\n    pass\n"
@@ -430,10 +668,11 @@ async def async_func():
 class TestTreeSitterChunking:
     """Tests for tree-sitter based chunking."""
 
-    def setup_method(self):
-        """Set up test fixtures with lower min_chunk_tokens for test code."""
+    @classmethod
+    def setup_class(cls):
+        """Set up one chunker with lower min_chunk_tokens for test code."""
         # Use lower min_chunk_tokens since test samples are small
-        self.chunker = FileChunker(use_tree_sitter=True, min_chunk_tokens=5)
+        cls.chunker = FileChunker(use_tree_sitter=True, min_chunk_tokens=5)
 
     def test_tree_sitter_available(self):
         """Test that tree-sitter availability is correctly detected."""
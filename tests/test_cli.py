@@ -10,7 +10,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from file_compass.cli import cmd_index, cmd_scan, cmd_search, cmd_status, main
+from file_compass.cli import _build_parser, cmd_index, cmd_scan, cmd_search, cmd_status, main
 
 
 class TestCmdIndex:
@@ -365,6 +365,17 @@ class TestMain:
 
             mock_cmd.assert_called_once()
 
+    def test_main_reuses_parser(self, monkeypatch):
+        """Test the argument parser is built once and reused across calls."""
+        monkeypatch.setattr(sys, "argv", ["file-compass", "status"])
+
+        with patch("file_compass.cli.cmd_status"):
+            main()
+            main()
+
+        assert _build_parser() is _build_parser()
+        assert _build_parser.cache_info().misses <= 1
+
     def test_main_scan_verbose(self, monkeypatch):
         """Test main with verbose flag."""
         monkeypatch.setattr(sys, "argv", ["file-compass", "scan", "-v"])
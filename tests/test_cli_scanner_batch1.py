@@ -15,6 +15,9 @@ from io import StringIO
 from file_compass.cli import main as cli_main
 from file_compass.scanner import FileScanner, ScannedFile
 
+# Shared, immutable timestamp for stub SearchResults
+_FIXED_DT = datetime(2024, 1, 1, 12, 0, 0)
+
 
 # =============================================================================
 # Section 1: CLI Tests (13 tests)
@@ -46,37 +49,40 @@ class TestCLIHelp:
         assert "index" in captured.out.lower()
 
 
+class StubFileIndex:
+    """Plain FileIndex stand-in for the CLI index flow; records build_index kwargs."""
+
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def build_index(self, **kwargs):
+        StubFileIndex.calls.append(kwargs)
+        return {"files_indexed": 1, "chunks_indexed": 1, "duration_seconds": 0.5}
+
+    async def close(self):
+        pass
+
+
 class TestCLIIndexDirectory:
     """Test CLI index command with directories."""
 
+    @pytest.fixture(autouse=True)
+    def _stub_index(self, monkeypatch):
+        monkeypatch.setattr(StubFileIndex, 'calls', [])
+        monkeypatch.setattr('file_compass.cli.FileIndex', StubFileIndex)
+
     def test_cli_index_valid_directory(self, tmp_path, monkeypatch):
         """Test indexing a valid directory."""
         # Create test file
         test_file = tmp_path / "test.py"
         test_file.write_text("def hello(): pass")
+        monkeypatch.setattr(sys, 'argv', ['file-compass', 'index', '-d', str(tmp_path)])
 
-        # Note: CLI tests need careful argv setup
-        # The CLI may not accept positional args for directories
-        # This test verifies the FileIndex is called correctly
-        with patch('file_compass.cli.FileIndex') as MockIndex:
-            mock_instance = MagicMock()
-            mock_instance.build_index = AsyncMock(return_value={
-                "files_indexed": 1,
-                "chunks_indexed": 1,
-                "duration_seconds": 0.5
-            })
-            mock_instance.close = AsyncMock()
-            MockIndex.return_value = mock_instance
+        cli_main()
 
-            # Test that FileIndex can be instantiated and build_index called
-            import asyncio
-            async def run():
-                index = MockIndex()
-                await index.build_index(directories=[str(tmp_path)])
-                await index.close()
-            asyncio.run(run())
-
-            MockIndex.assert_called()
+        assert StubFileIndex.calls[0]["directories"] == [str(tmp_path)]
 
     def test_cli_index_multiple_directories(self, tmp_path, monkeypatch):
         """Test indexing multiple directories."""
@@ -86,26 +92,13 @@ class TestCLIIndexDirectory:
         dir2.mkdir()
         (dir1 / "a.py").write_text("a = 1")
         (dir2 / "b.py").write_text("b = 2")
+        monkeypatch.setattr(
+            sys, 'argv', ['file-compass', 'index', '-d', str(dir1), str(dir2)]
+        )
 
-        with patch('file_compass.cli.FileIndex') as MockIndex:
-            mock_instance = MagicMock()
-            mock_instance.build_index = AsyncMock(return_value={
-                "files_indexed": 2,
-                "chunks_indexed": 2,
-                "duration_seconds": 1.0
-            })
-            mock_instance.close = AsyncMock()
-            MockIndex.return_value = mock_instance
-
-            # Test that FileIndex can handle multiple directories
-            import asyncio
-            async def run():
-                index = MockIndex()
-                await index.build_index(directories=[str(dir1), str(dir2)])
-                await index.close()
-            asyncio.run(run())
+        cli_main()
 
-            MockIndex.assert_called()
+        assert StubFileIndex.calls[0]["directories"] == [str(dir1), str(dir2)]
 
 
 class TestCLIInvalidPath:
@@ -127,7 +120,8 @@ class TestCLIInvalidPath:
             except SystemExit:
                 pass  # Expected
 
-    def test_cli_index_file_instead_of_directory(self, tmp_path, monkeypatch, capsys):
+    @pytest.mark.asyncio
+    async def test_cli_index_file_instead_of_directory(self, tmp_path, monkeypatch, capsys):
         """Test indexing a file instead of directory handles gracefully."""
         test_file = tmp_path / "test.py"
         test_file.write_text("x = 1")
@@ -143,13 +137,10 @@ class TestCLIInvalidPath:
             mock_instance.close = AsyncMock()
             MockIndex.return_value = mock_instance
 
-            import asyncio
-            async def run():
-                index = MockIndex()
-                # Passing file instead of directory
-                await index.build_index(directories=[str(test_file)])
-                await index.close()
-            asyncio.run(run())
+            index = MockIndex()
+            # Passing file instead of directory
+            await index.build_index(directories=[str(test_file)])
+            await index.close()
 
             mock_instance.build_index.assert_called_once()
 
@@ -173,7 +164,7 @@ class TestCLIOutputFormats:
             line_end=10,
             preview="def test(): pass",
             relevance=0.8,
-            modified_at=datetime.now(),
+            modified_at=_FIXED_DT,
             git_tracked=True
         )
 
@@ -193,62 +184,57 @@ class TestCLIOutputFormats:
         """Test status command output."""
         monkeypatch.setattr(sys, 'argv', ['file-compass', 'status'])
 
-        with patch('file_compass.cli.FileIndex') as MockIndex:
+        with patch('file_compass.cli.get_index') as mock_get_index:
             mock_instance = MagicMock()
             mock_instance.get_status.return_value = {
                 "files_indexed": 100,
                 "chunks_indexed": 500,
-                "last_build": "2024-01-15T10:00:00"
+                "index_size_mb": 1.5,
+                "last_build": "2024-01-15T10:00:00",
+                "file_types": {"python": 100},
             }
-            MockIndex.return_value = mock_instance
+            mock_get_index.return_value = mock_instance
 
             cli_main()
 
             captured = capsys.readouterr()
-            assert "100" in captured.out or "files" in captured.out.lower()
+            assert "100" in captured.out
+            assert "500" in captured.out
 
 
 class TestCLIExitCodes:
     """Test CLI exit codes."""
 
-    def test_cli_success_exit_code(self, tmp_path, monkeypatch):
-        """Test successful command returns 0."""
-        monkeypatch.setattr(sys, 'argv', ['file-compass', 'status'])
+    @pytest.mark.parametrize("argv, succeeds", [
+        (['file-compass', 'status'], True),
+        (['file-compass', 'unknowncommand'], False),
+        (['file-compass', 'search'], False),  # Missing query
+    ], ids=["success", "unknown_command", "missing_required_args"])
+    def test_cli_exit_codes(self, monkeypatch, capsys, argv, succeeds):
+        """Test commands exit 0 on success and non-zero on argument errors."""
+        monkeypatch.setattr(sys, 'argv', argv)
 
-        with patch('file_compass.cli.FileIndex') as MockIndex:
+        with patch('file_compass.cli.get_index') as mock_get_index:
             mock_instance = MagicMock()
-            mock_instance.get_status.return_value = {"files_indexed": 0}
-            MockIndex.return_value = mock_instance
+            mock_instance.get_status.return_value = {
+                "files_indexed": 0,
+                "chunks_indexed": 0,
+                "index_size_mb": 0.0,
+                "last_build": None,
+                "file_types": {},
+            }
+            mock_get_index.return_value = mock_instance
 
-            # Should not raise or exit with non-zero
-            result = None
             try:
                 cli_main()
-                result = 0
+                code = 0
             except SystemExit as e:
-                result = e.code
-
-            assert result == 0 or result is None
-
-    def test_cli_unknown_command_exit_code(self, monkeypatch, capsys):
-        """Test unknown command shows error."""
-        monkeypatch.setattr(sys, 'argv', ['file-compass', 'unknowncommand'])
-
-        with pytest.raises(SystemExit) as exc:
-            cli_main()
+                code = e.code
 
-        # Should exit with non-zero for invalid command
-        assert exc.value.code != 0 or exc.value.code is None
-
-    def test_cli_missing_required_args(self, monkeypatch, capsys):
-        """Test missing required arguments shows error."""
-        monkeypatch.setattr(sys, 'argv', ['file-compass', 'search'])  # Missing query
-
-        with pytest.raises(SystemExit) as exc:
-            cli_main()
-
-        # Should exit with error for missing args
-        assert exc.value.code != 0
+        if succeeds:
+            assert code in (0, None)
+        else:
+            assert code not in (0, None)
 
 
 class TestCLIScanCommand:
@@ -287,9 +273,8 @@ class TestScannerWalksDirectories:
         scanner = FileScanner(directories=[str(tmp_path)])
         files = list(scanner.scan_all())
 
-        paths = [f.relative_path for f in files]
-        assert any("helpers.py" in p for p in paths)
-        assert any("main.py" in p for p in paths)
+        names = {f.path.name for f in files}
+        assert {"helpers.py", "main.py"} <= names
 
     def test_scanner_returns_scanned_file_objects(self, tmp_path):
         """Test scanner returns ScannedFile dataclass objects."""
@@ -434,39 +419,30 @@ class TestScannerUnicodePaths:
         assert files[0].content_hash is not None
 
 
-class TestScannerContentHash:
-    """Test FileScanner content hashing."""
-
-    def test_scanner_computes_content_hash(self, tmp_path):
-        """Test scanner computes content hash."""
-        (tmp_path / "test.py").write_text("def hello(): pass")
-
-        scanner = FileScanner(directories=[str(tmp_path)])
-        files = list(scanner.scan_all())
-
-        assert len(files) == 1
-        assert files[0].content_hash is not None
-        assert len(files[0].content_hash) > 0
-
-    def test_scanner_same_content_same_hash(self, tmp_path):
-        """Test same content produces same hash."""
-        content = "def hello(): pass"
-        (tmp_path / "file1.py").write_text(content)
-        (tmp_path / "file2.py").write_text(content)
-
-        scanner = FileScanner(directories=[str(tmp_path)])
-        files = list(scanner.scan_all())
+@pytest.fixture(scope="module")
+def hash_corpus(tmp_path_factory):
+    """Scan one directory of identical and differing files; map file name to hash."""
+    root = tmp_path_factory.mktemp("hash_corpus")
+    (root / "same1.py").write_text("def hello(): pass")
+    (root / "same2.py").write_text("def hello(): pass")
+    (root / "different.py").write_text("y = 2")
 
-        hashes = [f.content_hash for f in files]
-        assert hashes[0] == hashes[1]
+    scanner = FileScanner(directories=[str(root)])
+    return {f.path.name: f.content_hash for f in scanner.scan_all()}
 
-    def test_scanner_different_content_different_hash(self, tmp_path):
-        """Test different content produces different hash."""
-        (tmp_path / "file1.py").write_text("x = 1")
-        (tmp_path / "file2.py").write_text("y = 2")
 
-        scanner = FileScanner(directories=[str(tmp_path)])
-        files = list(scanner.scan_all())
+class TestScannerContentHash:
+    """Test FileScanner content hashing."""
 
-        hashes = [f.content_hash for f in files]
-        assert hashes[0] != hashes[1]
+    def test_scanner_computes_content_hash(self, hash_corpus):
+        """Test scanner computes content hash."""
+        assert len(hash_corpus) == 3
+        assert all(hash_corpus.values())
+
+    @pytest.mark.parametrize("first, second, same", [
+        ("same1.py", "same2.py", True),
+        ("same1.py", "different.py", False),
+    ], ids=["same_content_same_hash", "different_content_different_hash"])
+    def test_scanner_content_hash_equality(self, hash_corpus, first, second, same):
+        """Test hashes match exactly when file content matches."""
+        assert (hash_corpus[first] == hash_corpus[second]) is same
@@ -41,6 +41,17 @@ class TestEmbedder:
         finally:
             await embedder.close()
 
+    @pytest.mark.asyncio
+    async def test_get_client_fails_fast_on_connect(self):
+        """Test that the client keeps the read timeout but connects with a short timeout."""
+        embedder = Embedder(timeout=60.0)
+        try:
+            client = await embedder._get_client()
+            assert client.timeout.read == 60.0
+            assert client.timeout.connect == 5.0
+        finally:
+            await embedder.close()
+
     @pytest.mark.asyncio
     async def test_get_client_reuses_client(self):
         """Test that _get_client reuses existing client."""
@@ -269,11 +280,11 @@ class TestEmbedder:
 
         texts = ["text1", "text2", "text3"]
 
-        mock_embedding = np.random.randn(768).astype(np.float32)
+        mock_embeddings = np.random.randn(3, 768).astype(np.float32)
 
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"embeddings": [mock_embedding.tolist()]}
+        mock_response.json.return_value = {"embeddings": mock_embeddings.tolist()}
 
         with patch.object(embedder, "_get_client") as mock_get_client:
             mock_client = AsyncMock()
@@ -283,9 +294,111 @@ class TestEmbedder:
             result = await embedder.embed_batch(texts)
 
             assert result.shape == (3, 768)
-            # Should have been called 3 times (once per text)
+            # Short texts share a single /api/embed request
+            assert mock_client.post.call_count == 1
+            call_args = mock_client.post.call_args
+            assert call_args[0][0] == "/api/embed"
+            assert call_args[1]["json"]["input"] == [f"search_document: {t}" for t in texts]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_respects_batch_size(self):
+        """Test that texts are split into requests of batch_size."""
+        embedder = Embedder()
+
+        def mock_post(url, json):
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {
+                "embeddings": [[float(i + 1)] * 768 for i in range(len(json["input"]))]
+            }
+            return mock_response
+
+        with patch.object(embedder, "_get_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(side_effect=mock_post)
+            mock_get_client.return_value = mock_client
+
+            result = await embedder.embed_batch([f"text{i}" for i in range(5)], batch_size=2)
+
+            assert result.shape == (5, 768)
             assert mock_client.post.call_count == 3
 
+    @pytest.mark.asyncio
+    async def test_embed_batch_fills_contiguous_block_in_order(self):
+        """Test batched and long-text rows land in their input slots of one float32 block."""
+        embedder = Embedder()
+
+        def mock_post(url, json):
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            # One-hot vector at the text's number, so rows stay identifiable
+            mock_response.json.return_value = {
+                "embeddings": [
+                    np.eye(768)[int(t.rsplit("text", 1)[1])].tolist() for t in json["input"]
+                ]
+            }
+            return mock_response
+
+        texts = ["text0", "x" * (embedder.MAX_CHARS + 1), "text2", "text3"]
+        with patch.object(embedder, "_get_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(side_effect=mock_post)
+            mock_get_client.return_value = mock_client
+
+            with patch.object(embedder, "embed", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.eye(768, dtype=np.float32)[9]
+                result = await embedder.embed_batch(texts, batch_size=2)
+
+        assert result.dtype == np.float32
+        assert result.flags["C_CONTIGUOUS"]
+        assert result.argmax(axis=1).tolist() == [0, 9, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_halves_on_server_error(self):
+        """Test that a 5xx response retries the batch at half size."""
+        embedder = Embedder()
+        batch_sizes = []
+
+        def mock_post(url, json):
+            batch_sizes.append(len(json["input"]))
+            mock_response = MagicMock()
+            if len(json["input"]) > 2:
+                mock_response.status_code = 500
+                mock_response.text = "out of memory"
+            else:
+                mock_response.status_code = 200
+                mock_response.json.return_value = {
+                    "embeddings": [[1.0] * 768 for _ in json["input"]]
+                }
+            return mock_response
+
+        with patch.object(embedder, "_get_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(side_effect=mock_post)
+            mock_get_client.return_value = mock_client
+
+            result = await embedder.embed_batch([f"text{i}" for i in range(4)], batch_size=4)
+
+            assert result.shape == (4, 768)
+            assert batch_sizes == [4, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_count_mismatch(self):
+        """Test that a response with the wrong number of vectors is rejected."""
+        embedder = Embedder()
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"embeddings": [[1.0] * 768]}
+
+        with patch.object(embedder, "_get_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_get_client.return_value = mock_client
+
+            with pytest.raises(RuntimeError, match="expected 3 vectors"):
+                await embedder.embed_batch(["a", "b", "c"])
+
     @pytest.mark.asyncio
     async def test_embed_batch_truncates_long_texts(self):
         """Test that batch embedding truncates very long texts."""
@@ -323,11 +436,11 @@ class TestEmbedder:
 
         texts = ["text"] * 10
 
-        mock_embedding = np.random.randn(768).astype(np.float32)
+        mock_embeddings = np.random.randn(10, 768).astype(np.float32)
 
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"embeddings": [mock_embedding.tolist()]}
+        mock_response.json.return_value = {"embeddings": mock_embeddings.tolist()}
 
         with patch.object(embedder, "_get_client") as mock_get_client:
             mock_client = AsyncMock()
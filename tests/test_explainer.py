@@ -11,6 +11,7 @@ from file_compass.explainer import (
     ResultExplainer,
     VisualPreview,
     VisualPreviewGenerator,
+    read_line_window,
 )
 
 
@@ -149,6 +150,74 @@ class TestResultExplainer:
         assert embedding_match is not None
         assert embedding_match[1] >= 2  # At least 2 occurrences
 
+    def test_find_exact_matches_keeps_original_case(self):
+        """Test matches report the first occurrence's case, even after length-changing text."""
+        matches = self.explainer._find_exact_matches(["embedding"], "İİ EMBEDDING then embedding")
+        assert matches == [("EMBEDDING", 2)]
+
+        matches = self.explainer._find_exact_matches(["vector", "missing"], "a Vector of vectors")
+        assert matches == [("Vector", 2)]
+
+    def test_explain_match_orders_ties_by_query(self):
+        """Test equally confident reasons follow the order of words in the query."""
+        result = self.explainer.explain_match(
+            query="zeta alpha mid",
+            result_preview="alpha mid zeta",
+            result_path="/test/file.py",
+            chunk_name=None,
+            chunk_type="function",
+            relevance=0.3,
+        )
+
+        assert [r.matched_text for r in result.reasons] == ["zeta", "alpha", "mid"]
+        assert result.summary == 'contains "zeta", "alpha", "mid"'
+
+
+class TestReadLineWindow:
+    """Tests for streaming line-window reads."""
+
+    def test_keeps_only_requested_lines(self, tmp_path):
+        """Test that only lines inside the ranges are returned."""
+        path = tmp_path / "lines.txt"
+        path.write_text("\n".join(f"line {i}" for i in range(1, 51)))
+
+        kept, total = read_line_window(path, [(3, 5), (48, 60)])
+
+        assert total == 50
+        assert kept == {
+            3: "line 3",
+            4: "line 4",
+            5: "line 5",
+            48: "line 48",
+            49: "line 49",
+            50: "line 50",
+        }
+
+    def test_line_count_matches_split(self, tmp_path):
+        """Test that line numbering matches content.split on newlines."""
+        path = tmp_path / "lines.txt"
+        for content in ["", "a", "a\n", "a\n\nb", "a\nb\n"]:
+            path.write_bytes(content.encode())
+            lines = content.split("\n")
+
+            kept, total = read_line_window(path, [(1, 10)])
+
+            assert total == len(lines)
+            assert [kept[i] for i in range(1, total + 1)] == lines
+
+    def test_counts_lines_outside_ranges(self, tmp_path):
+        """Test lines before and after the ranges are counted but not kept."""
+        path = tmp_path / "lines.txt"
+        path.write_text("".join(f"line {i}\n" for i in range(1, 1001)))
+
+        kept, total = read_line_window(path, [(500, 501)])
+        assert total == 1001
+        assert kept == {500: "line 500", 501: "line 501"}
+
+        kept, total = read_line_window(path, [])
+        assert total == 1001
+        assert kept == {}
+
 
 class TestVisualPreviewGenerator:
     """Tests for VisualPreviewGenerator class."""
@@ -72,6 +72,7 @@ class TestGetIndexInstance:
             mock_instance = MagicMock()
             mock_instance.index_path = MagicMock()
             mock_instance.index_path.exists.return_value = True
+            mock_instance._load_cache.return_value = False
             MockIndex.return_value = mock_instance
 
             await get_index_instance()
@@ -82,6 +83,44 @@ class TestGetIndexInstance:
 
         gateway_module._index = None
 
+    @pytest.mark.asyncio
+    async def test_get_index_instance_skips_hnsw_with_cache(self):
+        """Test that HNSW is not loaded when the in-memory cache is usable."""
+        gateway_module._index = None
+
+        with patch("file_compass.gateway.FileIndex") as MockIndex:
+            mock_instance = MagicMock()
+            mock_instance.index_path = MagicMock()
+            mock_instance.index_path.exists.return_value = True
+            mock_instance._load_cache.return_value = True
+            MockIndex.return_value = mock_instance
+
+            await get_index_instance()
+
+            mock_instance._get_conn.assert_called_once()
+            mock_instance._get_index.assert_not_called()
+
+        gateway_module._index = None
+
+    @pytest.mark.asyncio
+    async def test_get_index_instance_failed_load_not_published(self):
+        """Test that an index that fails to load is not cached for later calls."""
+        gateway_module._index = None
+
+        with patch("file_compass.gateway.FileIndex") as MockIndex:
+            mock_instance = MagicMock()
+            mock_instance.index_path = MagicMock()
+            mock_instance.index_path.exists.return_value = True
+            mock_instance._get_conn.side_effect = RuntimeError("database is locked")
+            MockIndex.return_value = mock_instance
+
+            with pytest.raises(RuntimeError):
+                await get_index_instance()
+
+            assert gateway_module._index is None
+
+        gateway_module._index = None
+
 
 class TestFileSearch:
     """Tests for file_search tool."""
@@ -215,6 +254,24 @@ class TestPathSafety:
         # Test with a path that doesn't match allowed directories
         assert _is_path_safe(Path("Z:/nonexistent/path"), config) is False
 
+    def test_is_path_safe_caches_allowed_dirs_not_path(self, tmp_path):
+        """Test allowed directories resolve once while the checked path is re-resolved."""
+        allowed = tmp_path / "allowed"
+        allowed.mkdir()
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        link = allowed / "link"
+        link.symlink_to(allowed)
+        config = FileCompassConfig(directories=[str(allowed)])
+        gateway_module._resolve_allowed_dirs.cache_clear()
+
+        assert _is_path_safe(link, config) is True
+
+        link.unlink()
+        link.symlink_to(outside)
+        assert _is_path_safe(link, config) is False
+        assert gateway_module._resolve_allowed_dirs.cache_info().misses == 1
+
 
 class TestFilePreview:
     """Tests for file_preview tool."""
@@ -305,10 +362,10 @@ class TestFilePreview:
             temp_path = f.name
 
         try:
-            # Mock Path.read_text to raise an exception
+            # Mock Path.open to raise an exception
             with patch("file_compass.gateway.get_config") as mock_config:
                 mock_config.return_value = FileCompassConfig(directories=["."])
-                with patch.object(Path, "read_text", side_effect=PermissionError("Access denied")):
+                with patch.object(Path, "open", side_effect=PermissionError("Access denied")):
                     with patch.object(Path, "exists", return_value=True):
                         result = await file_preview(temp_path)
 
@@ -567,48 +624,34 @@ class TestInputValidation:
     """Tests for input validation in MCP tools."""
 
     @pytest.mark.asyncio
-    async def test_file_search_empty_query(self):
-        """Test file_search rejects empty query."""
-        result = await file_search("")
-        assert "error" in result
-        assert "non-empty string" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_file_search_query_too_long(self):
-        """Test file_search rejects overly long query."""
-        long_query = "x" * 1001
-        result = await file_search(long_query)
-        assert "error" in result
-        assert "too long" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_file_preview_empty_path(self):
-        """Test file_preview rejects empty path."""
-        result = await file_preview("")
-        assert "error" in result
-        assert "non-empty string" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_file_preview_path_too_long(self):
-        """Test file_preview rejects overly long path."""
-        long_path = "x" * 501
-        result = await file_preview(long_path)
+    @pytest.mark.parametrize(
+        "tool, kwargs, message",
+        [
+            (file_search, {"query": ""}, "non-empty string"),
+            (file_search, {"query": "x" * 1001}, "too long"),
+            (file_preview, {"path": ""}, "non-empty string"),
+            (file_preview, {"path": "x" * 501}, "too long"),
+            (file_preview, {"path": "/test/file.py", "line_start": 0}, "positive integer"),
+            (
+                file_preview,
+                {"path": "/test/file.py", "line_start": 1, "line_end": -5},
+                "positive integer",
+            ),
+        ],
+        ids=[
+            "search-empty-query",
+            "search-query-too-long",
+            "preview-empty-path",
+            "preview-path-too-long",
+            "preview-invalid-line-start",
+            "preview-invalid-line-end",
+        ],
+    )
+    async def test_rejects_invalid_input(self, tool, kwargs, message):
+        """Test that tools reject invalid arguments with a descriptive error."""
+        result = await tool(**kwargs)
         assert "error" in result
-        assert "too long" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_file_preview_invalid_line_start(self):
-        """Test file_preview rejects invalid line_start."""
-        result = await file_preview("/test/file.py", line_start=0)
-        assert "error" in result
-        assert "positive integer" in result["error"]
-
-    @pytest.mark.asyncio
-    async def test_file_preview_invalid_line_end(self):
-        """Test file_preview rejects invalid line_end."""
-        result = await file_preview("/test/file.py", line_start=1, line_end=-5)
-        assert "error" in result
-        assert "positive integer" in result["error"]
+        assert message in result["error"]
 
 
 class TestFileQuickSearch:
@@ -4,9 +4,7 @@ Tests for gateway request validation, response schema, missing files, error mapp
 """
 
 import pytest
-import tempfile
 import json
-from pathlib import Path
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -27,6 +25,61 @@ from file_compass.explainer import (
     ExplainedResult,
 )
 import file_compass.gateway as gateway_module
+from file_compass.indexer import FileIndex
+
+# Shared, immutable timestamp for stub SearchResults
+_FIXED_DT = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def _reset_gateway_index():
+    """Start and finish every test without a cached gateway index."""
+    gateway_module._index = None
+    yield
+    gateway_module._index = None
+
+
+@pytest.fixture(scope="module")
+def _shared_mocks():
+    """AsyncMocks built once per module and reset between tests."""
+    return {"search": AsyncMock(return_value=[])}
+
+
+@pytest.fixture
+def clean_mocks(_shared_mocks):
+    """The shared AsyncMocks with calls, return values and side effects cleared."""
+    for mock in _shared_mocks.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _shared_mocks
+
+
+@pytest.fixture
+def mock_index_factory(clean_mocks):
+    """Build FileIndex mocks with a canned status and search result."""
+    def make(files_indexed=10, search_return=()):
+        mock_index = MagicMock(spec=FileIndex)
+        mock_index.get_status.return_value = {"files_indexed": files_indexed}
+        clean_mocks["search"].return_value = list(search_return)
+        mock_index.search = clean_mocks["search"]
+        return mock_index
+    return make
+
+
+@pytest.fixture(scope="module")
+def shared_configs():
+    """Gateway configs built once per module, keyed by allowed directory."""
+    return {d: FileCompassConfig(directories=[d]) for d in (".", "F:/AI", "F:/AI/safe")}
+
+
+@pytest.fixture
+def use_gateway_config(monkeypatch, shared_configs):
+    """Point gateway.get_config at a shared config for the given directory."""
+    def use(directory="."):
+        directory = str(directory)
+        if directory not in shared_configs:
+            shared_configs[directory] = FileCompassConfig(directories=[directory])
+        monkeypatch.setattr(gateway_module, "get_config", lambda: shared_configs[directory])
+    return use
 
 
 # =============================================================================
@@ -38,38 +91,24 @@ class TestGatewayRequestValidation:
 
     @pytest.mark.asyncio
     async def test_search_query_whitespace_only(self):
-        """Test search handles whitespace-only query."""
-        gateway_module._index = None
-
+        """Test search rejects a whitespace-only query without loading the index."""
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 10}
-            mock_index.search = AsyncMock(return_value=[])
-            mock_get.return_value = mock_index
-
             result = await file_search("   ")
-            # May return empty results or error depending on implementation
-            assert "results" in result or "error" in result
 
-        gateway_module._index = None
+        assert "error" in result
+        mock_get.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_search_query_special_chars_only(self):
+    async def test_search_query_special_chars_only(self, mock_index_factory):
         """Test search handles special characters in query."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 10}
-            mock_index.search = AsyncMock(return_value=[])
+            mock_index = mock_index_factory()
             mock_get.return_value = mock_index
 
             # Should not crash with special chars
             result = await file_search("def __init__(self)")
             assert "results" in result or "error" in result
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
     async def test_preview_negative_line_numbers(self):
         """Test preview rejects negative line numbers."""
@@ -83,14 +122,10 @@ class TestGatewayRequestValidation:
         assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_search_invalid_min_relevance(self):
+    async def test_search_invalid_min_relevance(self, mock_index_factory):
         """Test search handles invalid min_relevance."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 10}
-            mock_index.search = AsyncMock(return_value=[])
+            mock_index = mock_index_factory()
             mock_get.return_value = mock_index
 
             # Negative min_relevance should be clamped or rejected
@@ -98,8 +133,6 @@ class TestGatewayRequestValidation:
             # Should handle gracefully
             assert "results" in result or "error" in result
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
     async def test_actions_invalid_line_range(self):
         """Test actions validates line range."""
@@ -109,8 +142,6 @@ class TestGatewayRequestValidation:
     @pytest.mark.asyncio
     async def test_scan_empty_directories(self):
         """Test scan with empty directories string."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock):
             with patch('file_compass.gateway.get_config') as mock_config:
                 mock_config.return_value.directories = []
@@ -119,25 +150,17 @@ class TestGatewayRequestValidation:
         # Should handle empty gracefully
         assert "error" in result or "success" in result
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
-    async def test_search_file_types_invalid_format(self):
+    async def test_search_file_types_invalid_format(self, mock_index_factory):
         """Test search handles malformed file_types."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 10}
-            mock_index.search = AsyncMock(return_value=[])
+            mock_index = mock_index_factory()
             mock_get.return_value = mock_index
 
             # Empty type after comma
             result = await file_search("test", file_types="python,,markdown")
             assert "results" in result or "error" in result
 
-        gateway_module._index = None
-
 
 # =============================================================================
 # Section 2: Gateway Response Schema Tests (5 tests)
@@ -147,10 +170,8 @@ class TestGatewayResponseSchema:
     """Test gateway response structure."""
 
     @pytest.mark.asyncio
-    async def test_search_response_has_required_fields(self):
+    async def test_search_response_has_required_fields(self, mock_index_factory):
         """Test search response has all required fields."""
-        gateway_module._index = None
-
         from file_compass.indexer import SearchResult
         mock_result = SearchResult(
             path="/test/file.py",
@@ -162,14 +183,12 @@ class TestGatewayResponseSchema:
             line_end=10,
             preview="def test_func():",
             relevance=0.8,
-            modified_at=datetime.now(),
+            modified_at=_FIXED_DT,
             git_tracked=True
         )
 
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 10}
-            mock_index.search = AsyncMock(return_value=[mock_result])
+            mock_index = mock_index_factory(search_return=[mock_result])
             mock_get.return_value = mock_index
 
             result = await file_search("test")
@@ -185,15 +204,11 @@ class TestGatewayResponseSchema:
         assert "file_type" in item
         assert "relevance" in item
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
-    async def test_status_response_has_required_fields(self):
+    async def test_status_response_has_required_fields(self, mock_index_factory):
         """Test status response has all required fields."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
+            mock_index = mock_index_factory()
             mock_index.get_status.return_value = {
                 "files_indexed": 100,
                 "chunks_indexed": 500,
@@ -209,25 +224,18 @@ class TestGatewayResponseSchema:
         assert "chunks_indexed" in result
         assert "file_types" in result
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
-    async def test_preview_response_has_content(self):
+    async def test_preview_response_has_content(self, use_gateway_config, tmp_path):
         """Test preview response includes content."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, dir='.') as f:
-            f.write("line 1\nline 2\nline 3")
-            temp_path = f.name
+        preview_file = tmp_path / "preview.py"
+        preview_file.write_text("line 1\nline 2\nline 3")
 
-        try:
-            with patch('file_compass.gateway.get_config') as mock_config:
-                mock_config.return_value = FileCompassConfig(directories=['.'])
-                result = await file_preview(temp_path)
+        use_gateway_config(tmp_path)
+        result = await file_preview(str(preview_file))
 
-            assert "content" in result
-            assert "total_lines" in result
-            assert result["total_lines"] == 3
-        finally:
-            Path(temp_path).unlink()
+        assert "content" in result
+        assert "total_lines" in result
+        assert result["total_lines"] == 3
 
     @pytest.mark.asyncio
     async def test_quick_search_response_structure(self):
@@ -247,10 +255,12 @@ class TestGatewayResponseSchema:
     @pytest.mark.asyncio
     async def test_error_response_has_error_field(self):
         """Test error responses have error field."""
-        result = await file_search("")  # Empty query triggers error
+        with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
+            result = await file_search("")  # Empty query triggers error
 
         assert "error" in result
         assert isinstance(result["error"], str)
+        mock_get.assert_not_called()
 
 
 # =============================================================================
@@ -261,50 +271,42 @@ class TestGatewayHandlesMissingFiles:
     """Test gateway handles missing files gracefully."""
 
     @pytest.mark.asyncio
-    async def test_preview_nonexistent_file(self):
+    async def test_preview_nonexistent_file(self, use_gateway_config):
         """Test preview of nonexistent file returns error."""
-        with patch('file_compass.gateway.get_config') as mock_config:
-            mock_config.return_value = FileCompassConfig(directories=["F:/AI"])
-            result = await file_preview("F:/AI/does_not_exist_12345.py")
+        use_gateway_config("F:/AI")
+        result = await file_preview("F:/AI/does_not_exist_12345.py")
 
         assert "error" in result
         assert "not found" in result["error"].lower()
 
     @pytest.mark.asyncio
-    async def test_actions_nonexistent_file(self):
+    async def test_actions_nonexistent_file(self, use_gateway_config):
         """Test actions on nonexistent file returns error."""
-        with patch('file_compass.gateway.get_config') as mock_config:
-            mock_config.return_value = FileCompassConfig(directories=["F:/AI"])
-            result = await file_actions("F:/AI/missing_file_xyz.py", "context")
+        use_gateway_config("F:/AI")
+        result = await file_actions("F:/AI/missing_file_xyz.py", "context")
 
         assert "error" in result
         assert "not found" in result["error"].lower()
 
     @pytest.mark.asyncio
-    async def test_preview_deleted_file(self):
+    async def test_preview_deleted_file(self, use_gateway_config, tmp_path):
         """Test preview handles file deleted during request."""
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, dir='.')
-        temp_file.write("content")
-        temp_path = temp_file.name
-        temp_file.close()
+        deleted_file = tmp_path / "deleted.py"
+        deleted_file.write_text("content")
 
         # Delete the file
-        Path(temp_path).unlink()
+        deleted_file.unlink()
 
-        with patch('file_compass.gateway.get_config') as mock_config:
-            mock_config.return_value = FileCompassConfig(directories=['.'])
-            result = await file_preview(temp_path)
+        use_gateway_config(tmp_path)
+        result = await file_preview(str(deleted_file))
 
         assert "error" in result
 
     @pytest.mark.asyncio
-    async def test_search_empty_index_no_crash(self):
+    async def test_search_empty_index_no_crash(self, mock_index_factory):
         """Test search on empty index doesn't crash."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 0}
+            mock_index = mock_index_factory(files_indexed=0)
             mock_get.return_value = mock_index
 
             result = await file_search("test")
@@ -312,8 +314,6 @@ class TestGatewayHandlesMissingFiles:
         assert "error" in result
         assert "No files indexed" in result["error"]
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
     async def test_quick_search_empty_index(self):
         """Test quick search on empty index builds index."""
@@ -347,14 +347,11 @@ class TestGatewayErrorMapping:
     """Test gateway error handling and mapping."""
 
     @pytest.mark.asyncio
-    async def test_internal_error_sanitized(self):
+    async def test_internal_error_sanitized(self, mock_index_factory):
         """Test error responses don't expose internal implementation details."""
         # Test that error messages are user-friendly
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
-            mock_index = MagicMock()
-            mock_index.get_status.return_value = {"files_indexed": 0}  # Empty index
+            mock_index = mock_index_factory(files_indexed=0)  # Empty index
             mock_get.return_value = mock_index
 
             result = await file_search("test")
@@ -363,13 +360,9 @@ class TestGatewayErrorMapping:
         assert "error" in result
         assert "No files indexed" in result["error"]
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
     async def test_scan_error_has_hint(self):
         """Test scan errors include helpful hints."""
-        gateway_module._index = None
-
         with patch('file_compass.gateway.get_index_instance', new_callable=AsyncMock) as mock_get:
             with patch('file_compass.gateway.get_config') as mock_config:
                 mock_index = MagicMock()
@@ -382,14 +375,11 @@ class TestGatewayErrorMapping:
         assert result["success"] is False
         assert "hint" in result
 
-        gateway_module._index = None
-
     @pytest.mark.asyncio
-    async def test_path_traversal_error_no_hint(self):
+    async def test_path_traversal_error_no_hint(self, use_gateway_config):
         """Test path traversal errors don't expose allowed directories."""
-        with patch('file_compass.gateway.get_config') as mock_config:
-            mock_config.return_value = FileCompassConfig(directories=["F:/AI/safe"])
-            result = await file_preview("C:/Windows/System32/config")
+        use_gateway_config("F:/AI/safe")
+        result = await file_preview("C:/Windows/System32/config")
 
         assert "error" in result
         assert "Access denied" in result["error"]
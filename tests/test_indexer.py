@@ -3,7 +3,11 @@ Tests for file_compass.indexer module.
 Uses mocks and temporary directories to avoid external dependencies.
 """
 
+import shutil
+import sqlite3
 import tempfile
+import time
+import types
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
@@ -11,19 +15,20 @@ from unittest.mock import AsyncMock, patch
 import numpy as np
 import pytest
 
+import file_compass.indexer as indexer_module
 from file_compass.indexer import FileIndex, SearchResult, get_index
+from file_compass.merkle import MerkleTree
 from file_compass.scanner import ScannedFile
 
 
 @pytest.fixture
 def temp_index():
     """Create a temporary FileIndex that gets cleaned up properly."""
-    import shutil
-
     tmpdir = tempfile.mkdtemp()
     index_path = Path(tmpdir) / "test.hnsw"
     sqlite_path = Path(tmpdir) / "test.db"
-    index = FileIndex(index_path=index_path, sqlite_path=sqlite_path)
+    merkle_path = Path(tmpdir) / "merkle_state.json"
+    index = FileIndex(index_path=index_path, sqlite_path=sqlite_path, merkle_path=merkle_path)
 
     yield index, tmpdir
 
@@ -32,8 +37,6 @@ def temp_index():
         index._conn.close()
         index._conn = None
     # Give Windows time to release file handles
-    import time
-
     time.sleep(0.1)
     try:
         shutil.rmtree(tmpdir)
@@ -111,6 +114,17 @@ class TestFileIndex:
         assert index.index_path == Path(tmpdir) / "test.hnsw"
         assert index.sqlite_path == Path(tmpdir) / "test.db"
 
+    @pytest.mark.durable_sqlite
+    def test_get_conn_applies_pragmas(self, temp_index):
+        """Test that the connection is opened in WAL mode with tuned page size."""
+        index, _ = temp_index
+
+        conn = index._get_conn()
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
     def test_get_conn_creates_connection(self, temp_index):
         """Test that _get_conn creates a SQLite connection."""
         index, _ = temp_index
@@ -176,6 +190,22 @@ class TestFileIndex:
         }
         assert expected_cols.issubset(columns)
 
+    def test_init_schema_adds_chunk_hash_column(self, temp_index):
+        """Test that databases from before chunk hashes gain the column."""
+        index, _ = temp_index
+        conn = sqlite3.connect(str(index.sqlite_path))
+        conn.execute(
+            "CREATE TABLE chunks (id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL, "
+            "chunk_index INTEGER NOT NULL, embedding_id INTEGER)"
+        )
+        conn.commit()
+        conn.close()
+
+        conn = index._get_conn()
+
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(chunks)")}
+        assert "chunk_hash" in columns
+
     def test_get_index_creates_new_index(self, temp_index):
         """Test that _get_index creates a new HNSW index."""
         index, _ = temp_index
@@ -612,8 +642,6 @@ class TestFileIndexBuild:
         test_file.write_text("def hello():\n    return 'world'")
 
         # Mock scanner to return our test file
-        from file_compass.scanner import ScannedFile
-
         mock_file = ScannedFile(
             path=test_file,
             relative_path="test.py",
@@ -633,13 +661,169 @@ class TestFileIndexBuild:
         assert stats["files_indexed"] == 1
         assert stats["chunks_indexed"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_build_index_adds_embeddings_in_one_call(self, temp_index):
+        """Test the full build hands HNSW every vector in a single add_items call."""
+        index, tmpdir = temp_index
+
+        files = []
+        for i in range(3):
+            path = Path(tmpdir) / f"mod{i}.py"
+            path.write_text(f"def f{i}():\n    return {i}")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=path.name,
+                    file_type="python",
+                    size_bytes=30,
+                    modified_at=datetime.now(),
+                    content_hash=f"hash{i}",
+                )
+            )
+        vectors = np.random.randn(3, 768).astype(np.float32)
+
+        with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = vectors
+                with patch.object(indexer_module.hnswlib.Index, "add_items") as mock_add:
+                    stats = await index.build_index(show_progress=False)
+
+        assert stats["chunks_indexed"] == 3
+        mock_add.assert_called_once()
+        added, ids = mock_add.call_args.args
+        np.testing.assert_array_equal(added, vectors)
+        np.testing.assert_array_equal(ids, np.arange(3))
+
+    @pytest.mark.asyncio
+    async def test_build_index_embeds_in_pipelined_steps(self, temp_index):
+        """Test a build split into several embed steps keeps ids and vectors aligned."""
+        index, tmpdir = temp_index
+
+        files = []
+        for i in range(3):
+            path = Path(tmpdir) / f"mod{i}.py"
+            path.write_text(f"def f{i}():\n    return {i}")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=path.name,
+                    file_type="python",
+                    size_bytes=30,
+                    modified_at=datetime.now(),
+                    content_hash=f"hash{i}",
+                )
+            )
+        calls = []
+
+        async def embed(texts, show_progress=False):
+            calls.append(list(texts))
+            vectors = np.zeros((len(texts), 768), dtype=np.float32)
+            vectors[:, len(calls)] = 1.0
+            return vectors
+
+        with patch.object(indexer_module, "EMBED_PIPELINE_CHUNKS", 1):
+            with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+                with patch.object(index.embedder, "embed_batch", side_effect=embed):
+                    stats = await index.build_index(show_progress=False)
+
+        assert stats["chunks_indexed"] == 3
+        assert [len(texts) for texts in calls] == [1, 1, 1]
+        assert index._index.get_current_count() == 3
+
+        conn = index._get_conn()
+        rows = conn.execute(
+            "SELECT f.relative_path, c.embedding_id FROM chunks c "
+            "JOIN files f ON f.id = c.file_id ORDER BY c.embedding_id"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [("mod0.py", 0), ("mod1.py", 1), ("mod2.py", 2)]
+        stored = np.asarray(index._index.get_items([0, 1, 2]))
+        np.testing.assert_array_equal(stored.argmax(axis=1), [1, 2, 3])
+
+    @pytest.mark.asyncio
+    async def test_builds_accept_scanned_files(self, temp_index):
+        """Test build_index and incremental_update index given files without scanning."""
+        index, tmpdir = temp_index
+
+        files = []
+        for i in range(2):
+            path = Path(tmpdir) / f"mod{i}.py"
+            path.write_text(f"def f{i}():\n    return {i}")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=path.name,
+                    file_type="python",
+                    size_bytes=30,
+                    modified_at=datetime.now(),
+                    content_hash=f"hash{i}",
+                )
+            )
+
+        async def embed(texts, show_progress=False):
+            return np.random.randn(len(texts), 768).astype(np.float32)
+
+        with patch.object(index.scanner, "scan_all", side_effect=AssertionError) as scan:
+            with patch.object(index.embedder, "embed_batch", side_effect=embed):
+                # No Merkle state yet, so this falls back to a full build
+                stats = await index.incremental_update(files=iter(files[:1]), show_progress=False)
+                assert stats["files_indexed"] == 1
+
+                stats = await index.incremental_update(files=files, show_progress=False)
+                assert stats["files_added"] == 1
+
+                stats = await index.build_index(
+                    files=files, show_progress=False, force_rebuild=True
+                )
+                assert stats["files_indexed"] == 2
+
+        scan.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_builds_grow_hnsw_past_max_elements(self, temp_index):
+        """Test full and incremental builds resize HNSW instead of overflowing it."""
+        index, tmpdir = temp_index
+        index.max_elements = 2
+
+        files = []
+        for i in range(5):
+            path = Path(tmpdir) / f"mod{i}.py"
+            path.write_text(f"def f{i}():\n    return {i}")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=path.name,
+                    file_type="python",
+                    size_bytes=30,
+                    modified_at=datetime.now(),
+                    content_hash=f"hash{i}",
+                )
+            )
+
+        async def embed(texts, show_progress=False):
+            return np.random.randn(len(texts), 768).astype(np.float32)
+
+        with patch.object(indexer_module, "EMBED_PIPELINE_CHUNKS", 1):
+            with patch.object(index.scanner, "scan_all", return_value=iter(files[:3])):
+                with patch.object(index.embedder, "embed_batch", side_effect=embed):
+                    stats = await index.build_index(show_progress=False)
+
+        assert stats["chunks_indexed"] == 3
+        assert index._index.get_current_count() == 3
+        assert index._index.get_max_elements() == 4
+
+        with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+            with patch.object(index.embedder, "embed_batch", side_effect=embed):
+                stats = await index.incremental_update(show_progress=False)
+
+        assert stats["files_added"] == 2
+        assert index._index.get_current_count() == 5
+        assert index._index.get_max_elements() >= 5
+
     @pytest.mark.asyncio
     async def test_build_index_handles_chunk_error(self, temp_index):
         """Test that build_index handles chunking errors gracefully."""
         index, _ = temp_index
 
-        from file_compass.scanner import ScannedFile
-
         mock_file = ScannedFile(
             path=Path("/nonexistent/file.py"),
             relative_path="file.py",
@@ -663,14 +847,257 @@ class TestFileIndexBuild:
                     assert stats["files_indexed"] == 1
                     assert stats["chunks_indexed"] == 0
 
+    @pytest.mark.asyncio
+    async def test_chunk_files_preserves_order(self, temp_index):
+        """Test that concurrent chunking returns results in file order."""
+        index, tmpdir = temp_index
+
+        files = []
+        for i in range(50):
+            path = Path(tmpdir) / f"mod_{i}.py"
+            path.write_text(f"def func_{i}():\n    return {i}\n")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=path.name,
+                    file_type="python",
+                    size_bytes=path.stat().st_size,
+                    modified_at=datetime.now(),
+                    content_hash=f"hash{i}",
+                )
+            )
+
+        chunk_file = index.chunker.chunk_file
+
+        def flaky_chunk_file(path):
+            if path.name == "mod_10.py":
+                raise Exception("Chunk error")
+            return chunk_file(path)
+
+        with patch.object(index.chunker, "chunk_file", side_effect=flaky_chunk_file):
+            results = await index._chunk_files(files)
+
+        assert len(results) == len(files)
+        assert results[10] == []
+        for i, chunks in enumerate(results):
+            if i != 10:
+                assert f"def func_{i}()" in chunks[0].content
+
+    @pytest.mark.asyncio
+    async def test_chunk_files_process_pool_matches_threads(self, temp_index):
+        """Test that chunking in worker processes gives the same chunks as threads."""
+        index, tmpdir = temp_index
+        files = []
+        for i in range(6):
+            path = Path(tmpdir) / f"mod_{i}.py"
+            path.write_text(
+                f"import os\n\n\nclass Thing{i}:\n    def run(self):\n        return {i}\n"
+            )
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=path.name,
+                    file_type="python",
+                    size_bytes=path.stat().st_size,
+                    modified_at=datetime.now(),
+                    content_hash=f"hash{i}",
+                )
+            )
+
+        index.chunk_workers = 1
+        threaded = await index._chunk_files(files)
+
+        index.chunk_workers = 2
+        with patch.object(indexer_module, "PROCESS_POOL_MIN_FILES", 1):
+            with patch.object(
+                indexer_module, "ProcessPoolExecutor", wraps=indexer_module.ProcessPoolExecutor
+            ) as pool:
+                pooled = await index._chunk_files(files)
+
+        pool.assert_called_once()
+        assert pooled == threaded
+
+
+class TestInMemoryCache:
+    """Tests for the flat-scan embedding cache used for small corpora."""
+
+    @pytest.mark.asyncio
+    async def test_build_index_writes_cache(self, temp_index):
+        """Test that build_index persists vectors and ids next to the HNSW index."""
+        index, tmpdir = temp_index
+
+        test_file = Path(tmpdir) / "test.py"
+        test_file.write_text("def hello():\n    return 'world'")
+        mock_file = ScannedFile(
+            path=test_file,
+            relative_path="test.py",
+            file_type="python",
+            size_bytes=35,
+            modified_at=datetime.now(),
+            content_hash="test123",
+        )
+
+        with patch.object(index.scanner, "scan_all", return_value=iter([mock_file])):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                emb = np.random.randn(1, 768).astype(np.float32)
+                mock_embed.return_value = emb / np.linalg.norm(emb)
+
+                stats = await index.build_index(show_progress=False)
+
+        assert index.vectors_path.exists()
+        assert index.vector_ids_path.exists()
+        assert np.load(index.vectors_path).shape == (stats["chunks_indexed"], 768)
+
+        # A fresh instance searches via the cache without touching HNSW
+        fresh = FileIndex(index_path=index.index_path, sqlite_path=index.sqlite_path)
+        try:
+            with patch.object(fresh, "_get_index") as mock_hnsw:
+                with patch.object(
+                    fresh.embedder, "embed_query", new_callable=AsyncMock
+                ) as mock_query:
+                    mock_query.return_value = mock_embed.return_value[0]
+                    results = await fresh.search("hello")
+
+                mock_hnsw.assert_not_called()
+            assert len(results) == 1
+            assert results[0].relative_path == "test.py"
+            # int8 cache quantization costs a little precision
+            assert results[0].relevance == pytest.approx(1.0, abs=1e-2)
+        finally:
+            fresh._conn.close()
+
+    @pytest.mark.asyncio
+    async def test_ensure_cache_warm_loads_metadata(self, temp_index):
+        """Test that warming preloads chunk metadata and writes mark it dirty."""
+        index, tmpdir = temp_index
+        index.merkle_path = Path(tmpdir) / "merkle.json"
+
+        test_file = Path(tmpdir) / "test.py"
+        test_file.write_text("def hello():\n    return 'world'")
+        mock_file = ScannedFile(
+            path=test_file,
+            relative_path="test.py",
+            file_type="python",
+            size_bytes=35,
+            modified_at=datetime.now(),
+            content_hash="test123",
+        )
+
+        assert index.ensure_cache_warm() is False  # Nothing indexed yet
+
+        with patch.object(index.scanner, "scan_all", return_value=iter([mock_file])):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
+                await index.build_index(show_progress=False)
+
+        assert index.ensure_cache_warm() is True
+        row = index._chunk_meta[0]
+        assert row["relative_path"] == "test.py"
+        assert row["line_start"] == 1
+
+        with patch.object(index.scanner, "scan_all", return_value=iter([mock_file])):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
+                await index.build_index(show_progress=False, force_rebuild=True)
+
+        assert index._chunk_meta is None
+
+    def test_search_cache_top_k_order(self, temp_index):
+        """Test that the flat scan returns the top-k ids by descending similarity."""
+        index, _ = temp_index
+
+        vectors = np.eye(4, 768, dtype=np.float32)
+        index._save_cache(vectors, np.array([10, 11, 12, 13]))
+
+        query = np.zeros(768, dtype=np.float32)
+        query[2] = 1.0
+        query[0] = 0.5
+        ids, sims = index._search_cache(query, 2)
+
+        assert list(ids) == [12, 10]
+        assert sims[0] > sims[1]
+
+    def test_int8_cache_matches_float32(self, temp_index):
+        """Test that int8 cache similarities track the float32 cosine scan."""
+        index, _ = temp_index
+
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((50, 768)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        query = vectors[7]
+
+        index._save_cache(vectors, np.arange(50))
+        assert index._cache_vectors.dtype == np.int8
+        assert index.vector_scales_path.exists()
+
+        ids, sims = index._search_cache(query, 5)
+
+        assert ids[0] == 7
+        np.testing.assert_allclose(sims, vectors[ids] @ query, atol=1e-2)
+
+    def test_float32_cache_when_int8_disabled(self, temp_index):
+        """Test that disabling int8 keeps full-precision vectors."""
+        index, _ = temp_index
+        index.inmem_cache_int8 = False
+
+        index._save_cache(np.eye(3, 768, dtype=np.float32), np.arange(3))
+
+        assert index._cache_vectors.dtype == np.float32
+        assert not index.vector_scales_path.exists()
+
+    def test_cache_disabled_over_threshold(self, temp_index):
+        """Test that corpora above the threshold fall back to HNSW."""
+        index, _ = temp_index
+        index.inmem_cache_max_chunks = 2
+
+        index._save_cache(np.eye(3, 768, dtype=np.float32), np.arange(3))
+
+        assert not index.vectors_path.exists()
+        assert index._load_cache() is False
+
+    def test_gpu_search_matches_cpu(self, temp_index):
+        """Test that the float16 GPU scan returns the CPU top-k (numpy stands in for CuPy)."""
+        index, _ = temp_index
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((50, 768)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index._save_cache(vectors, np.arange(100, 150))
+        cpu_ids, cpu_sims = index._search_cache(vectors[3], 5)
+
+        fake_cupy = types.SimpleNamespace(
+            asarray=np.asarray,
+            asnumpy=np.asarray,
+            argpartition=np.argpartition,
+            arange=np.arange,
+            float16=np.float16,
+        )
+        index.use_gpu_search = True
+        with patch.object(indexer_module, "cp", fake_cupy, create=True):
+            gpu_ids, gpu_sims = index._search_cache(vectors[3], 5)
+
+        assert gpu_ids[0] == 103
+        assert set(gpu_ids) == set(cpu_ids)
+        np.testing.assert_allclose(gpu_sims, cpu_sims, atol=1e-2)
+        assert index._gpu_vectors.dtype == np.float16
+
+    def test_gpu_search_failure_falls_back_to_cpu(self, temp_index):
+        """Test that a GPU error disables GPU search and uses the CPU scan."""
+        index, _ = temp_index
+        index._save_cache(np.eye(4, 768, dtype=np.float32), np.arange(4))
+        index.use_gpu_search = True
+
+        with patch.object(index, "_search_cache_gpu", side_effect=RuntimeError("no device")):
+            ids, _ = index._search_cache(np.eye(4, 768, dtype=np.float32)[1], 1)
+
+        assert list(ids) == [1]
+        assert index.use_gpu_search is False
+
 
 class TestGetIndex:
     """Tests for module-level get_index function."""
 
     def test_get_index_creates_singleton(self):
         """Test that get_index creates a singleton."""
-        import file_compass.indexer as indexer_module
-
         # Reset singleton
         indexer_module._index = None
 
@@ -684,8 +1111,6 @@ class TestGetIndex:
 
     def test_get_index_returns_file_index(self):
         """Test that get_index returns FileIndex instance."""
-        import file_compass.indexer as indexer_module
-
         indexer_module._index = None
 
         index = get_index()
@@ -847,8 +1272,6 @@ class TestSearchFilters:
         test_file = Path(tmpdir) / "test.py"
         test_file.write_text("def hello():\n    return 'world'")
 
-        from file_compass.scanner import ScannedFile
-
         mock_file = ScannedFile(
             path=test_file,
             relative_path="test.py",
@@ -870,6 +1293,159 @@ class TestSearchFilters:
         assert "Indexing complete" in captured.out or stats["files_indexed"] >= 0
 
 
+def _random_embeddings(texts, **kwargs):
+    """Return one normalized random embedding per text."""
+    emb = np.random.randn(len(texts), 768).astype(np.float32)
+    return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+
+class TestAppendBuild:
+    """Tests for append-only rebuilds of an existing HNSW index."""
+
+    def _scanned(self, path: Path, modified_at: datetime) -> ScannedFile:
+        return ScannedFile(
+            path=path,
+            relative_path=path.name,
+            file_type="python",
+            size_bytes=path.stat().st_size,
+            modified_at=modified_at,
+            content_hash=path.name,
+        )
+
+    async def _build(self, index, files, **kwargs):
+        with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.side_effect = _random_embeddings
+                stats = await index.build_index(show_progress=False, **kwargs)
+        return stats, mock_embed
+
+    @pytest.fixture
+    def corpus(self, temp_index):
+        index, tmpdir = temp_index
+        index.merkle_path = Path(tmpdir) / "merkle.json"
+        paths = []
+        for name in ("a.py", "b.py", "c.py", "d.py", "e.py"):
+            path = Path(tmpdir) / name
+            path.write_text(f"def {name[0]}():\n    return '{name}'\n")
+            paths.append(path)
+        return index, paths
+
+    @pytest.mark.asyncio
+    async def test_only_changed_files_are_embedded(self, corpus):
+        """Test that unchanged files keep their entries and are not re-embedded."""
+        index, paths = corpus
+        index.hnsw_compaction_threshold = 0.5
+        t0 = datetime(2026, 1, 1)
+        await self._build(index, [self._scanned(p, t0) for p in paths])
+        old_ids = dict(index._id_to_chunk)
+
+        # e.py modified, d.py removed, f.py added
+        new_file = paths[0].parent / "f.py"
+        new_file.write_text("def f():\n    return 'f'\n")
+        files = [self._scanned(p, t0) for p in paths[:3]]
+        files += [self._scanned(paths[4], datetime(2026, 1, 2)), self._scanned(new_file, t0)]
+
+        stats, mock_embed = await self._build(index, files)
+
+        embedded = mock_embed.call_args[0][0]
+        assert len(embedded) == 2
+        assert stats["files_added"] == 1
+        assert stats["files_modified"] == 1
+        assert stats["files_removed"] == 1
+        assert stats["chunks_indexed"] == 5
+        assert index._hnsw_deleted == 2
+        assert len(index._id_to_chunk) == 5
+        # New chunks never reuse labels of tombstoned nodes
+        assert min(set(index._id_to_chunk) - set(old_ids)) > max(old_ids)
+
+    @pytest.mark.asyncio
+    async def test_no_changes_skips_embedding(self, corpus):
+        """Test that an unchanged corpus does no embedding work."""
+        index, paths = corpus
+        files = [self._scanned(p, datetime(2026, 1, 1)) for p in paths]
+        await self._build(index, files)
+
+        stats, mock_embed = await self._build(index, files)
+
+        mock_embed.assert_not_called()
+        assert stats["chunks_added"] == 0
+        assert stats["chunks_indexed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_compaction_threshold_triggers_full_rebuild(self, corpus):
+        """Test that too many tombstones fall back to a full rebuild."""
+        index, paths = corpus
+        index.hnsw_compaction_threshold = 0.1
+        await self._build(index, [self._scanned(p, datetime(2026, 1, 1)) for p in paths])
+
+        files = [self._scanned(p, datetime(2026, 1, 1)) for p in paths[:4]]
+        stats, mock_embed = await self._build(index, files)
+
+        assert len(mock_embed.call_args[0][0]) == 4
+        assert "files_removed" not in stats
+        assert index._hnsw_deleted == 0
+        assert index._index.get_current_count() == 4
+
+    @pytest.mark.asyncio
+    async def test_force_rebuild(self, corpus):
+        """Test that force_rebuild re-embeds everything."""
+        index, paths = corpus
+        files = [self._scanned(p, datetime(2026, 1, 1)) for p in paths]
+        await self._build(index, files)
+
+        _, mock_embed = await self._build(index, files, force_rebuild=True)
+
+        assert len(mock_embed.call_args[0][0]) == 5
+
+    @pytest.mark.asyncio
+    async def test_duplicate_chunks_embedded_once(self, corpus):
+        """Test that identical chunk content is embedded once and shared."""
+        index, paths = corpus
+        paths[1].write_text(paths[0].read_text())
+        files = [self._scanned(p, datetime(2026, 1, 1)) for p in paths]
+
+        stats, mock_embed = await self._build(index, files)
+
+        assert len(mock_embed.call_args[0][0]) == 4
+        assert stats["chunks_indexed"] == 5
+        conn = index._get_conn()
+        rows = conn.execute(
+            "SELECT embedding_id FROM chunks WHERE chunk_hash = "
+            "(SELECT chunk_hash FROM chunks GROUP BY chunk_hash HAVING COUNT(*) = 2)"
+        ).fetchall()
+        vectors = index._get_index().get_items([row[0] for row in rows])
+        np.testing.assert_allclose(vectors[0], vectors[1], rtol=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_known_content_reuses_stored_vector(self, corpus):
+        """Test that a new file whose content is already indexed skips Ollama."""
+        index, paths = corpus
+        t0 = datetime(2026, 1, 1)
+        await self._build(index, [self._scanned(p, t0) for p in paths])
+
+        copy = paths[0].parent / "copy.py"
+        copy.write_text(paths[0].read_text())
+        files = [self._scanned(p, t0) for p in paths + [copy]]
+
+        stats, mock_embed = await self._build(index, files)
+
+        mock_embed.assert_not_called()
+        assert stats["chunks_added"] == 1
+        assert len(index._id_to_chunk) == 6
+
+    @pytest.mark.asyncio
+    async def test_dedupe_disabled_embeds_every_chunk(self, corpus):
+        """Test that dedupe_chunk_embeddings=False embeds duplicates separately."""
+        index, paths = corpus
+        index.dedupe_chunk_embeddings = False
+        paths[1].write_text(paths[0].read_text())
+        files = [self._scanned(p, datetime(2026, 1, 1)) for p in paths]
+
+        _, mock_embed = await self._build(index, files)
+
+        assert len(mock_embed.call_args[0][0]) == 5
+
+
 class TestIncrementalUpdate:
     """Tests for incremental index updates using Merkle tree."""
 
@@ -937,6 +1513,90 @@ class TestIncrementalUpdate:
         assert stats["files_removed"] == 0
         assert stats["files_modified"] == 0
 
+    @pytest.mark.asyncio
+    async def test_incremental_update_skips_chunking_unchanged_content(self, temp_index):
+        """Test that files with an unchanged content hash are not re-chunked."""
+        index, tmpdir = temp_index
+
+        files = []
+        for name in ("same.py", "edited.py"):
+            path = Path(tmpdir) / name
+            path.write_text(f"def {name[:-3]}(): pass")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=name,
+                    file_type="python",
+                    size_bytes=20,
+                    modified_at=datetime.now(),
+                    content_hash=f"{name}_v1",
+                )
+            )
+
+        with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.random.randn(2, 768).astype(np.float32)
+                await index.build_index(show_progress=False)
+
+        files[1].path.write_text("def edited(): return 1")
+        files[1].content_hash = "edited.py_v2"
+
+        with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
+                with patch.object(
+                    index.chunker, "chunk_file", wraps=index.chunker.chunk_file
+                ) as mock_chunk:
+                    stats = await index.incremental_update(show_progress=False)
+
+        assert stats["files_modified"] == 1
+        assert [c.args[0] for c in mock_chunk.call_args_list] == [files[1].path]
+
+    @pytest.mark.asyncio
+    async def test_incremental_update_saved_tree_matches_rebuild(self, temp_index):
+        """Test the in-place Merkle update saves the same tree a full build would."""
+        index, tmpdir = temp_index
+
+        files = []
+        for rel in ("keep.py", "pkg/edited.py", "gone/removed.py"):
+            path = Path(tmpdir) / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"def f_{len(files)}(): pass")
+            files.append(
+                ScannedFile(
+                    path=path,
+                    relative_path=rel,
+                    file_type="python",
+                    size_bytes=20,
+                    modified_at=datetime.now(),
+                    content_hash=f"{rel}_v1",
+                )
+            )
+
+        with patch.object(index.scanner, "scan_all", return_value=iter(files)):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.random.randn(3, 768).astype(np.float32)
+                await index.build_index(show_progress=False)
+
+        files[1].path.write_text("def edited(): return 1")
+        files[1].content_hash = "pkg/edited.py_v2"
+        current = files[:2]
+
+        with patch.object(index.scanner, "scan_all", return_value=iter(current)):
+            with patch.object(index.embedder, "embed_batch", new_callable=AsyncMock) as mock_embed:
+                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
+                stats = await index.incremental_update(show_progress=False)
+
+        saved = MerkleTree.load(index.merkle_path)
+        expected = MerkleTree()
+        for sf in current:
+            node = saved.get_file(sf.relative_path)
+            expected.add_file(sf.relative_path, sf.content_hash, node.chunk_hashes)
+
+        assert (stats["files_added"], stats["files_removed"], stats["files_modified"]) == (0, 1, 1)
+        assert saved.get_file("gone/removed.py") is None
+        assert saved.get_root_hash() == expected.get_root_hash()
+
     @pytest.mark.asyncio
     async def test_incremental_update_added_file(self, temp_index):
         """Test incremental update detects added files."""
@@ -1026,6 +1686,51 @@ class TestIncrementalUpdate:
         # Should detect 1 modified file
         assert stats["files_modified"] == 1
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("returning", [True, False])
+    async def test_incremental_update_upserts_modified_file(self, temp_index, returning):
+        """Test a modified file keeps its row id while its metadata and chunks are replaced."""
+        index, tmpdir = temp_index
+
+        test_file = Path(tmpdir) / "test.py"
+        test_file.write_text("def one():\n    return 1")
+        v1 = ScannedFile(
+            path=test_file,
+            relative_path="test.py",
+            file_type="python",
+            size_bytes=25,
+            modified_at=datetime.now(),
+            content_hash="hash_v1",
+        )
+
+        async def embed(texts, show_progress=False):
+            return np.random.randn(len(texts), 768).astype(np.float32)
+
+        with patch.object(indexer_module, "_SQLITE_HAS_RETURNING", returning):
+            with patch.object(index.embedder, "embed_batch", side_effect=embed):
+                await index.build_index(files=[v1], show_progress=False)
+                conn = index._get_conn()
+                file_id = conn.execute("SELECT id FROM files").fetchone()[0]
+
+                test_file.write_text("def one():\n    return 1\n\n\ndef two():\n    return 2")
+                v2 = ScannedFile(
+                    path=test_file,
+                    relative_path="test.py",
+                    file_type="python",
+                    size_bytes=50,
+                    modified_at=datetime.now(),
+                    content_hash="hash_v2",
+                )
+                stats = await index.incremental_update(files=[v2], show_progress=False)
+
+        assert stats["files_modified"] == 1
+        rows = conn.execute("SELECT id, size_bytes, content_hash, total_chunks FROM files")
+        (row,) = [tuple(r) for r in rows]
+        assert row[:3] == (file_id, 50, "hash_v2")
+        chunk_files = {r[0] for r in conn.execute("SELECT file_id FROM chunks")}
+        assert chunk_files == {file_id}
+        assert conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == row[3]
+
     @pytest.mark.asyncio
     async def test_incremental_update_removed_file(self, temp_index):
         """Test incremental update detects removed files."""
@@ -1068,5 +1773,3 @@ class TestIncrementalUpdate:
 
         # Should detect 1 removed file
         assert stats["files_removed"] == 1
-
-
@@ -6,11 +6,13 @@ Tests for Merkle hashing, incremental updates, large file batches, error recover
 import pytest
 import tempfile
 import shutil
+import time
 import sqlite3
 import numpy as np
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import List
 
 from file_compass.indexer import FileIndex, SearchResult
 from file_compass.quick_index import QuickIndex, QuickResult
@@ -18,6 +20,68 @@ from file_compass.scanner import ScannedFile
 from file_compass.merkle import MerkleTree, FileNode
 
 
+@pytest.fixture
+def temp_index(tmp_path):
+    """Create a temporary FileIndex shared by the indexer test classes below.
+
+    pytest owns tmp_path cleanup (and tolerates files Windows still holds
+    open), so teardown only closes the connection; no sleep or rmtree.
+    """
+    index = FileIndex(
+        index_path=tmp_path / "test.hnsw",
+        sqlite_path=tmp_path / "test.db",
+        merkle_path=tmp_path / "merkle_state.json",
+    )
+
+    yield index, str(tmp_path)
+
+    if index._conn:
+        index._conn.close()
+        index._conn = None
+
+
+# Shared embedding rows handed out as views; read-only so no test can
+# mutate the rows another test sees.
+_RAND_EMB = np.random.default_rng(0).standard_normal((1024, 768), dtype=np.float32)
+_RAND_EMB.flags.writeable = False
+
+
+# Plain stubs stand in for the scanner/embedder/chunker; they are assigned
+# straight onto the index, which is far cheaper than patch() + AsyncMock.
+# FileIndex builds take their files directly, so StubScanner only serves
+# the quick index tests.
+
+@dataclass(slots=True)
+class StubScanner:
+    """Scanner yielding a fixed list of files."""
+    files: List[ScannedFile]
+
+    def scan_all(self):
+        return iter(self.files)
+
+
+@dataclass(slots=True)
+class StubEmbedder:
+    """Embedder returning the leading rows of rv, after failing `errors` times."""
+    rv: np.ndarray
+    errors: int = 0
+
+    async def embed_batch(self, texts, **kwargs):
+        if self.errors:
+            self.errors -= 1
+            raise RuntimeError("Temporary error")
+        return self.rv[: len(texts)]
+
+
+@dataclass(slots=True)
+class StubChunker:
+    """Chunker that fails on every file."""
+    error: Exception
+
+    def chunk_file(self, path):
+        raise self.error
+
+
 # =============================================================================
 # Section 1: Indexer Merkle Hashing Tests (8 tests)
 # =============================================================================
@@ -25,26 +89,6 @@ from file_compass.merkle import MerkleTree, FileNode
 class TestIndexerMerkleHashing:
     """Test Merkle tree hashing in indexer."""
 
-    @pytest.fixture
-    def temp_index(self):
-        """Create a temporary FileIndex."""
-        tmpdir = tempfile.mkdtemp()
-        index_path = Path(tmpdir) / "test.hnsw"
-        sqlite_path = Path(tmpdir) / "test.db"
-        index = FileIndex(index_path=index_path, sqlite_path=sqlite_path)
-
-        yield index, tmpdir
-
-        if index._conn:
-            index._conn.close()
-            index._conn = None
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir)
-        except PermissionError:
-            pass
-
     @pytest.mark.asyncio
     async def test_merkle_tree_created_after_build(self, temp_index):
         """Test Merkle tree is created after index build."""
@@ -62,19 +106,15 @@ class TestIndexerMerkleHashing:
         # Create actual file
         (Path(tmpdir) / "test.py").write_text("def test(): pass")
 
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file])):
-            with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                await index.build_index(show_progress=False)
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:1])
+        await index.build_index(files=[mock_file], show_progress=False)
 
         # Verify index was built
         status = index.get_status()
         assert status["files_indexed"] == 1
 
-    def test_merkle_root_changes_with_file_modification(self, temp_index):
+    def test_merkle_root_changes_with_file_modification(self):
         """Test Merkle root hash changes when file is modified."""
-        index, tmpdir = temp_index
-
         # Build initial tree (MerkleTree has no args in __init__)
         tree1 = MerkleTree()
         tree1.add_file("test.py", "hash1", ["chunk1"], datetime.now().timestamp())
@@ -87,10 +127,8 @@ class TestIndexerMerkleHashing:
 
         assert root1 != root2
 
-    def test_merkle_root_same_for_same_content(self, temp_index):
+    def test_merkle_root_same_for_same_content(self):
         """Test Merkle root is same for identical content."""
-        index, tmpdir = temp_index
-
         now = datetime.now().timestamp()
 
         tree1 = MerkleTree()
@@ -105,24 +143,6 @@ class TestIndexerMerkleHashing:
 class TestIndexerIncrementalUpdate:
     """Test incremental index updates."""
 
-    @pytest.fixture
-    def temp_index(self):
-        tmpdir = tempfile.mkdtemp()
-        index_path = Path(tmpdir) / "test.hnsw"
-        sqlite_path = Path(tmpdir) / "test.db"
-        index = FileIndex(index_path=index_path, sqlite_path=sqlite_path)
-
-        yield index, tmpdir
-
-        if index._conn:
-            index._conn.close()
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir)
-        except PermissionError:
-            pass
-
     @pytest.mark.asyncio
     async def test_incremental_detects_new_files(self, temp_index):
         """Test incremental update detects newly added files."""
@@ -142,10 +162,8 @@ class TestIndexerIncrementalUpdate:
         )
 
         # Initial build
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file_a])):
-            with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                await index.build_index(show_progress=False)
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:1])
+        await index.build_index(files=[mock_file_a], show_progress=False)
 
         # Add new file
         (test_dir / "b.py").write_text("b = 2")
@@ -159,10 +177,8 @@ class TestIndexerIncrementalUpdate:
         )
 
         # Incremental update
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file_a, mock_file_b])):
-            with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                stats = await index.incremental_update(show_progress=False)
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:1])
+        stats = await index.incremental_update(files=[mock_file_a, mock_file_b], show_progress=False)
 
         assert stats["files_added"] == 1
 
@@ -195,16 +211,12 @@ class TestIndexerIncrementalUpdate:
         )
 
         # Initial build with both
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file_a, mock_file_b])):
-            with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                mock_embed.return_value = np.random.randn(2, 768).astype(np.float32)
-                await index.build_index(show_progress=False)
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:2])
+        await index.build_index(files=[mock_file_a, mock_file_b], show_progress=False)
 
         # Incremental with only one file (b deleted)
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file_a])):
-            with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                mock_embed.return_value = np.random.randn(0, 768).astype(np.float32)
-                stats = await index.incremental_update(show_progress=False)
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:0])
+        stats = await index.incremental_update(files=[mock_file_a], show_progress=False)
 
         assert stats["files_removed"] == 1
 
@@ -212,24 +224,6 @@ class TestIndexerIncrementalUpdate:
 class TestIndexerLargeFileBatch:
     """Test indexer with large file batches."""
 
-    @pytest.fixture
-    def temp_index(self):
-        tmpdir = tempfile.mkdtemp()
-        index_path = Path(tmpdir) / "test.hnsw"
-        sqlite_path = Path(tmpdir) / "test.db"
-        index = FileIndex(index_path=index_path, sqlite_path=sqlite_path)
-
-        yield index, tmpdir
-
-        if index._conn:
-            index._conn.close()
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir)
-        except PermissionError:
-            pass
-
     @pytest.mark.asyncio
     async def test_index_many_files(self, temp_index):
         """Test indexing many files in batch."""
@@ -251,10 +245,8 @@ class TestIndexerLargeFileBatch:
                 content_hash=f"hash_{i}"
             ))
 
-        with patch.object(index.scanner, 'scan_all', return_value=iter(mock_files)):
-            with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                mock_embed.return_value = np.random.randn(50, 768).astype(np.float32)
-                stats = await index.build_index(show_progress=False)
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:50])
+        stats = await index.build_index(files=mock_files, show_progress=False)
 
         assert stats["files_indexed"] == 50
 
@@ -262,24 +254,6 @@ class TestIndexerLargeFileBatch:
 class TestIndexerErrorRecovery:
     """Test indexer error recovery."""
 
-    @pytest.fixture
-    def temp_index(self):
-        tmpdir = tempfile.mkdtemp()
-        index_path = Path(tmpdir) / "test.hnsw"
-        sqlite_path = Path(tmpdir) / "test.db"
-        index = FileIndex(index_path=index_path, sqlite_path=sqlite_path)
-
-        yield index, tmpdir
-
-        if index._conn:
-            index._conn.close()
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir)
-        except PermissionError:
-            pass
-
     @pytest.mark.asyncio
     async def test_index_recovers_from_embed_error(self, temp_index):
         """Test index continues after embedding error."""
@@ -297,21 +271,12 @@ class TestIndexerErrorRecovery:
             content_hash="hash_good"
         )
 
-        call_count = [0]
-
-        async def flaky_embed(texts, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                raise RuntimeError("Temporary error")
-            return np.random.randn(len(texts), 768).astype(np.float32)
-
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file])):
-            with patch.object(index.embedder, 'embed_batch', side_effect=flaky_embed):
-                # May raise or handle gracefully
-                try:
-                    stats = await index.build_index(show_progress=False)
-                except RuntimeError:
-                    pass  # Expected if no retry logic
+        index.embedder = StubEmbedder(rv=_RAND_EMB[:1], errors=1)
+        # May raise or handle gracefully
+        try:
+            stats = await index.build_index(files=[mock_file], show_progress=False)
+        except RuntimeError:
+            pass  # Expected if no retry logic
 
     @pytest.mark.asyncio
     async def test_index_handles_corrupt_file(self, temp_index):
@@ -327,11 +292,9 @@ class TestIndexerErrorRecovery:
             content_hash="hash_corrupt"
         )
 
-        with patch.object(index.scanner, 'scan_all', return_value=iter([mock_file])):
-            with patch.object(index.chunker, 'chunk_file', side_effect=IOError("Cannot read")):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.array([]).reshape(0, 768)
-                    stats = await index.build_index(show_progress=False)
+        index.chunker = StubChunker(IOError("Cannot read"))
+        index.embedder = StubEmbedder(rv=np.array([]).reshape(0, 768))
+        stats = await index.build_index(files=[mock_file], show_progress=False)
 
         # Should not crash, file recorded but no chunks
         assert stats["files_indexed"] == 1
@@ -381,11 +344,11 @@ class TestQuickIndexSmallRepo:
             )
         ]
 
-        with patch.object(self.index.scanner, 'scan_all', return_value=iter(mock_files)):
-            stats = await self.index.build_quick_index(
-                directories=[str(self.code_dir)],
-                extract_symbols=True
-            )
+        self.index.scanner = StubScanner(mock_files)
+        stats = await self.index.build_quick_index(
+            directories=[str(self.code_dir)],
+            extract_symbols=True
+        )
 
         assert stats["files_indexed"] == 2
         assert stats["symbols_extracted"] > 0
@@ -393,8 +356,6 @@ class TestQuickIndexSmallRepo:
     @pytest.mark.asyncio
     async def test_quick_index_completes_fast(self):
         """Test quick index completes within reasonable time."""
-        import time
-
         (self.code_dir / "test.py").write_text("x = 1")
         mock_file = ScannedFile(
             path=self.code_dir / "test.py",
@@ -405,16 +366,16 @@ class TestQuickIndexSmallRepo:
             content_hash="h1"
         )
 
-        start = time.time()
-        with patch.object(self.index.scanner, 'scan_all', return_value=iter([mock_file])):
-            await self.index.build_quick_index(
-                directories=[str(self.code_dir)],
-                extract_symbols=False
-            )
-        duration = time.time() - start
+        start = time.perf_counter_ns()
+        self.index.scanner = StubScanner([mock_file])
+        await self.index.build_quick_index(
+            directories=[str(self.code_dir)],
+            extract_symbols=False
+        )
+        duration_ns = time.perf_counter_ns() - start
 
         # Should complete quickly (under 5 seconds for small repo)
-        assert duration < 5.0
+        assert duration_ns < 5_000_000_000
 
 
 class TestQuickIndexRespectsLimits:
@@ -439,7 +400,7 @@ class TestQuickIndexRespectsLimits:
                 INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at)
                 VALUES (?, ?, ?, ?, ?)
             """, (f"/test/file_{i}.py", f"file_{i}.py", "python",
-                  datetime.now().isoformat(), datetime.now().isoformat()))
+                  int(datetime.now().timestamp()), int(datetime.now().timestamp())))
         conn.commit()
 
         results = self.index.search("file", top_k=5)
@@ -454,12 +415,12 @@ class TestQuickIndexRespectsLimits:
             INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at)
             VALUES (?, ?, ?, ?, ?)
         """, ("/test/app.py", "app.py", "python",
-              datetime.now().isoformat(), datetime.now().isoformat()))
+              int(datetime.now().timestamp()), int(datetime.now().timestamp())))
         conn.execute("""
             INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at)
             VALUES (?, ?, ?, ?, ?)
         """, ("/test/app.js", "app.js", "javascript",
-              datetime.now().isoformat(), datetime.now().isoformat()))
+              int(datetime.now().timestamp()), int(datetime.now().timestamp())))
         conn.commit()
 
         results = self.index.search("app", file_types=["python"])
@@ -495,11 +456,11 @@ class TestQuickIndexOutputsSummary:
             content_hash="h1"
         )
 
-        with patch.object(self.index.scanner, 'scan_all', return_value=iter([mock_file])):
-            stats = await self.index.build_quick_index(
-                directories=[str(self.code_dir)],
-                extract_symbols=True
-            )
+        self.index.scanner = StubScanner([mock_file])
+        stats = await self.index.build_quick_index(
+            directories=[str(self.code_dir)],
+            extract_symbols=True
+        )
 
         assert "files_indexed" in stats
         assert "symbols_extracted" in stats
@@ -514,7 +475,7 @@ class TestQuickIndexOutputsSummary:
             INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at)
             VALUES (?, ?, ?, ?, ?)
         """, ("/test/file.py", "file.py", "python",
-              datetime.now().isoformat(), datetime.now().isoformat()))
+              int(datetime.now().timestamp()), int(datetime.now().timestamp())))
         conn.execute("""
             INSERT INTO symbols (file_id, name, symbol_type, line_number)
             VALUES (?, ?, ?, ?)
@@ -598,14 +559,14 @@ class TestQuickIndexRecentDays:
         conn = self.index._get_conn()
 
         # Recent file
-        recent_time = datetime.now().isoformat()
+        recent_time = int(datetime.now().timestamp())
         conn.execute("""
             INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at)
             VALUES (?, ?, ?, ?, ?)
         """, ("/test/recent.py", "recent.py", "python", recent_time, recent_time))
 
         # Old file (30 days ago)
-        old_time = (datetime.now() - timedelta(days=30)).isoformat()
+        old_time = int((datetime.now() - timedelta(days=30)).timestamp())
         conn.execute("""
             INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at)
             VALUES (?, ?, ?, ?, ?)
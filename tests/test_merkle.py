@@ -2,9 +2,13 @@
 Tests for file_compass.merkle module.
 """
 
+import hashlib
 import tempfile
+import types
 from pathlib import Path
+from unittest.mock import patch
 
+from file_compass import merkle as merkle_module
 from file_compass.merkle import (
     DirectoryNode,
     FileNode,
@@ -41,6 +45,16 @@ class TestFileNode:
         # Different chunks should produce different combined hash
         assert node1.combined_hash != node2.combined_hash
 
+    def test_file_node_combined_hash_cached(self):
+        """Test the combined hash is computed once per node."""
+        node = FileNode(path="test.py", content_hash="abc", chunk_hashes=["h1", "h2"])
+        first = node.combined_hash
+
+        with patch.object(merkle_module.hashlib, "sha256") as mock_sha:
+            assert node.combined_hash == first
+        mock_sha.assert_not_called()
+        assert node == FileNode(path="test.py", content_hash="abc", chunk_hashes=["h1", "h2"])
+
     def test_file_node_combined_hash_deterministic(self):
         """Test combined hash is deterministic."""
         node1 = FileNode(path="test.py", content_hash="abc", chunk_hashes=["b", "a"])
@@ -146,6 +160,49 @@ class TestMerkleTree:
         result = tree.remove_file("nonexistent.py")
         assert result is False
 
+    def test_remove_file_prunes_empty_directories(self):
+        """Test removing the last file of a directory drops the directory too."""
+        tree = MerkleTree()
+        tree.add_file("src/deep/only.py", "hash1")
+        tree.add_file("src/keep.py", "hash2")
+
+        tree.remove_file("src/deep/only.py")
+
+        fresh = MerkleTree()
+        fresh.add_file("src/keep.py", "hash2")
+        assert "deep" not in tree.root.subdirs["src"].subdirs
+        assert tree.get_root_hash() == fresh.get_root_hash()
+
+    def test_update_leaf_reports_changes(self):
+        """Test update_leaf only invalidates hashes when the leaf hash changes."""
+        tree = MerkleTree()
+        assert tree.update_leaf("src/a.py", "hash1", ["c1", "c2"], 1.0) is True
+        tree.add_file("other/b.py", "hash2")
+        root_hash = tree.get_root_hash()
+
+        # Chunk order and timestamp are not part of the hash
+        assert tree.update_leaf("src/a.py", "hash1", ["c2", "c1"], 2.0) is False
+        assert tree.root._cached_hash == root_hash
+        assert tree.get_file("src/a.py").modified_at == 2.0
+
+        assert tree.update_leaf("src/a.py", "hash1", ["c1", "c3"]) is True
+        assert tree.root.subdirs["src"]._cached_hash is None
+        assert tree.root.subdirs["other"]._cached_hash is not None
+        assert tree.get_root_hash() != root_hash
+
+    def test_remove_missing(self):
+        """Test remove_missing drops files absent from the current scan."""
+        tree = MerkleTree()
+        tree.add_file("src/a.py", "hash1")
+        tree.add_file("src/b.py", "hash2")
+        tree.add_file("docs/c.md", "hash3")
+
+        removed = tree.remove_missing({"src\\a.py", "src/b.py"})
+
+        assert removed == {"docs/c.md"}
+        assert tree.get_file("docs/c.md") is None
+        assert "docs" not in tree.root.subdirs
+
     def test_root_hash_changes_with_content(self):
         """Test root hash changes when content changes."""
         tree = MerkleTree()
@@ -274,6 +331,27 @@ class TestMerkleTree:
         finally:
             temp_path.unlink()
 
+    def test_serialization_roundtrip_json_fallback_utf8(self, tmp_path):
+        """Test the stdlib json path round-trips non-ASCII paths as UTF-8."""
+        tree1 = MerkleTree()
+        tree1.add_file("docs/überblick.md", "hash1", chunk_hashes=["c1"])
+        path = tmp_path / "state.json"
+
+        with patch.object(merkle_module, "ORJSON_AVAILABLE", False):
+            tree1.save(path)
+            tree2 = MerkleTree.load(path)
+
+        assert tree2 is not None
+        assert tree2.get_root_hash() == tree1.get_root_hash()
+        assert tree2.get_file("docs/überblick.md") is not None
+
+    def test_load_malformed_file(self, tmp_path):
+        """Test loading a truncated state file returns None."""
+        path = tmp_path / "state.json"
+        path.write_text('{"path": ""')
+
+        assert MerkleTree.load(path) is None
+
     def test_load_nonexistent_file(self):
         """Test loading from non-existent file."""
         tree = MerkleTree.load(Path("/nonexistent/file.json"))
@@ -331,6 +409,20 @@ class TestHelperFunctions:
         finally:
             temp_path.unlink()
 
+    def test_compute_file_hash_streams_large_file(self, tmp_path):
+        """Test file_digest and the block-read fallback both match a plain SHA-256."""
+        path = tmp_path / "big.bin"
+        content = bytes(range(256)) * 20000  # Several fallback blocks
+        path.write_bytes(content)
+        expected = hashlib.sha256(content).hexdigest()[:16]
+
+        assert compute_file_hash(path) == expected
+        with (
+            patch.object(merkle_module, "hashlib", types.SimpleNamespace(sha256=hashlib.sha256)),
+            patch.object(merkle_module, "FILE_HASH_BLOCK_SIZE", 4096),
+        ):
+            assert compute_file_hash(path) == expected
+
     def test_compute_file_hash_nonexistent(self):
         """Test file hash for non-existent file."""
         hash_result = compute_file_hash(Path("/nonexistent/file.txt"))
@@ -381,6 +473,29 @@ class TestComplexScenarios:
         assert "src/main.py" in modified
         assert "src/utils.py" not in modified  # Unchanged
 
+    def test_in_place_update_matches_fresh_build(self):
+        """Test updating a saved tree leaf by leaf ends at the same root hash as a rebuild."""
+        old_tree = MerkleTree()
+        old_tree.add_file("src/main.py", "hash1", chunk_hashes=["c1", "c2"])
+        old_tree.add_file("src/utils.py", "hash2", chunk_hashes=["c3"])
+        old_tree.add_file("tests/test_main.py", "hash3")
+        tree = MerkleTree.from_dict(old_tree.to_dict())
+
+        current = [
+            ("src/main.py", "hash1_new", ["c1", "c2_modified"]),
+            ("src/utils.py", "hash2", ["c3"]),
+            ("src/helpers.py", "hash4", []),
+        ]
+        changed = {path for path, h, chunks in current if tree.update_leaf(path, h, chunks)}
+        removed = tree.remove_missing({path for path, _, _ in current})
+
+        fresh = MerkleTree()
+        for path, h, chunks in current:
+            fresh.add_file(path, h, chunks)
+        assert changed == {"src/main.py", "src/helpers.py"}
+        assert removed == {"tests/test_main.py"}
+        assert tree.get_root_hash() == fresh.get_root_hash()
+
     def test_unchanged_subdirectory_not_traversed(self):
         """Test Merkle property: unchanged subtrees have same hash."""
         tree1 = MerkleTree()
@@ -2,32 +2,27 @@
 Tests for file_compass.quick_index module.
 """
 
+import shutil
+import sqlite3
 import tempfile
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import List
 from unittest.mock import patch
 
 import pytest
+import pytest_asyncio
 
+import file_compass.quick_index as quick_index_module
 from file_compass.quick_index import QuickIndex, QuickResult
 from file_compass.scanner import ScannedFile
 
 
-class TestQuickIndex:
-    """Tests for QuickIndex class."""
-
-    def setup_method(self):
-        """Create a temporary directory and index for tests."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.db_path = Path(self.temp_dir) / "test_quick.db"
-        self.index = QuickIndex(db_path=self.db_path)
-
-        # Create some test files
-        self.test_files_dir = Path(self.temp_dir) / "code"
-        self.test_files_dir.mkdir()
-
-        # Python file with functions
-        (self.test_files_dir / "utils.py").write_text("""
+def _write_corpus(code_dir: Path) -> List[ScannedFile]:
+    """Write the sample sources into code_dir and return their scanned files."""
+    # Python file with functions
+    (code_dir / "utils.py").write_text("""
 def calculate_total(items):
     return sum(items)
 
@@ -39,8 +34,8 @@ class DataProcessor:
         pass
 """)
 
-        # JavaScript file
-        (self.test_files_dir / "helpers.js").write_text("""
+    # JavaScript file
+    (code_dir / "helpers.js").write_text("""
 function formatDate(date) {
     return date.toISOString();
 }
@@ -54,47 +49,82 @@ class Helper {
 }
 """)
 
-        # Config file
-        (self.test_files_dir / "config.json").write_text('{"debug": true}')
-
-        # Create mock scanned files
-        self.mock_scanned_files = [
-            ScannedFile(
-                path=self.test_files_dir / "utils.py",
-                relative_path="utils.py",
-                file_type="python",
-                size_bytes=200,
-                modified_at=datetime.now(),
-                content_hash="abc123",
-                git_repo=None,
-                is_git_tracked=False,
-            ),
-            ScannedFile(
-                path=self.test_files_dir / "helpers.js",
-                relative_path="helpers.js",
-                file_type="javascript",
-                size_bytes=300,
-                modified_at=datetime.now(),
-                content_hash="def456",
-                git_repo=None,
-                is_git_tracked=False,
-            ),
-            ScannedFile(
-                path=self.test_files_dir / "config.json",
-                relative_path="config.json",
-                file_type="json",
-                size_bytes=20,
-                modified_at=datetime.now(),
-                content_hash="ghi789",
-                git_repo=None,
-                is_git_tracked=False,
-            ),
-        ]
+    # Config file
+    (code_dir / "config.json").write_text('{"debug": true}')
+
+    # Mock scanned files
+    return [
+        ScannedFile(
+            path=code_dir / "utils.py",
+            relative_path="utils.py",
+            file_type="python",
+            size_bytes=200,
+            modified_at=datetime.now(),
+            content_hash="abc123",
+            git_repo=None,
+            is_git_tracked=False,
+        ),
+        ScannedFile(
+            path=code_dir / "helpers.js",
+            relative_path="helpers.js",
+            file_type="javascript",
+            size_bytes=300,
+            modified_at=datetime.now(),
+            content_hash="def456",
+            git_repo=None,
+            is_git_tracked=False,
+        ),
+        ScannedFile(
+            path=code_dir / "config.json",
+            relative_path="config.json",
+            file_type="json",
+            size_bytes=20,
+            modified_at=datetime.now(),
+            content_hash="ghi789",
+            git_repo=None,
+            is_git_tracked=False,
+        ),
+    ]
+
+
+@pytest_asyncio.fixture(scope="session")
+async def prebuilt_quick_db(tmp_path_factory):
+    """Quick index database built once over the sample corpus."""
+    temp_dir = tmp_path_factory.mktemp("prebuilt_quick")
+    code_dir = temp_dir / "code"
+    code_dir.mkdir()
+    scanned_files = _write_corpus(code_dir)
+
+    index = QuickIndex(db_path=temp_dir / "quick.db")
+    with patch.object(index.scanner, "scan_all", lambda: iter(scanned_files)):
+        await index.build_quick_index()
+    index.close()  # Checkpoints the WAL into quick.db
+    return temp_dir / "quick.db"
+
+
+class TestQuickIndex:
+    """Tests for QuickIndex class."""
+
+    def setup_method(self):
+        """Create a temporary directory and index for tests."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "test_quick.db"
+        self.index = QuickIndex(db_path=self.db_path)
+
+        # Create some test files
+        self.test_files_dir = Path(self.temp_dir) / "code"
+        self.test_files_dir.mkdir()
+        self.mock_scanned_files = _write_corpus(self.test_files_dir)
+
+    @pytest.fixture
+    def built(self, prebuilt_quick_db):
+        """Point self.index at a private copy of the prebuilt sample index."""
+        self.index.close()
+        shutil.copyfile(prebuilt_quick_db, self.db_path)
+        self.index = QuickIndex(db_path=self.db_path)
 
     def teardown_method(self):
         """Clean up test files."""
-        import shutil
-
         self.index.close()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
@@ -116,22 +146,217 @@ class Helper {
         assert stats["duration_seconds"] >= 0
 
     @pytest.mark.asyncio
-    async def test_search_by_filename(self):
-        """Test searching by filename."""
+    async def test_build_flushes_in_batches(self):
+        """Test symbols stay attached to their files across several insert batches."""
+        with (
+            patch.object(self.index.scanner, "scan_all", self._mock_scan_all),
+            patch.object(quick_index_module, "QUICK_INSERT_BATCH_SIZE", 2),
+        ):
+            stats = await self.index.build_quick_index()
+
+        conn = self.index._get_conn()
+        rows = conn.execute(
+            "SELECT f.relative_path, s.name FROM symbols s JOIN files f ON s.file_id = f.id"
+        ).fetchall()
+        by_file = {}
+        for row in rows:
+            by_file.setdefault(row["relative_path"], set()).add(row["name"])
+
+        assert stats["symbols_extracted"] == len(rows)
+        assert {"calculate_total", "DataProcessor"} <= by_file["utils.py"]
+        assert {"formatDate", "Helper"} <= by_file["helpers.js"]
+
+    @pytest.mark.asyncio
+    async def test_failed_rebuild_keeps_previous_index(self):
+        """Test a rebuild that fails midway rolls back to the old contents."""
         with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
+            await self.index.build_quick_index()
+
+        def failing_scan():
+            yield self.mock_scanned_files[0]
+            raise OSError("disk went away")
+
+        with patch.object(self.index.scanner, "scan_all", failing_scan):
+            with pytest.raises(OSError):
+                await self.index.build_quick_index()
+
+        assert self.index.get_status()["files_indexed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rebuild_only_reextracts_changed_files(self):
+        """Test a rebuild keeps unchanged files and re-reads only new and changed ones."""
+        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
+            await self.index.build_quick_index()
+        conn = self.index._get_conn()
+        utils_id = conn.execute("SELECT id FROM files WHERE relative_path = 'utils.py'").fetchone()[
+            0
+        ]
+
+        (self.test_files_dir / "helpers.js").write_text("function renamedHelper() {}\n")
+        (self.test_files_dir / "extra.py").write_text("def added_later():\n    pass\n")
+        utils, helpers, _ = self.mock_scanned_files
+        rescanned = [
+            utils,
+            replace(helpers, content_hash="def457"),
+            replace(utils, path=self.test_files_dir / "extra.py", relative_path="extra.py"),
+        ]
+
+        extracted = []
+        iter_symbols = self.index._iter_symbols
+
+        def spy_iter_symbols(paths, workers):
+            extracted.extend(paths)
+            return iter_symbols(paths, workers)
+
+        with (
+            patch.object(self.index.scanner, "scan_all", lambda: iter(rescanned)),
+            patch.object(self.index, "_iter_symbols", spy_iter_symbols),
+        ):
+            stats = await self.index.build_quick_index()
+
+        assert extracted == [helpers.path, self.test_files_dir / "extra.py"]
+        assert stats["files_indexed"] == 3
+        assert stats["files_unchanged"] == 1
+        assert (
+            conn.execute("SELECT id FROM files WHERE relative_path = 'utils.py'").fetchone()[0]
+            == utils_id
+        )
+
+        # The rebuilt index answers like a fresh build over the same files
+        assert self.index.search("config") == []
+        assert [r.match_text for r in self.index.search("renamedHelper")] == [
+            "function renamedHelper"
+        ]
+        assert [r.relative_path for r in self.index.search("added_later")] == ["extra.py"]
+        assert self.index.search("formatDate") == []
+        assert [r.relative_path for r in self.index.search("calculate")] == ["utils.py"]
+        assert {row[0] for row in conn.execute("SELECT path FROM files_meta")} == {
+            str(f.path) for f in rescanned
+        }
 
+    @pytest.mark.asyncio
+    async def test_force_rebuild_reextracts_everything(self):
+        """Test force_rebuild and symbol-less builds ignore the stored file metadata."""
+        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
+            first = await self.index.build_quick_index()
+            forced = await self.index.build_quick_index(force_rebuild=True)
+            assert forced["files_unchanged"] == 0
+            assert forced["symbols_extracted"] == first["symbols_extracted"]
+            assert [r.relative_path for r in self.index.search("helpers")] == ["helpers.js"]
+
+            await self.index.build_quick_index(extract_symbols=False)
+            status = self.index.get_status()
+            assert status["symbols_indexed"] == 0
+
+            rebuilt = await self.index.build_quick_index()
+            assert rebuilt["files_unchanged"] == 0
+            assert rebuilt["symbols_extracted"] == first["symbols_extracted"]
+
+    @pytest.mark.usefixtures("built")
+    def test_trigram_search_matches_like_scan(self):
+        """Test the FTS5 path search returns what the plain LIKE scan does."""
+        conn = self.index._get_conn()
+        assert self.index._fts_enabled
+        assert conn.execute("SELECT enabled FROM fts_sync").fetchone()[0] == 1
+
+        for query in ("utils", "ELPER", ".js", "s", "config.json helpers"):
+            fts_results = self.index.search(query, include_symbols=False)
+            self.index._fts_enabled = False
+            like_results = self.index.search(query, include_symbols=False)
+            self.index._fts_enabled = True
+            assert fts_results == like_results
+
+    def test_iter_symbols_process_pool_matches_in_process(self):
+        """Test symbols extracted in a process pool match in-process extraction, in order."""
+        paths = [f.path for f in self.mock_scanned_files] * 3
+        in_process = list(self.index._iter_symbols(paths, workers=1))
+
+        with patch.object(quick_index_module, "SYMBOL_POOL_MIN_FILES", 1):
+            with patch.object(
+                quick_index_module,
+                "ProcessPoolExecutor",
+                wraps=quick_index_module.ProcessPoolExecutor,
+            ) as pool:
+                pooled = list(self.index._iter_symbols(paths, workers=2))
+
+        pool.assert_called_once()
+        assert pooled == in_process
+        assert in_process[0] == self.index._extract_symbols_fast(paths[0])
+
+    def test_iter_symbols_falls_back_when_pool_breaks(self):
+        """Test a broken process pool falls back to in-process extraction."""
+        paths = [f.path for f in self.mock_scanned_files]
+
+        with patch.object(quick_index_module, "SYMBOL_POOL_MIN_FILES", 1):
+            with patch.object(
+                quick_index_module,
+                "ProcessPoolExecutor",
+                side_effect=quick_index_module.BrokenProcessPool("worker died"),
+            ):
+                symbols = list(self.index._iter_symbols(paths, workers=2))
+
+        assert symbols == list(self.index._iter_symbols(paths, workers=1))
+
+    @pytest.mark.usefixtures("built")
+    def test_search_sql_reused_per_query_shape(self):
+        """Test search builds each SQL shape once and reuses it across calls."""
+        first = self.index.search("utils", file_types=["python"], recent_days=7)
+        stmts = dict(self.index._search_stmts)
+        assert set(stmts) == {(False, 1, True, True), (True, 1, True, True)}
+
+        second = self.index.search("helpers main", file_types=["javascript"], recent_days=3)
+        assert self.index._search_stmts == stmts
+        assert all(self.index._search_stmts[k] is stmts[k] for k in stmts)
+        assert first and all(r.file_type == "python" for r in first)
+        assert second and all(r.file_type == "javascript" for r in second)
+
+    @pytest.mark.usefixtures("built")
+    def test_search_results_cached_until_database_changes(self):
+        """Test repeated searches skip SQLite until a write, by any connection, lands."""
+        conn = self.index._get_conn()
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        first = self.index.search("utils")
+        queried = len(statements)
+        assert self.index.search("utils") == first
+        assert len(statements) == queried + 1  # Only the data_version check
+
+        other = sqlite3.connect(str(self.db_path))
+        other.execute("DELETE FROM files WHERE relative_path = 'utils.py'")
+        other.commit()
+        other.close()
+        assert self.index.search("utils") == []
+
+    @pytest.mark.usefixtures("built")
+    def test_search_cache_evicts_and_expires(self):
+        """Test the result cache drops its least recent entry and expired results."""
+        with patch.object(quick_index_module, "SEARCH_CACHE_SIZE", 2):
+            for query in ("utils", "helpers", "config"):
+                self.index.search(query)
+            self.index.search("helpers")
+        assert [key[0] for key in self.index._result_cache] == ["config", "helpers"]
+
+        with patch.object(quick_index_module, "SEARCH_CACHE_TTL_SECONDS", 0.0):
+            self.index.search("utils")
+        stale = self.index._result_cache[next(reversed(self.index._result_cache))]
+        self.index.search("utils")
+        assert self.index._result_cache[next(reversed(self.index._result_cache))] is not stale
+
+        self.index.close()
+        assert not self.index._result_cache
+
+    @pytest.mark.usefixtures("built")
+    def test_search_by_filename(self):
+        """Test searching by filename."""
         results = self.index.search("utils")
 
         assert len(results) > 0
         assert any("utils" in r.relative_path.lower() for r in results)
 
-    @pytest.mark.asyncio
-    async def test_search_by_symbol(self):
+    @pytest.mark.usefixtures("built")
+    def test_search_by_symbol(self):
         """Test searching by function/class name."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         results = self.index.search("calculate")
 
         assert len(results) > 0
@@ -139,23 +364,17 @@ class Helper {
         assert len(symbol_matches) > 0
         assert any("calculate" in r.match_text.lower() for r in symbol_matches)
 
-    @pytest.mark.asyncio
-    async def test_search_class(self):
+    @pytest.mark.usefixtures("built")
+    def test_search_class(self):
         """Test searching for class names."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         results = self.index.search("DataProcessor")
 
         assert len(results) > 0
         assert any("DataProcessor" in r.match_text for r in results)
 
-    @pytest.mark.asyncio
-    async def test_search_with_file_type_filter(self):
+    @pytest.mark.usefixtures("built")
+    def test_search_with_file_type_filter(self):
         """Test filtering by file type."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         # Search only Python files
         results = self.index.search("format", file_types=["python"])
 
@@ -163,12 +382,9 @@ class Helper {
         for r in results:
             assert r.file_type == "python"
 
-    @pytest.mark.asyncio
-    async def test_search_line_numbers(self):
+    @pytest.mark.usefixtures("built")
+    def test_search_line_numbers(self):
         """Test that symbol search returns line numbers."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         results = self.index.search("calculate_total")
 
         symbol_results = [r for r in results if r.match_type == "symbol"]
@@ -176,12 +392,9 @@ class Helper {
         # Should have line number
         assert any(r.line_number is not None for r in symbol_results)
 
-    @pytest.mark.asyncio
-    async def test_get_status(self):
+    @pytest.mark.usefixtures("built")
+    def test_get_status(self):
         """Test getting index status."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         status = self.index.get_status()
 
         assert "files_indexed" in status
@@ -202,6 +415,28 @@ class Helper {
         assert "function" in types
         assert "class" in types
 
+    def test_extract_symbols_line_numbers_and_scan_limit(self):
+        """Test line numbers survive blank lines and CRLF, and only the head is scanned."""
+        path = self.test_files_dir / "spaced.py"
+        body = "\r\n\r\n    \r\ndef first():\r\n    pass\r\n\r\nclass Second:\r\n"
+        body += "x = 1\r\n" * 300 + "def too_late():\r\n"
+        path.write_bytes(body.encode())
+
+        symbols = self.index._extract_symbols_fast(path)
+
+        assert symbols == [("first", "function", 4), ("Second", "class", 7)]
+
+    def test_extract_symbols_first_and_adjacent_lines(self):
+        """Test symbols on line 1 and back-to-back lines; mid-line keywords don't match."""
+        path = self.test_files_dir / "adjacent.py"
+        path.write_text(
+            "def one(): pass\ndef two(): pass\nx = 1; def nope(): pass\nclass Three: pass"
+        )
+
+        symbols = self.index._extract_symbols_fast(path)
+
+        assert symbols == [("one", "function", 1), ("two", "function", 2), ("Three", "class", 4)]
+
     def test_extract_symbols_javascript(self):
         """Test JavaScript symbol extraction."""
         symbols = self.index._extract_symbols_fast(self.test_files_dir / "helpers.js")
@@ -212,12 +447,9 @@ class Helper {
         assert "parseJSON" in names
         assert "Helper" in names
 
-    @pytest.mark.asyncio
-    async def test_search_deduplicates(self):
+    @pytest.mark.usefixtures("built")
+    def test_search_deduplicates(self):
         """Test that search results are deduplicated."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         results = self.index.search("format")
 
         # Check for duplicates
@@ -227,12 +459,9 @@ class Helper {
             assert key not in seen, f"Duplicate result: {key}"
             seen.add(key)
 
-    @pytest.mark.asyncio
-    async def test_search_scoring(self):
+    @pytest.mark.usefixtures("built")
+    def test_search_scoring(self):
         """Test that exact matches score higher."""
-        with patch.object(self.index.scanner, "scan_all", self._mock_scan_all):
-            await self.index.build_quick_index(directories=[str(self.test_files_dir)])
-
         results = self.index.search("utils")
 
         # Results should be sorted by score (highest first)
@@ -267,8 +496,6 @@ class TestQuickIndexEdgeCases:
         self.index = QuickIndex(db_path=self.db_path)
 
     def teardown_method(self):
-        import shutil
-
         self.index.close()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
@@ -290,8 +517,8 @@ class TestQuickIndexEdgeCases:
                 "/test/foo.py",
                 "foo.py",
                 "python",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.commit()
@@ -325,8 +552,8 @@ class TestQuickIndexEdgeCases:
                 "/test/foo.py",
                 "foo.py",
                 "python",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.commit()
@@ -351,8 +578,8 @@ class TestQuickIndexEdgeCases:
                 "/test/recent.py",
                 "recent.py",
                 "python",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.commit()
@@ -419,8 +646,8 @@ func (c *Config) GetName() string {
                 "/test/app.py",
                 "app.py",
                 "python",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.execute(
@@ -432,8 +659,8 @@ func (c *Config) GetName() string {
                 "/test/app.js",
                 "app.js",
                 "javascript",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.execute(
@@ -445,8 +672,8 @@ func (c *Config) GetName() string {
                 "/test/app.rs",
                 "app.rs",
                 "rust",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.commit()
@@ -458,6 +685,128 @@ func (c *Config) GetName() string {
         assert "rust" not in file_types_found
         assert len(results) >= 2
 
+    @pytest.mark.durable_sqlite
+    def test_get_conn_applies_pragmas(self):
+        """Test the quick index connection runs in WAL mode with relaxed syncs."""
+        conn = self.index._get_conn()
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_insert_symbols_multi_row_and_remainder(self):
+        """Test full multi-row groups and the leftover rows are all inserted in order."""
+        count = quick_index_module.SYMBOL_INSERT_ROWS * 2 + 3
+        rows = [(1, f"sym{i}", "function", i) for i in range(count)]
+        conn = self.index._get_conn()
+
+        quick_index_module._insert_symbols(conn, rows)
+
+        stored = conn.execute(
+            "SELECT file_id, name, symbol_type, line_number FROM symbols ORDER BY id"
+        ).fetchall()
+        assert [tuple(row) for row in stored] == rows
+
+    def test_schema_has_filter_indexes(self):
+        """Test the file type / mtime composite index is created."""
+        conn = self.index._get_conn()
+
+        columns = [row["name"] for row in conn.execute("PRAGMA index_info(idx_files_type_mtime)")]
+        assert columns == ["file_type", "modified_at"]
+
+    def test_fts_tracks_direct_writes(self):
+        """Test single-row inserts, renames and deletes reach the trigram index."""
+        conn = self.index._get_conn()
+        now = int(datetime.now().timestamp())
+        conn.execute(
+            "INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ("/test/alpha.py", "alpha.py", "python", now, now),
+        )
+        conn.commit()
+        assert [r.relative_path for r in self.index.search("alph")] == ["alpha.py"]
+
+        conn.execute("UPDATE files SET relative_path = 'omega.py' WHERE path = '/test/alpha.py'")
+        conn.commit()
+        assert self.index.search("alph") == []
+        assert [r.relative_path for r in self.index.search("omeg")] == ["omega.py"]
+
+        conn.execute("DELETE FROM files")
+        conn.commit()
+        assert self.index.search("omeg") == []
+
+    def test_fts_indexes_existing_database(self):
+        """Test a database created before the FTS table is backfilled on open."""
+        db_path = Path(self.temp_dir) / "old_quick.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE files (id INTEGER PRIMARY KEY AUTOINCREMENT, path TEXT UNIQUE NOT NULL, "
+            "relative_path TEXT NOT NULL, file_type TEXT NOT NULL, size_bytes INTEGER, "
+            "modified_at TEXT, indexed_at TEXT)"
+        )
+        now = datetime.now().isoformat()
+        conn.execute(
+            "INSERT INTO files (path, relative_path, file_type, modified_at, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ("/old/legacy_module.py", "legacy_module.py", "python", now, now),
+        )
+        conn.commit()
+        conn.close()
+
+        index = QuickIndex(db_path=db_path)
+        try:
+            results = index.search("legacy")
+            assert index._fts_enabled
+            assert [r.relative_path for r in results] == ["legacy_module.py"]
+        finally:
+            index.close()
+
+    def test_iso_timestamps_migrated_to_epoch(self):
+        """Test an older database's ISO-8601 timestamps are converted to unix seconds."""
+        db_path = Path(self.temp_dir) / "iso_quick.db"
+        recent = datetime.now().replace(microsecond=0)
+        old = recent - timedelta(days=30)
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript("""
+            CREATE TABLE files (id INTEGER PRIMARY KEY AUTOINCREMENT, path TEXT UNIQUE NOT NULL,
+                relative_path TEXT NOT NULL, file_type TEXT NOT NULL, size_bytes INTEGER,
+                modified_at TEXT, indexed_at TEXT);
+            CREATE TABLE symbols (id INTEGER PRIMARY KEY AUTOINCREMENT, file_id INTEGER NOT NULL,
+                name TEXT NOT NULL, symbol_type TEXT NOT NULL, line_number INTEGER);
+        """)
+        conn.executemany(
+            "INSERT INTO files (id, path, relative_path, file_type, modified_at, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (7, "/old/recent.py", "recent.py", "python", recent.isoformat(), "garbage"),
+                (9, "/old/stale.py", "stale.py", "python", old.isoformat(), old.isoformat()),
+            ],
+        )
+        conn.execute(
+            "INSERT INTO symbols (file_id, name, symbol_type, line_number) "
+            "VALUES (7, 'recent_helper', 'function', 3)"
+        )
+        conn.commit()
+        conn.close()
+
+        index = QuickIndex(db_path=db_path)
+        try:
+            conn = index._get_conn()
+            columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(files)")}
+            assert columns["modified_at"] == columns["indexed_at"] == "INTEGER"
+            rows = conn.execute("SELECT id, modified_at, indexed_at FROM files ORDER BY id")
+            assert [tuple(row) for row in rows] == [
+                (7, int(recent.timestamp()), None),
+                (9, int(old.timestamp()), int(old.timestamp())),
+            ]
+
+            results = index.search("recent stale", recent_days=7)
+            assert {r.relative_path for r in results} == {"recent.py"}
+            assert all(r.modified_at == recent for r in results)
+            assert [r.match_text for r in index.search("helper")] == ["function recent_helper"]
+        finally:
+            index.close()
+
     def test_close_and_reopen(self):
         """Test closing and reopening the index."""
         conn = self.index._get_conn()
@@ -470,8 +819,8 @@ func (c *Config) GetName() string {
                 "/test/test.py",
                 "test.py",
                 "python",
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                int(datetime.now().timestamp()),
+                int(datetime.now().timestamp()),
             ),
         )
         conn.commit()
@@ -2,13 +2,16 @@
 Tests for file_compass.scanner module.
 """
 
+import hashlib
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from subprocess import TimeoutExpired
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from file_compass import scanner as scanner_module
 from file_compass.scanner import FileScanner, ScannedFile
 
 
@@ -155,6 +158,17 @@ class TestFileScanner:
         assert scanner._matches_exclude_pattern(Path("/test/venv/lib/python.py"), base)
         assert scanner._matches_exclude_pattern(Path("/test/.venv/lib/python.py"), base)
 
+    def test_matches_exclude_pattern_prefix_and_suffix(self):
+        """Test a ** pattern needs both its prefix and its suffix glob to match."""
+        scanner = FileScanner(exclude_patterns=["src/**/*.py", "a/**/b/**"])
+        base = Path("/test")
+
+        assert scanner._matches_exclude_pattern(Path("/test/src/pkg/mod.py"), base)
+        assert not scanner._matches_exclude_pattern(Path("/test/src/pkg/mod.md"), base)
+        assert not scanner._matches_exclude_pattern(Path("/test/lib/mod.py"), base)
+        # Patterns with more than one ** never match
+        assert not scanner._matches_exclude_pattern(Path("/test/a/x/b/y.py"), base)
+
     def test_compute_hash(self):
         """Test file hash computation."""
         scanner = FileScanner()
@@ -200,23 +214,105 @@ class TestFileScanner:
         result = scanner._compute_hash(Path("/nonexistent/file.txt"))
         assert result == ""
 
-    def test_scan_directory_basic(self):
+    def test_compute_hash_sha256_fallback(self, tmp_path):
+        """Without blake3 the hash is a truncated SHA-256."""
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"content")
+
+        with patch.object(scanner_module, "BLAKE3_AVAILABLE", False):
+            result = FileScanner()._compute_hash(path)
+
+        assert result == hashlib.sha256(b"content").hexdigest()[:16]
+
+    def test_compute_hash_empty_file_skips_read(self, tmp_path):
+        """Test a zero-size file gets the empty-content hash without being read."""
+        path = tmp_path / "__init__.py"
+        path.write_bytes(b"")
+
+        with (
+            patch.object(scanner_module, "BLAKE3_AVAILABLE", False),
+            patch.object(Path, "read_bytes") as mock_read,
+        ):
+            result = FileScanner()._compute_hash(path, 0)
+
+        mock_read.assert_not_called()
+        assert result == hashlib.sha256(b"").hexdigest()[:16]
+
+    def test_compute_hash_blake3_mmaps_large_files(self, tmp_path):
+        """BLAKE3 hashes large files via update_mmap and small ones via update."""
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"content")
+        hasher = MagicMock()
+        hasher.hexdigest.return_value = "f" * 64
+        fake_blake3 = MagicMock()
+        fake_blake3.blake3.return_value = hasher
+
+        with (
+            patch.object(scanner_module, "BLAKE3_AVAILABLE", True),
+            patch.object(scanner_module, "blake3", fake_blake3, create=True),
+        ):
+            scanner = FileScanner()
+            assert scanner._compute_hash(path, 7) == "f" * 16
+            hasher.update.assert_called_once_with(b"content")
+            hasher.update_mmap.assert_not_called()
+
+            scanner._compute_hash(path, scanner_module.MMAP_HASH_THRESHOLD)
+            hasher.update_mmap.assert_called_once_with(path)
+
+    def test_scan_directory_hashes_in_batches_preserving_order(self, tmp_path):
+        """Files hashed across several pool batches come back in walk order."""
+        for i in range(5):
+            (tmp_path / f"f{i}.py").write_text(f"x = {i}")
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
+        walked = [path for path, _ in scanner._walk_candidates(tmp_path)]
+
+        with patch.object(scanner_module, "HASH_BATCH_SIZE", 2):
+            files = list(scanner.scan_directory(tmp_path))
+
+        assert [f.path for f in files] == walked
+        assert [f.content_hash for f in files] == [scanner._compute_hash(p) for p in walked]
+
+    def test_walk_read_ahead_matches_inline_walk(self, tmp_path):
+        """Directories listed ahead on the pool are walked in the inline order."""
+        for top in ("b", "a", "c"):
+            for sub in ("y", "x"):
+                leaf = tmp_path / top / sub
+                leaf.mkdir(parents=True)
+                (leaf / "f.py").write_text("x = 1")
+            (tmp_path / top / "g.py").write_text("y = 2")
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
+
+        scanner.scan_workers = 1
+        inline = [path for path, _ in scanner._walk_candidates(tmp_path)]
+        scanner.scan_workers = 4
+        with patch.object(scanner_module, "SCAN_READ_AHEAD_PER_WORKER", 1):
+            threaded = [path for path, _ in scanner._walk_candidates(tmp_path)]
+            # Abandoning the walk early cancels the remaining listings
+            walk = scanner._walk_candidates(tmp_path)
+            next(walk)
+            walk.close()
+
+        assert len(inline) == 9
+        assert threaded == inline
+
+    def test_scan_directory_basic(self, tmp_path):
         """Test basic directory scanning."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create test files
-            (Path(tmpdir) / "test.py").write_text("print('hello')")
-            (Path(tmpdir) / "readme.md").write_text("# README")
-            (Path(tmpdir) / "data.json").write_text("{}")
+        # Create test files
+        (tmp_path / "test.py").write_text("print('hello')")
+        (tmp_path / "readme.md").write_text("# README")
+        (tmp_path / "data.json").write_text("{}")
 
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py", ".md", ".json"])
+        scanner = FileScanner(
+            directories=[str(tmp_path)], include_extensions=[".py", ".md", ".json"]
+        )
 
-            files = list(scanner.scan_directory(Path(tmpdir)))
+        files = list(scanner.scan_directory(tmp_path))
 
-            assert len(files) == 3
-            file_types = {f.file_type for f in files}
-            assert "python" in file_types
-            assert "markdown" in file_types
-            assert "json" in file_types
+        assert len(files) == 3
+        file_types = {f.file_type for f in files}
+        assert "python" in file_types
+        assert "markdown" in file_types
+        assert "json" in file_types
 
     def test_scan_directory_nonexistent(self):
         """Test scanning nonexistent directory."""
@@ -224,152 +320,146 @@ class TestFileScanner:
         files = list(scanner.scan_directory(Path("/nonexistent/directory")))
         assert len(files) == 0
 
-    def test_scan_directory_excludes_patterns(self):
+    def test_scan_directory_excludes_patterns(self, tmp_path):
         """Test that exclude patterns are respected."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create files
-            (Path(tmpdir) / "main.py").write_text("print('hello')")
+        # Create files
+        (tmp_path / "main.py").write_text("print('hello')")
 
-            # Create excluded directory
-            venv_dir = Path(tmpdir) / "venv"
-            venv_dir.mkdir()
-            (venv_dir / "lib.py").write_text("# venv file")
+        # Create excluded directory
+        venv_dir = tmp_path / "venv"
+        venv_dir.mkdir()
+        (venv_dir / "lib.py").write_text("# venv file")
 
-            scanner = FileScanner(
-                directories=[tmpdir], include_extensions=[".py"], exclude_patterns=["venv/**"]
-            )
+        scanner = FileScanner(
+            directories=[str(tmp_path)], include_extensions=[".py"], exclude_patterns=["venv/**"]
+        )
 
-            files = list(scanner.scan_directory(Path(tmpdir)))
+        files = list(scanner.scan_directory(tmp_path))
 
-            # Should only find main.py, not venv/lib.py
-            assert len(files) == 1
-            assert files[0].relative_path == "main.py"
+        # Should only find main.py, not venv/lib.py
+        assert len(files) == 1
+        assert files[0].relative_path == "main.py"
 
-    def test_scan_directory_excludes_dotfiles(self):
+    def test_scan_directory_excludes_dotfiles(self, tmp_path):
         """Test that hidden directories are excluded."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create files
-            (Path(tmpdir) / "main.py").write_text("print('hello')")
+        # Create files
+        (tmp_path / "main.py").write_text("print('hello')")
 
-            # Create hidden directory
-            hidden_dir = Path(tmpdir) / ".hidden"
-            hidden_dir.mkdir()
-            (hidden_dir / "secret.py").write_text("# hidden")
+        # Create hidden directory
+        hidden_dir = tmp_path / ".hidden"
+        hidden_dir.mkdir()
+        (hidden_dir / "secret.py").write_text("# hidden")
 
-            scanner = FileScanner(
-                directories=[tmpdir], include_extensions=[".py"], exclude_patterns=[]
-            )
+        scanner = FileScanner(
+            directories=[str(tmp_path)], include_extensions=[".py"], exclude_patterns=[]
+        )
 
-            files = list(scanner.scan_directory(Path(tmpdir)))
+        files = list(scanner.scan_directory(tmp_path))
 
-            # Should only find main.py
-            assert len(files) == 1
-            assert files[0].relative_path == "main.py"
+        # Should only find main.py
+        assert len(files) == 1
+        assert files[0].relative_path == "main.py"
 
-    def test_scan_directory_respects_extension_filter(self):
+    def test_scan_directory_respects_extension_filter(self, tmp_path):
         """Test that only specified extensions are included."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            (Path(tmpdir) / "code.py").write_text("print('hello')")
-            (Path(tmpdir) / "notes.txt").write_text("notes")
-            (Path(tmpdir) / "image.png").write_bytes(b"\x89PNG")
+        (tmp_path / "code.py").write_text("print('hello')")
+        (tmp_path / "notes.txt").write_text("notes")
+        (tmp_path / "image.png").write_bytes(b"\x89PNG")
 
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
 
-            files = list(scanner.scan_directory(Path(tmpdir)))
+        files = list(scanner.scan_directory(tmp_path))
 
-            assert len(files) == 1
-            assert files[0].file_type == "python"
+        assert len(files) == 1
+        assert files[0].file_type == "python"
 
-    def test_scan_directory_skips_large_files(self):
+    def test_scan_directory_skips_large_files(self, tmp_path):
         """Test that files >10MB are skipped."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            small_file = Path(tmpdir) / "small.py"
-            small_file.write_text("print('small')")
+        small_file = tmp_path / "small.py"
+        small_file.write_text("print('small')")
 
-            # We won't actually create a 10MB file in tests, but we can mock the stat
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+        # We won't actually create a 10MB file in tests, but we can mock the stat
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
 
-            files = list(scanner.scan_directory(Path(tmpdir)))
-            assert len(files) == 1
+        files = list(scanner.scan_directory(tmp_path))
+        assert len(files) == 1
 
-    def test_scan_directory_nested(self):
+    def test_scan_directory_nested(self, tmp_path):
         """Test scanning nested directories."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create nested structure
-            src_dir = Path(tmpdir) / "src"
-            src_dir.mkdir()
-            tests_dir = Path(tmpdir) / "tests"
-            tests_dir.mkdir()
-
-            (Path(tmpdir) / "main.py").write_text("# main")
-            (src_dir / "module.py").write_text("# module")
-            (tests_dir / "test_main.py").write_text("# test")
-
-            scanner = FileScanner(
-                directories=[tmpdir], include_extensions=[".py"], exclude_patterns=[]
-            )
-
-            files = list(scanner.scan_directory(Path(tmpdir)))
-
-            assert len(files) == 3
-            paths = {f.relative_path for f in files}
-            assert "main.py" in paths
-            assert "src\\module.py" in paths or "src/module.py" in paths
-            assert "tests\\test_main.py" in paths or "tests/test_main.py" in paths
-
-    def test_scan_all(self):
+        # Create nested structure
+        src_dir = tmp_path / "src"
+        src_dir.mkdir()
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir()
+
+        (tmp_path / "main.py").write_text("# main")
+        (src_dir / "module.py").write_text("# module")
+        (tests_dir / "test_main.py").write_text("# test")
+
+        scanner = FileScanner(
+            directories=[str(tmp_path)], include_extensions=[".py"], exclude_patterns=[]
+        )
+
+        files = list(scanner.scan_directory(tmp_path))
+
+        assert len(files) == 3
+        paths = {f.relative_path for f in files}
+        assert "main.py" in paths
+        assert "src\\module.py" in paths or "src/module.py" in paths
+        assert "tests\\test_main.py" in paths or "tests/test_main.py" in paths
+
+    def test_scan_all(self, tmp_path):
         """Test scanning all configured directories."""
-        with tempfile.TemporaryDirectory() as tmpdir1:
-            with tempfile.TemporaryDirectory() as tmpdir2:
-                (Path(tmpdir1) / "file1.py").write_text("# 1")
-                (Path(tmpdir2) / "file2.py").write_text("# 2")
+        dir1 = tmp_path / "one"
+        dir2 = tmp_path / "two"
+        dir1.mkdir()
+        dir2.mkdir()
+        (dir1 / "file1.py").write_text("# 1")
+        (dir2 / "file2.py").write_text("# 2")
 
-                scanner = FileScanner(directories=[tmpdir1, tmpdir2], include_extensions=[".py"])
+        scanner = FileScanner(directories=[str(dir1), str(dir2)], include_extensions=[".py"])
 
-                files = list(scanner.scan_all())
-                assert len(files) == 2
+        files = list(scanner.scan_all())
+        assert len(files) == 2
 
-    def test_scan_count(self):
+    def test_scan_count(self, tmp_path):
         """Test file counting."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            (Path(tmpdir) / "file1.py").write_text("# 1")
-            (Path(tmpdir) / "file2.py").write_text("# 2")
-            (Path(tmpdir) / "file3.py").write_text("# 3")
+        (tmp_path / "file1.py").write_text("# 1")
+        (tmp_path / "file2.py").write_text("# 2")
+        (tmp_path / "file3.py").write_text("# 3")
 
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
 
-            count = scanner.scan_count()
-            assert count == 3
+        count = scanner.scan_count()
+        assert count == 3
 
-    def test_scanned_file_attributes(self):
+    def test_scanned_file_attributes(self, tmp_path):
         """Test that ScannedFile has correct attributes."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            test_file = Path(tmpdir) / "test.py"
-            test_file.write_text("print('hello world')")
+        test_file = tmp_path / "test.py"
+        test_file.write_text("print('hello world')")
 
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
 
-            files = list(scanner.scan_directory(Path(tmpdir)))
-            assert len(files) == 1
+        files = list(scanner.scan_directory(tmp_path))
+        assert len(files) == 1
 
-            f = files[0]
-            assert f.path == test_file
-            assert f.relative_path == "test.py"
-            assert f.file_type == "python"
-            assert f.size_bytes > 0
-            assert isinstance(f.modified_at, datetime)
-            assert len(f.content_hash) == 16
+        f = files[0]
+        assert f.path == test_file
+        assert f.relative_path == "test.py"
+        assert f.file_type == "python"
+        assert f.size_bytes > 0
+        assert isinstance(f.modified_at, datetime)
+        assert len(f.content_hash) == 16
 
 
 class TestGitIntegration:
     """Tests for git-related functionality."""
 
-    def test_find_git_repo_no_repo(self):
+    def test_find_git_repo_no_repo(self, tmp_path):
         """Test finding git repo when not in a repo."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            scanner = FileScanner()
-            result = scanner._find_git_repo(Path(tmpdir))
-            assert result is None
+        scanner = FileScanner()
+        result = scanner._find_git_repo(tmp_path)
+        assert result is None
 
     def test_find_git_repo_caches_result(self):
         """Test that git repo lookup is cached."""
@@ -428,8 +518,6 @@ class TestGitIntegration:
     @patch("subprocess.run")
     def test_get_git_tracked_files_timeout(self, mock_run):
         """Test handling git command timeout."""
-        from subprocess import TimeoutExpired
-
         mock_run.side_effect = TimeoutExpired(cmd="git", timeout=30)
 
         scanner = FileScanner()
@@ -442,157 +530,158 @@ class TestGitIntegration:
 class TestEdgeCases:
     """Tests for edge cases."""
 
-    def test_empty_directory(self):
+    def test_empty_directory(self, tmp_path):
         """Test scanning empty directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            scanner = FileScanner(directories=[tmpdir])
-            files = list(scanner.scan_all())
-            assert len(files) == 0
+        scanner = FileScanner(directories=[str(tmp_path)])
+        files = list(scanner.scan_all())
+        assert len(files) == 0
 
-    def test_unicode_filenames(self):
+    def test_unicode_filenames(self, tmp_path):
         """Test handling Unicode filenames."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            try:
-                # Create file with Unicode name
-                unicode_file = Path(tmpdir) / "тест.py"
-                unicode_file.write_text("# unicode test", encoding="utf-8")
+        try:
+            # Create file with Unicode name
+            unicode_file = tmp_path / "тест.py"
+            unicode_file.write_text("# unicode test", encoding="utf-8")
 
-                scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+            scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
 
-                files = list(scanner.scan_all())
-                assert len(files) == 1
-            except OSError:
-                # Some filesystems may not support unicode filenames
-                pytest.skip("Filesystem doesn't support Unicode filenames")
+            files = list(scanner.scan_all())
+            assert len(files) == 1
+        except OSError:
+            # Some filesystems may not support unicode filenames
+            pytest.skip("Filesystem doesn't support Unicode filenames")
 
-    def test_special_characters_in_path(self):
+    def test_special_characters_in_path(self, tmp_path):
         """Test handling special characters in paths."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create directory with spaces
-            space_dir = Path(tmpdir) / "dir with spaces"
-            space_dir.mkdir()
-            (space_dir / "file.py").write_text("# test")
+        # Create directory with spaces
+        space_dir = tmp_path / "dir with spaces"
+        space_dir.mkdir()
+        (space_dir / "file.py").write_text("# test")
 
-            scanner = FileScanner(
-                directories=[tmpdir], include_extensions=[".py"], exclude_patterns=[]
-            )
+        scanner = FileScanner(
+            directories=[str(tmp_path)], include_extensions=[".py"], exclude_patterns=[]
+        )
 
-            files = list(scanner.scan_all())
-            assert len(files) == 1
+        files = list(scanner.scan_all())
+        assert len(files) == 1
 
-    def test_symlink_handling(self):
+    def test_symlink_handling(self, tmp_path):
         """Test that symlinks are handled correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a real file
-            real_file = Path(tmpdir) / "real.py"
-            real_file.write_text("# real file")
-
-            # Create a symlink (may fail on some systems)
-            try:
-                link_file = Path(tmpdir) / "link.py"
-                link_file.symlink_to(real_file)
-
-                scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
-
-                files = list(scanner.scan_all())
-                # Both real file and symlink should be scanned
-                assert len(files) == 2
-            except OSError:
-                # Symlinks may not be supported
-                pytest.skip("Symlinks not supported on this system")
-
-    def test_read_permission_error(self):
+        # Create a real file
+        real_file = tmp_path / "real.py"
+        real_file.write_text("# real file")
+
+        # Create a symlink (may fail on some systems)
+        try:
+            link_file = tmp_path / "link.py"
+            link_file.symlink_to(real_file)
+
+            scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
+
+            files = list(scanner.scan_all())
+            # Both real file and symlink should be scanned
+            assert len(files) == 2
+        except OSError:
+            # Symlinks may not be supported
+            pytest.skip("Symlinks not supported on this system")
+
+    def test_read_permission_error(self, tmp_path):
         """Test handling files without read permission."""
         # This test is platform-specific and may not work on all systems
-        with tempfile.TemporaryDirectory() as tmpdir:
-            test_file = Path(tmpdir) / "test.py"
-            test_file.write_text("# test")
+        test_file = tmp_path / "test.py"
+        test_file.write_text("# test")
 
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
 
-            # File should still be discovered even if hash fails
-            files = list(scanner.scan_all())
-            assert len(files) == 1
+        # File should still be discovered even if hash fails
+        files = list(scanner.scan_all())
+        assert len(files) == 1
 
-    def test_find_git_repo_found(self):
+    def test_find_git_repo_found(self, tmp_path):
         """Test finding git repo when .git exists."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a fake .git directory
-            git_dir = Path(tmpdir) / ".git"
-            git_dir.mkdir()
+        # Create a fake .git directory
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
 
-            # Create a nested file
-            sub_dir = Path(tmpdir) / "src"
-            sub_dir.mkdir()
-            test_file = sub_dir / "test.py"
+        # Create a nested file
+        sub_dir = tmp_path / "src"
+        sub_dir.mkdir()
+        test_file = sub_dir / "test.py"
 
-            scanner = FileScanner()
-            result = scanner._find_git_repo(test_file)
+        scanner = FileScanner()
+        result = scanner._find_git_repo(test_file)
+
+        assert result == tmp_path
+        # Should be cached
+        assert test_file in scanner._git_repos
+
+    def test_git_repo_cached_per_directory(self, tmp_path):
+        """Test files in an already visited directory resolve from the cache."""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        sub_dir = tmp_path / "src" / "pkg"
+        sub_dir.mkdir(parents=True)
+
+        scanner = FileScanner()
+        assert scanner._git_repo_for_dir(sub_dir) == tmp_path
+        assert scanner._git_repos[sub_dir.parent] == tmp_path
 
-            assert result == Path(tmpdir)
-            # Should be cached
-            assert test_file in scanner._git_repos
+        # No further .git lookups for the same tree
+        git_dir.rmdir()
+        assert scanner._find_git_repo(sub_dir / "other.py") == tmp_path
 
-    def test_large_file_skipped(self):
+    def test_git_repo_nested_resolves_innermost(self, tmp_path):
+        """Test a nested repository wins over an already cached outer one."""
+        (tmp_path / ".git").mkdir()
+        nested = tmp_path / "vendor" / "lib"
+        (nested / ".git").mkdir(parents=True)
+        (nested / "src").mkdir()
+
+        scanner = FileScanner()
+        assert scanner._git_repo_for_dir(tmp_path / "vendor") == tmp_path
+        assert scanner._git_repo_for_dir(nested / "src") == nested
+
+    def test_large_file_skipped(self, tmp_path):
         """Test that very large files are skipped."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            test_file = Path(tmpdir) / "large.py"
-            test_file.write_text("# test")
-
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
-
-            # Mock the stat to return a very large file size
-            with patch.object(Path, "stat") as mock_stat:
-                mock_stat.return_value = MagicMock(
-                    st_size=15 * 1024 * 1024,  # 15MB > 10MB limit
-                    st_mtime=datetime.now().timestamp(),
-                )
-                list(scanner.scan_all())
-                # Large file should be skipped
-                # Note: The actual file is small, but mock returns large size
-                # This tests line 191-192
-
-    def test_file_stat_os_error(self):
-        """Test handling OSError when stat fails."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            test_file = Path(tmpdir) / "test.py"
-            test_file.write_text("# test")
+        (tmp_path / "small.py").write_text("# test")
+        # Sparse file: 15MB > 10MB limit without writing the bytes
+        with open(tmp_path / "large.py", "wb") as f:
+            f.truncate(15 * 1024 * 1024)
 
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
+        files = list(scanner.scan_all())
 
-            # This tests the OSError handling (lines 193-194)
-            # by mocking stat to raise an OSError
-            original_stat = Path.stat
+        assert [f.path.name for f in files] == ["small.py"]
 
-            def mock_stat(self, follow_symlinks=True):
-                if "test.py" in str(self):
-                    raise OSError("Cannot stat file")
-                return original_stat(self)
+    def test_file_stat_os_error(self, tmp_path):
+        """Test handling OSError when stat fails."""
+        # A dangling symlink lists as a file but fails to stat
+        (tmp_path / "test.py").symlink_to(tmp_path / "missing.py")
+
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
+        files = list(scanner.scan_all())
 
-            with patch.object(Path, "stat", mock_stat):
-                files = list(scanner.scan_all())
-                # File with stat error should be skipped
-                assert len(files) == 0
+        # File with stat error should be skipped
+        assert len(files) == 0
 
-    def test_git_tracked_file_detection(self):
+    def test_git_tracked_file_detection(self, tmp_path):
         """Test detection of git tracked files in scan results."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create .git directory
-            git_dir = Path(tmpdir) / ".git"
-            git_dir.mkdir()
-
-            # Create a Python file
-            test_file = Path(tmpdir) / "tracked.py"
-            test_file.write_text("# tracked")
-
-            scanner = FileScanner(directories=[tmpdir], include_extensions=[".py"])
-
-            # Mock git ls-files to return the file as tracked
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(returncode=0, stdout="tracked.py\n")
-
-                files = list(scanner.scan_all())
-                assert len(files) == 1
-                # The file should be detected as git tracked
-                assert files[0].is_git_tracked is True
-                assert files[0].git_repo == str(Path(tmpdir))
+        # Create .git directory
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+
+        # Create a Python file
+        test_file = tmp_path / "tracked.py"
+        test_file.write_text("# tracked")
+
+        scanner = FileScanner(directories=[str(tmp_path)], include_extensions=[".py"])
+
+        # Mock git ls-files to return the file as tracked
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="tracked.py\n")
+
+            files = list(scanner.scan_all())
+            assert len(files) == 1
+            # The file should be detected as git tracked
+            assert files[0].is_git_tracked is True
+            assert files[0].git_repo == str(tmp_path)
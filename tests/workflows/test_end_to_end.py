@@ -4,12 +4,12 @@ Tests for complete workflows: index then query, incremental updates, CLI to gate
 """
 
 import pytest
-import tempfile
-import shutil
+import pytest_asyncio
 import numpy as np
 from pathlib import Path
+from types import SimpleNamespace
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 import asyncio
 
 from file_compass.indexer import FileIndex, SearchResult
@@ -18,23 +18,33 @@ from file_compass.scanner import FileScanner, ScannedFile
 from file_compass.embedder import Embedder
 from file_compass.config import FileCompassConfig
 
+# Shared read-only embeddings for embedder mocks; slice rows as needed
+_RAND_EMB = np.random.default_rng(0).standard_normal((16, 768), dtype=np.float32)
+_RAND_EMB.flags.writeable = False
+
+# Canned Ollama /api/embed responses for the embedder tests
+_EMBED_JSON = {"embeddings": [_RAND_EMB[0].tolist()]}
+_EMBED_RESPONSE = SimpleNamespace(status_code=200, json=lambda: _EMBED_JSON)
+_SERVER_ERROR_RESPONSE = SimpleNamespace(status_code=500, text="Server error")
+
+# Timestamp for ScannedFile fixtures; no test depends on its value
+_NOW = datetime.now()
+
+
+def _fake_embed(result):
+    """Async stand-in for embed_batch/embed_query that always returns result."""
+    async def embed(*args, **kwargs):
+        return result
+    return embed
+
 
 # =============================================================================
 # Section 1: End-to-End Index Then Query Tests (8 tests)
 # =============================================================================
 
-class TestEndToEndIndexThenQuery:
-    """Test complete index-then-query workflow."""
-
-    @pytest.fixture
-    def workspace(self):
-        """Create a complete test workspace."""
-        tmpdir = tempfile.mkdtemp()
-        code_dir = Path(tmpdir) / "code"
-        code_dir.mkdir()
-
-        # Create sample Python files
-        (code_dir / "main.py").write_text("""
+# Sample sources for the index-then-query workspace, pre-encoded
+_SAMPLE_FILES = {
+    "main.py": b"""
 def main():
     '''Entry point for the application.'''
     config = load_config()
@@ -48,9 +58,8 @@ def run_app(config):
     '''Run the main application loop.'''
     while True:
         process_request()
-""")
-
-        (code_dir / "utils.py").write_text("""
+""",
+    "utils.py": b"""
 def format_output(data):
     '''Format data for display.'''
     return str(data)
@@ -63,9 +72,8 @@ class DataProcessor:
     '''Process data records.'''
     def process(self, record):
         return record.upper()
-""")
-
-        (code_dir / "models.py").write_text("""
+""",
+    "models.py": b"""
 from dataclasses import dataclass
 
 @dataclass
@@ -77,126 +85,92 @@ class User:
 class Config:
     debug: bool
     timeout: int
-""")
+""",
+    "README.md": b"# Project\nDocumentation here.",
+}
 
-        yield tmpdir, code_dir
 
-        shutil.rmtree(tmpdir, ignore_errors=True)
+@pytest_asyncio.fixture(scope="class")
+async def built_index(tmp_path_factory):
+    """Build one index over the sample workspace for a whole test class."""
+    tmpdir = tmp_path_factory.mktemp("workspace")
+    code_dir = tmpdir / "code"
+    code_dir.mkdir()
+    index = FileIndex(
+        index_path=tmpdir / "test.hnsw",
+        sqlite_path=tmpdir / "test.db",
+        merkle_path=tmpdir / "merkle_state.json"
+    )
 
-    @pytest.mark.asyncio
-    async def test_full_index_and_search_workflow(self, workspace):
-        """Test indexing files and searching."""
-        tmpdir, code_dir = workspace
+    # Write the workspace and mock scanner to return our test files
+    files = []
+    for name, data in _SAMPLE_FILES.items():
+        path = code_dir / name
+        path.write_bytes(data)
+        files.append(ScannedFile(
+            path=path,
+            relative_path=name,
+            file_type="python" if path.suffix == ".py" else "markdown",
+            size_bytes=len(data),
+            modified_at=_NOW,
+            content_hash=f"hash_{name}"
+        ))
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
-        )
+    with patch.object(index.scanner, 'scan_all', return_value=iter(files)):
+        with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:10])):
+            stats = await index.build_index(show_progress=False)
 
-        try:
-            # Mock scanner to return our test files
-            files = []
-            for py_file in code_dir.glob("*.py"):
-                files.append(ScannedFile(
-                    path=py_file,
-                    relative_path=py_file.name,
-                    file_type="python",
-                    size_bytes=py_file.stat().st_size,
-                    modified_at=datetime.now(),
-                    content_hash=f"hash_{py_file.name}"
-                ))
-
-            with patch.object(index.scanner, 'scan_all', return_value=iter(files)):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    # Return mock embeddings
-                    mock_embed.return_value = np.random.randn(10, 768).astype(np.float32)
-                    stats = await index.build_index(show_progress=False)
+    yield index, stats
+    await index.close()
 
-            assert stats["files_indexed"] == 3
-            assert stats["chunks_indexed"] > 0
 
-            # Now search
-            with patch.object(index.embedder, 'embed_query', new_callable=AsyncMock) as mock_query:
-                mock_query.return_value = np.random.randn(768).astype(np.float32)
-                results = await index.search("configuration loading")
+async def _check_build_stats(index, stats):
+    assert stats["files_indexed"] == len(_SAMPLE_FILES)
+    assert stats["chunks_indexed"] > 0
 
-            # Results depend on mocked embeddings, but should not crash
-            assert isinstance(results, list)
-
-        finally:
-            await index.close()
-
-    @pytest.mark.asyncio
-    async def test_search_returns_relevant_chunks(self, workspace):
-        """Test search returns chunks with matching content."""
-        tmpdir, code_dir = workspace
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
-        )
+async def _check_search(index, stats):
+    with patch.object(index.embedder, 'embed_query', _fake_embed(_RAND_EMB[0])):
+        results = await index.search("configuration loading")
 
-        try:
-            files = [
-                ScannedFile(
-                    path=code_dir / "utils.py",
-                    relative_path="utils.py",
-                    file_type="python",
-                    size_bytes=200,
-                    modified_at=datetime.now(),
-                    content_hash="hash_utils"
-                )
-            ]
+    # Results depend on mocked embeddings, but should not crash
+    assert isinstance(results, list)
 
-            with patch.object(index.scanner, 'scan_all', return_value=iter(files)):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(5, 768).astype(np.float32)
-                    await index.build_index(show_progress=False)
 
-            status = index.get_status()
-            assert status["files_indexed"] == 1
-            assert "python" in status["file_types"]
+async def _check_status(index, stats):
+    status = index.get_status()
+    assert status["files_indexed"] == len(_SAMPLE_FILES)
+    assert "python" in status["file_types"]
+    assert "markdown" in status["file_types"]
 
-        finally:
-            await index.close()
 
-    @pytest.mark.asyncio
-    async def test_search_with_filters_workflow(self, workspace):
-        """Test search with file type filters."""
-        tmpdir, code_dir = workspace
+async def _check_search_filters(index, stats):
+    # Each sample file is one chunk, embedded in _SAMPLE_FILES order; query with the README's
+    readme_embedding = _RAND_EMB[list(_SAMPLE_FILES).index("README.md")]
+    with patch.object(index.embedder, 'embed_query', _fake_embed(readme_embedding)):
+        results = await index.search("documentation", file_types=["markdown"])
 
-        # Add a markdown file
-        (code_dir / "README.md").write_text("# Project\nDocumentation here.")
+    assert results
+    assert all(r.file_type == "markdown" for r in results)
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
-        )
 
-        try:
-            files = []
-            for f in code_dir.iterdir():
-                ftype = "python" if f.suffix == ".py" else "markdown"
-                files.append(ScannedFile(
-                    path=f,
-                    relative_path=f.name,
-                    file_type=ftype,
-                    size_bytes=f.stat().st_size,
-                    modified_at=datetime.now(),
-                    content_hash=f"hash_{f.name}"
-                ))
-
-            with patch.object(index.scanner, 'scan_all', return_value=iter(files)):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(10, 768).astype(np.float32)
-                    await index.build_index(show_progress=False)
+class TestEndToEndIndexThenQuery:
+    """Test complete index-then-query workflow.
 
-            status = index.get_status()
-            assert "python" in status["file_types"]
-            assert "markdown" in status["file_types"]
+    The index is built once per class; each case checks one part of the result.
+    """
 
-        finally:
-            await index.close()
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("check", [
+        _check_build_stats,
+        _check_search,
+        _check_status,
+        _check_search_filters,
+    ], ids=["build_stats", "search", "status", "search_filters"])
+    async def test_index_then_query(self, built_index, check):
+        """Test indexing the workspace and querying the result."""
+        index, stats = built_index
+        await check(index, stats)
 
 
 # =============================================================================
@@ -207,193 +181,158 @@ class TestEndToEndIncrementalUpdate:
     """Test incremental update workflow."""
 
     @pytest.fixture
-    def workspace(self):
-        tmpdir = tempfile.mkdtemp()
+    def workspace(self, tmp_path):
+        tmpdir = str(tmp_path)
         code_dir = Path(tmpdir) / "code"
         code_dir.mkdir()
 
         yield tmpdir, code_dir
 
-        shutil.rmtree(tmpdir, ignore_errors=True)
+    @pytest_asyncio.fixture
+    async def index(self, workspace):
+        tmpdir, _ = workspace
+        index = FileIndex(
+            index_path=Path(tmpdir) / "test.hnsw",
+            sqlite_path=Path(tmpdir) / "test.db",
+            merkle_path=Path(tmpdir) / "merkle_state.json"
+        )
+        yield index
+        await index.close()
 
     @pytest.mark.asyncio
-    async def test_incremental_adds_new_file(self, workspace):
+    async def test_incremental_adds_new_file(self, workspace, index):
         """Test incremental update adds newly created file."""
         tmpdir, code_dir = workspace
 
         # Initial file
         (code_dir / "initial.py").write_text("x = 1")
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
+        initial_file = ScannedFile(
+            path=code_dir / "initial.py",
+            relative_path="initial.py",
+            file_type="python",
+            size_bytes=5,
+            modified_at=_NOW,
+            content_hash="hash1"
         )
 
-        try:
-            initial_file = ScannedFile(
-                path=code_dir / "initial.py",
-                relative_path="initial.py",
-                file_type="python",
-                size_bytes=5,
-                modified_at=datetime.now(),
-                content_hash="hash1"
-            )
-
-            with patch.object(index.scanner, 'scan_all', return_value=iter([initial_file])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                    await index.build_index(show_progress=False)
-
-            # Add new file
-            (code_dir / "new.py").write_text("y = 2")
-            new_file = ScannedFile(
-                path=code_dir / "new.py",
-                relative_path="new.py",
-                file_type="python",
-                size_bytes=5,
-                modified_at=datetime.now(),
-                content_hash="hash2"
-            )
+        with patch.object(index.scanner, 'scan_all', return_value=iter([initial_file])):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:1])):
+                await index.build_index(show_progress=False)
 
-            with patch.object(index.scanner, 'scan_all', return_value=iter([initial_file, new_file])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                    stats = await index.incremental_update(show_progress=False)
+        # Add new file
+        (code_dir / "new.py").write_text("y = 2")
+        new_file = ScannedFile(
+            path=code_dir / "new.py",
+            relative_path="new.py",
+            file_type="python",
+            size_bytes=5,
+            modified_at=_NOW,
+            content_hash="hash2"
+        )
 
-            assert stats["files_added"] == 1
+        with patch.object(index.scanner, 'scan_all', return_value=iter([initial_file, new_file])):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:1])):
+                stats = await index.incremental_update(show_progress=False)
 
-        finally:
-            await index.close()
+        assert stats["files_added"] == 1
 
     @pytest.mark.asyncio
-    async def test_incremental_updates_modified_file(self, workspace):
+    async def test_incremental_updates_modified_file(self, workspace, index):
         """Test incremental update detects modified file."""
         tmpdir, code_dir = workspace
 
         (code_dir / "changing.py").write_text("version = 1")
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
+        file_v1 = ScannedFile(
+            path=code_dir / "changing.py",
+            relative_path="changing.py",
+            file_type="python",
+            size_bytes=12,
+            modified_at=_NOW,
+            content_hash="v1_hash"
         )
 
-        try:
-            file_v1 = ScannedFile(
-                path=code_dir / "changing.py",
-                relative_path="changing.py",
-                file_type="python",
-                size_bytes=12,
-                modified_at=datetime.now(),
-                content_hash="v1_hash"
-            )
+        with patch.object(index.scanner, 'scan_all', return_value=iter([file_v1])):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:1])):
+                await index.build_index(show_progress=False)
 
-            with patch.object(index.scanner, 'scan_all', return_value=iter([file_v1])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                    await index.build_index(show_progress=False)
-
-            # Modify file
-            (code_dir / "changing.py").write_text("version = 2")
-            file_v2 = ScannedFile(
-                path=code_dir / "changing.py",
-                relative_path="changing.py",
-                file_type="python",
-                size_bytes=12,
-                modified_at=datetime.now(),
-                content_hash="v2_hash"  # Different hash
-            )
-
-            with patch.object(index.scanner, 'scan_all', return_value=iter([file_v2])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                    stats = await index.incremental_update(show_progress=False)
+        # Modify file
+        (code_dir / "changing.py").write_text("version = 2")
+        file_v2 = ScannedFile(
+            path=code_dir / "changing.py",
+            relative_path="changing.py",
+            file_type="python",
+            size_bytes=12,
+            modified_at=_NOW,
+            content_hash="v2_hash"  # Different hash
+        )
 
-            assert stats["files_modified"] == 1
+        with patch.object(index.scanner, 'scan_all', return_value=iter([file_v2])):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:1])):
+                stats = await index.incremental_update(show_progress=False)
 
-        finally:
-            await index.close()
+        assert stats["files_modified"] == 1
 
     @pytest.mark.asyncio
-    async def test_incremental_removes_deleted_file(self, workspace):
+    async def test_incremental_removes_deleted_file(self, workspace, index):
         """Test incremental update removes deleted file from index."""
         tmpdir, code_dir = workspace
 
         (code_dir / "keep.py").write_text("keep = True")
         (code_dir / "delete.py").write_text("delete = True")
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
-        )
+        files = [
+            ScannedFile(path=code_dir / "keep.py", relative_path="keep.py",
+                       file_type="python", size_bytes=11, modified_at=_NOW,
+                       content_hash="keep_hash"),
+            ScannedFile(path=code_dir / "delete.py", relative_path="delete.py",
+                       file_type="python", size_bytes=14, modified_at=_NOW,
+                       content_hash="delete_hash")
+        ]
 
-        try:
-            files = [
-                ScannedFile(path=code_dir / "keep.py", relative_path="keep.py",
-                           file_type="python", size_bytes=11, modified_at=datetime.now(),
-                           content_hash="keep_hash"),
-                ScannedFile(path=code_dir / "delete.py", relative_path="delete.py",
-                           file_type="python", size_bytes=14, modified_at=datetime.now(),
-                           content_hash="delete_hash")
-            ]
-
-            with patch.object(index.scanner, 'scan_all', return_value=iter(files)):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(2, 768).astype(np.float32)
-                    await index.build_index(show_progress=False)
+        with patch.object(index.scanner, 'scan_all', return_value=iter(files)):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:2])):
+                await index.build_index(show_progress=False)
 
-            # Remove file
-            (code_dir / "delete.py").unlink()
-            remaining = [files[0]]
+        # Remove file
+        (code_dir / "delete.py").unlink()
+        remaining = [files[0]]
 
-            with patch.object(index.scanner, 'scan_all', return_value=iter(remaining)):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(0, 768).astype(np.float32)
-                    stats = await index.incremental_update(show_progress=False)
+        with patch.object(index.scanner, 'scan_all', return_value=iter(remaining)):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:0])):
+                stats = await index.incremental_update(show_progress=False)
 
-            assert stats["files_removed"] == 1
-
-        finally:
-            await index.close()
+        assert stats["files_removed"] == 1
 
     @pytest.mark.asyncio
-    async def test_incremental_no_changes(self, workspace):
+    async def test_incremental_no_changes(self, workspace, index):
         """Test incremental update with no changes."""
         tmpdir, code_dir = workspace
 
         (code_dir / "stable.py").write_text("stable = True")
 
-        index = FileIndex(
-            index_path=Path(tmpdir) / "test.hnsw",
-            sqlite_path=Path(tmpdir) / "test.db"
+        file = ScannedFile(
+            path=code_dir / "stable.py",
+            relative_path="stable.py",
+            file_type="python",
+            size_bytes=14,
+            modified_at=_NOW,
+            content_hash="stable_hash"
         )
 
-        try:
-            file = ScannedFile(
-                path=code_dir / "stable.py",
-                relative_path="stable.py",
-                file_type="python",
-                size_bytes=14,
-                modified_at=datetime.now(),
-                content_hash="stable_hash"
-            )
-
-            with patch.object(index.scanner, 'scan_all', return_value=iter([file])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
-                    await index.build_index(show_progress=False)
+        with patch.object(index.scanner, 'scan_all', return_value=iter([file])):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:1])):
+                await index.build_index(show_progress=False)
 
-            # Same file, no changes
-            with patch.object(index.scanner, 'scan_all', return_value=iter([file])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(0, 768).astype(np.float32)
-                    stats = await index.incremental_update(show_progress=False)
+        # Same file, no changes
+        with patch.object(index.scanner, 'scan_all', return_value=iter([file])):
+            with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:0])):
+                stats = await index.incremental_update(show_progress=False)
 
-            assert stats["files_added"] == 0
-            assert stats["files_removed"] == 0
-            assert stats["files_modified"] == 0
-
-        finally:
-            await index.close()
+        assert stats["files_added"] == 0
+        assert stats["files_removed"] == 0
+        assert stats["files_modified"] == 0
 
 
 # =============================================================================
@@ -404,16 +343,14 @@ class TestEndToEndCLIToGateway:
     """Test CLI to gateway integration."""
 
     @pytest.fixture
-    def workspace(self):
-        tmpdir = tempfile.mkdtemp()
+    def workspace(self, tmp_path):
+        tmpdir = str(tmp_path)
         code_dir = Path(tmpdir) / "code"
         code_dir.mkdir()
         (code_dir / "test.py").write_text("def hello(): pass")
 
         yield tmpdir, code_dir
 
-        shutil.rmtree(tmpdir, ignore_errors=True)
-
     @pytest.mark.asyncio
     async def test_gateway_uses_same_index_format(self, workspace):
         """Test gateway can use CLI-created index."""
@@ -422,7 +359,8 @@ class TestEndToEndCLIToGateway:
         # Simulate CLI creating index
         index = FileIndex(
             index_path=Path(tmpdir) / "index.hnsw",
-            sqlite_path=Path(tmpdir) / "files.db"
+            sqlite_path=Path(tmpdir) / "files.db",
+            merkle_path=Path(tmpdir) / "merkle_state.json"
         )
 
         file = ScannedFile(
@@ -430,14 +368,13 @@ class TestEndToEndCLIToGateway:
             relative_path="test.py",
             file_type="python",
             size_bytes=20,
-            modified_at=datetime.now(),
+            modified_at=_NOW,
             content_hash="hash1"
         )
 
         try:
             with patch.object(index.scanner, 'scan_all', return_value=iter([file])):
-                with patch.object(index.embedder, 'embed_batch', new_callable=AsyncMock) as mock_embed:
-                    mock_embed.return_value = np.random.randn(1, 768).astype(np.float32)
+                with patch.object(index.embedder, 'embed_batch', _fake_embed(_RAND_EMB[:1])):
                     await index.build_index(show_progress=False)
 
             # Close and reopen (like gateway would)
@@ -445,7 +382,8 @@ class TestEndToEndCLIToGateway:
 
             index2 = FileIndex(
                 index_path=Path(tmpdir) / "index.hnsw",
-                sqlite_path=Path(tmpdir) / "files.db"
+                sqlite_path=Path(tmpdir) / "files.db",
+                merkle_path=Path(tmpdir) / "merkle_state.json"
             )
 
             status = index2.get_status()
@@ -474,7 +412,7 @@ class TestEndToEndCLIToGateway:
                 relative_path=f.name,
                 file_type="python",
                 size_bytes=f.stat().st_size,
-                modified_at=datetime.now(),
+                modified_at=_NOW,
                 content_hash=f"hash_{f.name}"
             ))
 
@@ -503,8 +441,7 @@ class TestEndToEndCLIToGateway:
 class TestEmbedderTimeoutHandling:
     """Test embedder timeout handling."""
 
-    @pytest.mark.asyncio
-    async def test_embedder_timeout_config(self):
+    def test_embedder_timeout_config(self):
         """Test embedder timeout configuration."""
         embedder = Embedder(timeout=30.0)
         assert embedder.timeout == 30.0
@@ -521,16 +458,9 @@ class TestEmbedderTimeoutHandling:
 
         def mock_post(*args, **kwargs):
             call_count[0] += 1
-            mock_response = MagicMock()
             if call_count[0] == 2:
-                mock_response.status_code = 500
-                mock_response.text = "Server error"
-            else:
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "embeddings": [np.random.randn(768).tolist()]
-                }
-            return mock_response
+                return _SERVER_ERROR_RESPONSE
+            return _EMBED_RESPONSE
 
         with patch.object(embedder, '_get_client') as mock_get_client:
             mock_client = AsyncMock()
@@ -561,14 +491,9 @@ class TestEmbedderTimeoutHandling:
         """Test embedder handles single item batch."""
         embedder = Embedder()
 
-        mock_embedding = np.random.randn(768).astype(np.float32)
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"embeddings": [mock_embedding.tolist()]}
-
         with patch.object(embedder, '_get_client') as mock_get_client:
             mock_client = AsyncMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.post = AsyncMock(return_value=_EMBED_RESPONSE)
             mock_get_client.return_value = mock_client
 
             result = await embedder.embed_batch(["single text"])
@@ -580,14 +505,9 @@ class TestEmbedderTimeoutHandling:
         """Test embedder returns correct vector shape."""
         embedder = Embedder()
 
-        mock_embedding = np.random.randn(768).astype(np.float32)
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"embeddings": [mock_embedding.tolist()]}
-
         with patch.object(embedder, '_get_client') as mock_get_client:
             mock_client = AsyncMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.post = AsyncMock(return_value=_EMBED_RESPONSE)
             mock_get_client.return_value = mock_client
 
             result = await embedder.embed("test text")